@@ -0,0 +1,62 @@
+"""
+Benchmark: encoding a 10k-row price-snapshot list response.
+
+Compares FastAPI's default response path (response_model validation and
+serialization) with returning FastJSONResponse, both end to end through a
+test client and for the encoder alone.
+
+Usage (from project root):
+    python -m backend.benchmarks.json_encoding [rows]
+"""
+import sys
+import timeit
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.models import PriceSnapshot, PriceSnapshotsListResponse
+from backend.responses import JSON_ENCODER, FastJSONResponse, json_dumps
+from backend.services.row_convert import rows_to_models
+
+
+def _response(n: int) -> PriceSnapshotsListResponse:
+    rows = [
+        {"id": i, "game_id": 1, "round_id": 2, "ticker_id": i % 8, "price": 100.0 + i * 0.0137, "taken_at": "2026-01-01T12:00:00.123456+00:00"}
+        for i in range(n)
+    ]
+    snapshots = rows_to_models(PriceSnapshot, rows)
+    return PriceSnapshotsListResponse(success=True, snapshots=snapshots, count=len(snapshots))
+
+
+def _app(response: PriceSnapshotsListResponse) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=PriceSnapshotsListResponse)
+    async def default():
+        return response
+
+    @app.get("/fast", response_model=PriceSnapshotsListResponse)
+    async def fast():
+        return FastJSONResponse(response)
+
+    return app
+
+
+def _ms(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+def main(n: int = 10000, repeat: int = 15) -> None:
+    response = _response(n)
+    print(f"{n} snapshots, fast encoder: {JSON_ENCODER}")
+    print(f"{'encode: model_dump_json':<34}{_ms(response.model_dump_json, repeat):>8.2f} ms")
+    print(f"{'encode: json_dumps':<34}{_ms(lambda: json_dumps(response), repeat):>8.2f} ms")
+
+    with TestClient(_app(response)) as client:
+        assert client.get("/default").json() == client.get("/fast").json()
+        print(f"{'GET (default JSONResponse path)':<34}{_ms(lambda: client.get('/default'), repeat):>8.2f} ms")
+        print(f"{'GET (FastJSONResponse)':<34}{_ms(lambda: client.get('/fast'), repeat):>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,72 @@
+"""
+Benchmark: database row -> API model conversion, rows per second.
+
+"before" is the per-row validated converter (`_db_dict_to_*` building a
+Pydantic model with keyword arguments, one row at a time). "after" is what
+the list paths use now: one bulk `rows_to_models()` call for table-shaped
+rows, and the validation-free `_db_dict_to_event` for events.
+
+Usage (from project root):
+    python -m backend.benchmarks.row_conversion [rows]
+"""
+import sys
+import timeit
+
+from backend.models import Event, PriceSnapshot, RoundScore, Ticker
+from backend.services.event_service import _db_dict_to_event
+from backend.services.price_snapshot_service import _db_dict_to_price_snapshot
+from backend.services.round_score_service import _db_dict_to_round_score
+from backend.services.row_convert import rows_to_models
+from backend.services.ticker_service import _db_dict_to_ticker
+
+CREATED_AT = "2026-01-01T12:00:00.123456+00:00"
+
+
+def _cases(n: int):
+    """(rows, before, after) per table; before/after convert a whole list of rows."""
+    snapshots = [{"id": i, "game_id": 1, "round_id": 2, "ticker_id": i % 8, "price": 100.0 + i * 0.01, "taken_at": CREATED_AT} for i in range(n)]
+    scores = [{"id": i, "participant_id": i, "round_id": 2, "pnl_delta": 1.5, "reacted": 1, "reaction_ms": 420, "created_at": CREATED_AT} for i in range(n)]
+    tickers = [{"id": i, "symbol": f"T{i}", "name": f"Ticker {i}", "sector": "Tech", "created_at": CREATED_AT} for i in range(n)]
+    events = [{"id": i, "runtime_id": f"macro-1-{i}", "template_id": "macro-1", "kind": "MACRO", "ts": 1767268800000 + i,
+               "etype": "MACRO", "severity": "NORMAL", "headline": "Fed hikes rates by 25 bps", "description": "Fed hikes",
+               "impulse_pct": -0.012, "impact_pct": -0.0105, "round_id": 2, "created_at": CREATED_AT} for i in range(n)]
+    return {
+        "price_snapshots": (
+            snapshots,
+            lambda rows: [_db_dict_to_price_snapshot(row) for row in rows],
+            lambda rows: rows_to_models(PriceSnapshot, rows),
+        ),
+        "round_scores": (
+            scores,
+            lambda rows: [_db_dict_to_round_score(row) for row in rows],
+            lambda rows: rows_to_models(RoundScore, rows),
+        ),
+        "tickers": (
+            tickers,
+            lambda rows: [_db_dict_to_ticker(row) for row in rows],
+            lambda rows: rows_to_models(Ticker, rows),
+        ),
+        "events": (
+            events,
+            # Same mapping, then validated construction as before
+            lambda rows: [Event(**_db_dict_to_event(row).__dict__) for row in rows],
+            lambda rows: [_db_dict_to_event(row) for row in rows],
+        ),
+    }
+
+
+def _rate(fn, rows, repeat: int) -> float:
+    best = min(timeit.repeat(lambda: fn(rows), number=1, repeat=repeat))
+    return len(rows) / best
+
+
+def main(n: int = 20000, repeat: int = 7) -> None:
+    print(f"{'table':<16}{'before rows/s':>16}{'after rows/s':>16}{'speedup':>10}")
+    for table, (rows, before_fn, after_fn) in _cases(n).items():
+        before = _rate(before_fn, rows, repeat)
+        after = _rate(after_fn, rows, repeat)
+        print(f"{table:<16}{before:>16,.0f}{after:>16,.0f}{after / before:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -1,5 +1,22 @@
 # Database package
-from .supabase_client import get_supabase_client, test_connection
-
-__all__ = ["get_supabase_client", "test_connection"]
+from .supabase_client import (
+    get_supabase_client,
+    get_async_supabase_client,
+    close_async_supabase_client,
+    test_connection,
+    test_connection_async,
+)
+from .storage import StorageBackend, Filter, get_storage, set_storage, close_storage
 
+__all__ = [
+    "get_supabase_client",
+    "get_async_supabase_client",
+    "close_async_supabase_client",
+    "test_connection",
+    "test_connection_async",
+    "StorageBackend",
+    "Filter",
+    "get_storage",
+    "set_storage",
+    "close_storage",
+]
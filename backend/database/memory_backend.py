@@ -0,0 +1,119 @@
+"""
+In-memory storage backend.
+
+Keeps every table as an insertion-ordered dict of rows. Nothing is persisted;
+useful for benchmarks that should exclude network latency and for tests.
+"""
+import copy
+from typing import Dict, List, Optional, Sequence, Union
+
+from .storage import Filter, StorageBackend, TABLES, TIMESTAMP_DEFAULTS, matches, utc_now_iso
+
+
+def _sort_key(order_by: str):
+    # NULLs sort last ascending / first descending, like Postgres
+    columns = [c.strip() for c in order_by.split(",")]
+    return lambda row: tuple((row.get(c) is None, row.get(c)) for c in columns)
+
+
+class MemoryBackend(StorageBackend):
+    """Storage backend holding all rows in process memory."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._tables: Dict[str, Dict[int, dict]] = {table: {} for table in TABLES}
+        self._next_id: Dict[str, int] = {table: 1 for table in TABLES}
+
+    def _table(self, table: str) -> Dict[int, dict]:
+        if table not in self._tables:
+            raise ValueError(f"Unknown table '{table}'")
+        return self._tables[table]
+
+    def _find(self, table: str, filters: Sequence[Filter]) -> List[dict]:
+        rows = self._table(table)
+        # Primary-key lookups skip the scan
+        for column, op, value in filters:
+            if column == "id" and op == "eq":
+                row = rows.get(value)
+                return [row] if row is not None and matches(row, filters) else []
+        return [row for row in rows.values() if matches(row, filters)]
+
+    async def select(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        columns: str = "*",
+        order_by: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        rows = self._find(table, filters)
+        if order_by:
+            rows.sort(key=_sort_key(order_by), reverse=desc)
+        if limit:
+            rows = rows[:limit]
+        if columns != "*":
+            names = [c.strip() for c in columns.split(",")]
+            return [{name: row.get(name) for name in names} for row in rows]
+        return [dict(row) for row in rows]
+
+    async def select_latest(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        partition_by: str,
+        order_by: str,
+    ) -> List[dict]:
+        latest = {}
+        for row in self._find(table, filters):
+            value = row.get(order_by)
+            if value is None:
+                continue
+            best = latest.get(row.get(partition_by))
+            if best is None or value > best[order_by]:
+                latest[row.get(partition_by)] = row
+        return [dict(row) for row in latest.values()]
+
+    async def insert(self, table: str, rows: Union[dict, List[dict]]) -> List[dict]:
+        store = self._table(table)
+        new_rows = [rows] if isinstance(rows, dict) else rows
+        timestamp_column = TIMESTAMP_DEFAULTS.get(table)
+
+        prepared = []
+        prepared_ids = set()
+        for row in new_rows:
+            row = copy.deepcopy(row)
+            row_id = row.get("id")
+            if row_id is None:
+                row_id = self._next_id[table]
+                row["id"] = row_id
+            if row_id in store or row_id in prepared_ids:
+                raise ValueError(f"duplicate key value violates unique constraint \"{table}_pkey\"")
+            if timestamp_column and row.get(timestamp_column) is None:
+                row[timestamp_column] = utc_now_iso()
+            self._next_id[table] = max(self._next_id[table], row_id + 1)
+            prepared.append(row)
+            prepared_ids.add(row_id)
+
+        for row in prepared:
+            store[row["id"]] = row
+        return [dict(row) for row in prepared]
+
+    async def update(self, table: str, values: dict, filters: Sequence[Filter]) -> List[dict]:
+        rows = self._find(table, filters)
+        for row in rows:
+            row.update(copy.deepcopy(values))
+        return [dict(row) for row in rows]
+
+    async def delete(self, table: str, filters: Sequence[Filter]) -> List[dict]:
+        store = self._table(table)
+        rows = self._find(table, filters)
+        for row in rows:
+            del store[row["id"]]
+        return rows
+
+    async def count(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        return len(self._find(table, filters))
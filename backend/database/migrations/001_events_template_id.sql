@@ -0,0 +1,52 @@
+-- Store the event template ID with each generated event
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS template_id TEXT;
+
+-- Backfill older rows from their headline (template titles are unique);
+-- pairs taken from MACRO_POOL, MICRO_POOL and BLACKSWAN_POOL in event_service.py
+UPDATE events SET template_id = templates.id
+FROM (VALUES
+    ('macro-1', 'Fed hikes rates by 25 bps'),
+    ('macro-2', 'CPI cools below expectations'),
+    ('macro-3', 'Oil jumps on OPEC+ cuts'),
+    ('macro-4', 'Unemployment rate drops to 3.5%'),
+    ('macro-5', 'GDP growth exceeds forecasts'),
+    ('macro-6', 'Trade deficit widens unexpectedly'),
+    ('macro-7', 'Housing starts surge 15%'),
+    ('macro-8', 'Retail sales decline for third month'),
+    ('macro-9', 'Manufacturing PMI hits 18-month high'),
+    ('macro-10', 'Dollar strengthens against major currencies'),
+    ('macro-11', 'Consumer confidence index plummets'),
+    ('macro-12', 'Central bank signals dovish pivot'),
+    ('macro-13', 'Bond yields spike on inflation fears'),
+    ('macro-14', 'Jobless claims hit record low'),
+    ('macro-15', 'Industrial production falls 2.3%'),
+    ('micro-1', 'TechCo beats; raises guidance'),
+    ('micro-2', 'BioHealth drug fails Phase 3'),
+    ('micro-3', 'AutoCo announces $5B buyback'),
+    ('micro-4', 'RetailGiant misses revenue targets'),
+    ('micro-5', 'EnergyCorp discovers major oil field'),
+    ('micro-6', 'BankInc reports record profits'),
+    ('micro-7', 'PharmaCo gets FDA approval'),
+    ('micro-8', 'Airlines face pilot shortage crisis'),
+    ('micro-9', 'StreamCo adds 10M subscribers'),
+    ('micro-10', 'ChipMaker announces factory expansion'),
+    ('micro-11', 'FoodChain faces supply chain disruption'),
+    ('micro-12', 'CloudCo signs $2B enterprise deal'),
+    ('micro-13', 'AutoMaker recalls 500K vehicles'),
+    ('micro-14', 'SocialMedia launches new ad platform'),
+    ('micro-15', 'ShippingCo reports record losses'),
+    ('micro-16', 'GamingCo releases blockbuster title'),
+    ('micro-17', 'MiningCorp faces environmental lawsuit'),
+    ('micro-18', 'EVMaker doubles production capacity'),
+    ('bs-1', 'Flash Crash: Liquidity Vacuum'),
+    ('bs-2', 'Geopolitical Shock: Sanctions Escalation'),
+    ('bs-3', 'Exchange Outage: Price Discovery Stalls'),
+    ('bs-4', 'Cyber Attack: Major Bank Breach'),
+    ('bs-5', 'Natural Disaster: Supply Chain Collapse'),
+    ('bs-6', 'Regulatory Bombshell: Industry Shakeup'),
+    ('bs-7', 'Currency Crisis: Emerging Market Crash'),
+    ('bs-8', 'Commodity Shock: Resource Shortage')
+) AS templates(id, title)
+WHERE events.template_id IS NULL AND events.headline = templates.title;
@@ -0,0 +1,7 @@
+-- Store the (scheduled) event time so pre-generated round timelines can be reloaded
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS ts BIGINT;
+
+-- Timeline reads fetch one round's events in schedule order
+CREATE INDEX IF NOT EXISTS idx_events_round_ts ON events(round_id, ts);
@@ -0,0 +1,7 @@
+-- Persist the runtimeId handed to clients so events can be looked up by it
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS runtime_id TEXT;
+
+-- GET/PUT/DELETE /api/events/{runtime_id} resolve with one indexed lookup
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_runtime_id ON events(runtime_id);
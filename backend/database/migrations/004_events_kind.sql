@@ -0,0 +1,19 @@
+-- Store the exact event type so blackswans no longer hide behind etype = 'MICRO'
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS kind TEXT;
+
+-- Backfill existing rows: known blackswan templates first, then the old
+-- severity/impact heuristic for rows stored without a template id
+UPDATE events SET kind = CASE
+    WHEN template_id LIKE 'bs-%' THEN 'BLACKSWAN'
+    WHEN template_id IS NULL AND etype::text = 'MICRO' AND severity::text = 'HIGH' AND ABS(impact_pct) > 0.05 THEN 'BLACKSWAN'
+    ELSE etype::text
+END
+WHERE kind IS NULL;
+
+-- Type filters and the news listing (kind IN ('MACRO', 'MICRO'))
+CREATE INDEX IF NOT EXISTS idx_events_kind ON events(kind, id DESC);
+
+-- GET /api/events/blackswan: small partial index over blackswans only
+CREATE INDEX IF NOT EXISTS idx_events_blackswan ON events(id DESC) WHERE kind = 'BLACKSWAN';
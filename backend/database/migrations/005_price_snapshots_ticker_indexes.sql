@@ -0,0 +1,8 @@
+-- Indexes for GET /api/price-snapshots/history (ticker_id IN (...) plus an optional round and time window)
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+-- Tickers within a round
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_round_ticker ON price_snapshots(round_id, ticker_id, taken_at);
+
+-- Tickers across rounds, optionally bounded by time
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_ticker_time ON price_snapshots(ticker_id, taken_at);
@@ -0,0 +1,4 @@
+-- Keyset pagination for price snapshot exports (game_id = ? AND id > ? ORDER BY id)
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_game_id ON price_snapshots(game_id, id);
@@ -0,0 +1,28 @@
+-- Per-round price summaries written by the price compaction job, which then
+-- deletes (or archives) raw price_snapshots of rounds past the retention window
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+CREATE TABLE IF NOT EXISTS price_rollups (
+    id BIGSERIAL PRIMARY KEY,
+    game_id BIGINT NOT NULL,
+    round_id BIGINT NOT NULL,
+    ticker_id BIGINT NOT NULL,
+    open DOUBLE PRECISION NOT NULL,
+    high DOUBLE PRECISION NOT NULL,
+    low DOUBLE PRECISION NOT NULL,
+    close DOUBLE PRECISION NOT NULL,  -- Last price of the round
+    count INTEGER NOT NULL,  -- Raw snapshots summarized
+    first_at TIMESTAMP WITH TIME ZONE,
+    last_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_rollups_round ON price_rollups(round_id, ticker_id);
+CREATE INDEX IF NOT EXISTS idx_price_rollups_game ON price_rollups(game_id, round_id);
+
+-- Compaction progress per round: rolled up, then raw rows purged
+ALTER TABLE rounds ADD COLUMN IF NOT EXISTS compacted_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE rounds ADD COLUMN IF NOT EXISTS purged_at TIMESTAMP WITH TIME ZONE;
+
+-- Ended rounds still waiting for a rollup
+CREATE INDEX IF NOT EXISTS idx_rounds_compaction ON rounds(ends_at) WHERE compacted_at IS NULL;
@@ -0,0 +1,29 @@
+-- Last price snapshot per ticker before a time, in one call
+-- (backs StorageBackend.select_latest for price_snapshots; PostgREST has no DISTINCT ON)
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+CREATE OR REPLACE FUNCTION price_snapshots_latest(
+    p_ticker_ids BIGINT[],
+    p_before TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+    p_game_id BIGINT DEFAULT NULL,
+    p_round_id BIGINT DEFAULT NULL
+)
+RETURNS SETOF price_snapshots
+LANGUAGE sql
+STABLE
+AS $$
+    -- One index probe per ticker (idx_price_snapshots_ticker_time / _round_ticker)
+    SELECT latest.*
+    FROM unnest(p_ticker_ids) AS t(ticker_id)
+    CROSS JOIN LATERAL (
+        SELECT *
+        FROM price_snapshots ps
+        WHERE ps.ticker_id = t.ticker_id
+          AND ps.taken_at IS NOT NULL
+          AND (p_before IS NULL OR ps.taken_at < p_before)
+          AND (p_game_id IS NULL OR ps.game_id = p_game_id)
+          AND (p_round_id IS NULL OR ps.round_id = p_round_id)
+        ORDER BY ps.taken_at DESC
+        LIMIT 1
+    ) AS latest;
+$$;
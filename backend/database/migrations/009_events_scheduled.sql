@@ -0,0 +1,11 @@
+-- Mark pre-generated round timeline events and hide them from listings until due
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS scheduled BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Listings only return events with ts <= now; fill ts for rows stored before it existed
+UPDATE events SET ts = (EXTRACT(EPOCH FROM created_at) * 1000)::BIGINT
+WHERE ts IS NULL AND created_at IS NOT NULL;
+
+-- GET /api/games/rounds/{round_id}/timeline loads only the scheduled rows of a round
+CREATE INDEX IF NOT EXISTS idx_events_round_scheduled ON events(round_id, ts) WHERE scheduled;
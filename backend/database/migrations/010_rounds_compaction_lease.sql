@@ -0,0 +1,6 @@
+-- Let several backend instances run price compaction without working on the same round
+-- Run this SQL in your Supabase SQL Editor before deploying the matching backend
+
+-- An instance claims a round for one compaction step by setting this (only
+-- where it is NULL or already expired) and clears it when the step is done
+ALTER TABLE rounds ADD COLUMN IF NOT EXISTS compaction_lease TIMESTAMP WITH TIME ZONE;
@@ -0,0 +1,301 @@
+"""
+Embedded SQLite storage backend.
+
+All statements run on one dedicated worker thread that owns the connection,
+so the event loop never blocks on disk I/O.
+"""
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from .storage import Filter, StorageBackend, TIMESTAMP_DEFAULTS, utc_now_iso
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    runtime_id TEXT,
+    template_id TEXT,
+    kind TEXT,
+    ts INTEGER,
+    scheduled INTEGER NOT NULL DEFAULT 0,
+    round_id INTEGER,
+    etype TEXT NOT NULL,
+    severity TEXT,
+    headline TEXT NOT NULL,
+    description TEXT,
+    target_ticker_id INTEGER,
+    impulse_pct REAL,
+    impact_pct REAL,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS tickers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    code TEXT,
+    starting_cash REAL NOT NULL DEFAULT 10000,
+    status TEXT NOT NULL DEFAULT 'active',
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id INTEGER NOT NULL,
+    round_no INTEGER NOT NULL,
+    starts_at TEXT,
+    ends_at TEXT,
+    compacted_at TEXT,
+    purged_at TEXT,
+    compaction_lease TEXT
+);
+
+CREATE TABLE IF NOT EXISTS price_snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id INTEGER NOT NULL,
+    round_id INTEGER NOT NULL,
+    ticker_id INTEGER NOT NULL,
+    price REAL NOT NULL,
+    taken_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS price_rollups (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id INTEGER NOT NULL,
+    round_id INTEGER NOT NULL,
+    ticker_id INTEGER NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    count INTEGER NOT NULL,
+    first_at TEXT,
+    last_at TEXT,
+    created_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS round_scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    participant_id INTEGER NOT NULL,
+    round_id INTEGER NOT NULL,
+    pnl_delta REAL NOT NULL,
+    reacted INTEGER NOT NULL,
+    reaction_ms INTEGER,
+    created_at TEXT
+);
+"""
+
+# Created after ADDED_COLUMNS are applied, so indexes may use new columns
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_events_kind ON events(kind, id);
+CREATE INDEX IF NOT EXISTS idx_events_blackswan ON events(id) WHERE kind = 'BLACKSWAN';
+CREATE INDEX IF NOT EXISTS idx_events_round_ts ON events(round_id, ts);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_runtime_id ON events(runtime_id);
+CREATE INDEX IF NOT EXISTS idx_games_code ON games(code, status);
+CREATE INDEX IF NOT EXISTS idx_rounds_game ON rounds(game_id, round_no);
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_game ON price_snapshots(game_id, taken_at);
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_round ON price_snapshots(round_id, taken_at);
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_ticker ON price_snapshots(ticker_id, game_id, taken_at);
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_round_ticker ON price_snapshots(round_id, ticker_id, taken_at);
+CREATE INDEX IF NOT EXISTS idx_price_snapshots_game_id ON price_snapshots(game_id, id);
+CREATE INDEX IF NOT EXISTS idx_price_rollups_round ON price_rollups(round_id, ticker_id);
+CREATE INDEX IF NOT EXISTS idx_price_rollups_game ON price_rollups(game_id, round_id);
+CREATE INDEX IF NOT EXISTS idx_rounds_compaction ON rounds(compacted_at, ends_at);
+CREATE INDEX IF NOT EXISTS idx_round_scores_round ON round_scores(round_id, pnl_delta);
+CREATE INDEX IF NOT EXISTS idx_round_scores_participant ON round_scores(participant_id, round_id);
+"""
+
+# Columns added after the initial schema; applied to existing database files
+ADDED_COLUMNS = {
+    "events": [("template_id", "TEXT"), ("ts", "INTEGER"), ("runtime_id", "TEXT"), ("kind", "TEXT"),
+               ("scheduled", "INTEGER NOT NULL DEFAULT 0")],
+    "rounds": [("compacted_at", "TEXT"), ("purged_at", "TEXT"), ("compaction_lease", "TEXT")],
+}
+
+# Run once when the matching column is added, to fill it for existing rows
+BACKFILLS = {
+    ("events", "kind"): """
+        UPDATE events SET kind = CASE
+            WHEN template_id LIKE 'bs-%' THEN 'BLACKSWAN'
+            WHEN template_id IS NULL AND etype = 'MICRO' AND severity = 'HIGH' AND ABS(impact_pct) > 0.05 THEN 'BLACKSWAN'
+            ELSE etype
+        END
+        WHERE kind IS NULL
+    """,
+    # Listings only show events with ts <= now; older rows were stored without ts
+    ("events", "scheduled"): """
+        UPDATE events SET ts = CAST(strftime('%s', created_at) AS INTEGER) * 1000
+        WHERE ts IS NULL AND created_at IS NOT NULL
+    """,
+}
+
+_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _where(filters: Sequence[Filter]) -> Tuple[str, List[Any]]:
+    """Build a WHERE clause and its parameters from storage filters."""
+    clauses = []
+    params: List[Any] = []
+    for column, op, value in filters:
+        if op == "in":
+            values = list(value)
+            if not values:
+                clauses.append("0")
+                continue
+            clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        elif op == "is":
+            clauses.append(f"{_quote(column)} IS ?")
+            params.append(value)
+        elif op in _OPERATORS:
+            clauses.append(f"{_quote(column)} {_OPERATORS[op]} ?")
+            params.append(value)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+class SQLiteBackend(StorageBackend):
+    """Storage backend backed by an embedded SQLite database file."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = "hedge.db"):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            conn.executescript(INDEXES)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Add columns missing from database files created by older versions."""
+        with conn:
+            for table, columns in ADDED_COLUMNS.items():
+                existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+                for column, decl in columns:
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)} {decl}")
+                        if (table, column) in BACKFILLS:
+                            conn.execute(BACKFILLS[(table, column)])
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _query(self, sql: str, params: Sequence[Any]) -> List[dict]:
+        conn = self._connect()
+        return [dict(row) for row in conn.execute(sql, params).fetchall()]
+
+    def _write_many(self, statements: List[Tuple[str, Sequence[Any]]]) -> List[dict]:
+        conn = self._connect()
+        rows: List[dict] = []
+        with conn:
+            for sql, params in statements:
+                rows.extend(dict(row) for row in conn.execute(sql, params).fetchall())
+        return rows
+
+    async def select(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        columns: str = "*",
+        order_by: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        if columns != "*":
+            columns = ", ".join(_quote(c.strip()) for c in columns.split(","))
+        where, params = _where(filters)
+        sql = f"SELECT {columns} FROM {_quote(table)}{where}"
+        if order_by:
+            # NULLs sort last ascending / first descending, like Postgres
+            direction = "DESC NULLS FIRST" if desc else "ASC NULLS LAST"
+            sql += " ORDER BY " + ", ".join(f"{_quote(c.strip())} {direction}" for c in order_by.split(","))
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return await self._run(self._query, sql, params)
+
+    async def select_latest(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        partition_by: str,
+        order_by: str,
+    ) -> List[dict]:
+        where, params = _where(filters)
+        where += (" AND " if where else " WHERE ") + f"{_quote(order_by)} IS NOT NULL"
+        sql = (
+            f"SELECT * FROM (SELECT *, ROW_NUMBER() OVER "
+            f"(PARTITION BY {_quote(partition_by)} ORDER BY {_quote(order_by)} DESC) AS _latest "
+            f"FROM {_quote(table)}{where}) WHERE _latest = 1"
+        )
+        rows = await self._run(self._query, sql, params)
+        for row in rows:
+            del row["_latest"]
+        return rows
+
+    async def insert(self, table: str, rows: Union[dict, List[dict]]) -> List[dict]:
+        new_rows = [rows] if isinstance(rows, dict) else rows
+        timestamp_column = TIMESTAMP_DEFAULTS.get(table)
+        statements = []
+        for row in new_rows:
+            row = dict(row)
+            if timestamp_column and row.get(timestamp_column) is None:
+                row[timestamp_column] = utc_now_iso()
+            names = ", ".join(_quote(c) for c in row)
+            marks = ", ".join("?" * len(row))
+            sql = f"INSERT INTO {_quote(table)} ({names}) VALUES ({marks}) RETURNING *"
+            statements.append((sql, list(row.values())))
+        if not statements:
+            return []
+        return await self._run(self._write_many, statements)
+
+    async def update(self, table: str, values: dict, filters: Sequence[Filter]) -> List[dict]:
+        assignments = ", ".join(f"{_quote(c)} = ?" for c in values)
+        where, params = _where(filters)
+        sql = f"UPDATE {_quote(table)} SET {assignments}{where} RETURNING *"
+        return await self._run(self._write_many, [(sql, list(values.values()) + params)])
+
+    async def delete(self, table: str, filters: Sequence[Filter]) -> List[dict]:
+        where, params = _where(filters)
+        sql = f"DELETE FROM {_quote(table)}{where} RETURNING *"
+        return await self._run(self._write_many, [(sql, params)])
+
+    async def count(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        where, params = _where(filters)
+        rows = await self._run(self._query, f"SELECT COUNT(*) AS n FROM {_quote(table)}{where}", params)
+        return rows[0]["n"]
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await self._run(conn.close)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,174 @@
+"""
+Storage backend interface and factory.
+
+Services talk to a StorageBackend instead of a concrete database client, so
+the API can run against Supabase, an embedded SQLite file, or plain memory.
+The backend is selected with the STORAGE_BACKEND environment variable
+("supabase", "sqlite" or "memory").
+"""
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+# A filter is (column, operator, value); operators mirror PostgREST names
+Filter = Tuple[str, str, Any]
+FILTER_OPS = ("eq", "neq", "in", "gt", "gte", "lt", "lte", "is")
+
+# Tables every backend must support
+TABLES = ("events", "tickers", "games", "rounds", "price_snapshots", "price_rollups", "round_scores")
+
+# Columns filled with the insert time when the caller leaves them out
+TIMESTAMP_DEFAULTS = {
+    "events": "created_at",
+    "tickers": "created_at",
+    "games": "created_at",
+    "rounds": "starts_at",
+    "price_snapshots": "taken_at",
+    "price_rollups": "created_at",
+    "round_scores": "created_at",
+}
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO-8601 string (the format Supabase returns)."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def matches(row: dict, filters: Sequence[Filter]) -> bool:
+    """Evaluate filters against a row held in memory."""
+    for column, op, value in filters:
+        cell = row.get(column)
+        if op == "eq":
+            if cell != value:
+                return False
+        elif op == "neq":
+            if cell == value:
+                return False
+        elif op == "in":
+            if cell not in value:
+                return False
+        elif op == "is":
+            if cell is not value:
+                return False
+        elif cell is None:
+            return False
+        elif op == "gt":
+            if not cell > value:
+                return False
+        elif op == "gte":
+            if not cell >= value:
+                return False
+        elif op == "lt":
+            if not cell < value:
+                return False
+        elif op == "lte":
+            if not cell <= value:
+                return False
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return True
+
+
+class StorageBackend(ABC):
+    """Table-oriented async storage interface used by the service layer."""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def select(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        columns: str = "*",
+        order_by: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Return rows of a table matching all filters.
+        order_by may list several columns, e.g. "taken_at,id" (all in one direction).
+        """
+
+    @abstractmethod
+    async def select_latest(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        partition_by: str,
+        order_by: str,
+    ) -> List[dict]:
+        """
+        Return, in one query, the matching row with the greatest order_by
+        value for each distinct partition_by value (rows whose order_by is
+        NULL are ignored).
+        """
+
+    @abstractmethod
+    async def insert(self, table: str, rows: Union[dict, List[dict]]) -> List[dict]:
+        """Insert one or many rows and return them as stored."""
+
+    @abstractmethod
+    async def update(self, table: str, values: dict, filters: Sequence[Filter]) -> List[dict]:
+        """Update matching rows and return them as stored."""
+
+    @abstractmethod
+    async def delete(self, table: str, filters: Sequence[Filter]) -> List[dict]:
+        """Delete matching rows and return the deleted rows."""
+
+    @abstractmethod
+    async def count(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        """Count rows of a table matching all filters."""
+
+    async def ping(self) -> bool:
+        """Check that the backend is reachable."""
+        try:
+            await self.select("events", columns="id", limit=1)
+            return True
+        except Exception as e:
+            print(f"{self.name} storage connection test failed: {e}")
+            return False
+
+    async def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def _create_storage(kind: str) -> StorageBackend:
+    kind = kind.lower()
+    if kind == "supabase":
+        from .supabase_backend import SupabaseBackend
+        return SupabaseBackend()
+    if kind == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend(os.getenv("SQLITE_PATH", "hedge.db"))
+    if kind == "memory":
+        from .memory_backend import MemoryBackend
+        return MemoryBackend()
+    raise ValueError(f"Unknown STORAGE_BACKEND '{kind}'. Use supabase, sqlite or memory.")
+
+
+def get_storage() -> StorageBackend:
+    """Get the configured storage backend instance."""
+    global _storage
+    if _storage is None:
+        _storage = _create_storage(os.getenv("STORAGE_BACKEND", "supabase"))
+    return _storage
+
+
+def set_storage(backend: Optional[StorageBackend]) -> None:
+    """Replace the active storage backend (None resets to the configured one)."""
+    global _storage
+    _storage = backend
+
+
+async def close_storage() -> None:
+    """Close the active storage backend."""
+    global _storage
+    if _storage is not None:
+        await _storage.close()
+    _storage = None
@@ -0,0 +1,102 @@
+"""
+Supabase (PostgREST) storage backend.
+"""
+from typing import List, Optional, Sequence, Union
+
+from .storage import Filter, StorageBackend
+from .supabase_client import get_async_supabase_client, close_async_supabase_client
+
+
+def _apply_filters(query, filters: Sequence[Filter]):
+    """Translate storage filters into PostgREST builder calls."""
+    for column, op, value in filters:
+        if op == "in":
+            query = query.in_(column, list(value))
+        elif op == "is":
+            query = query.is_(column, "null" if value is None else str(value).lower())
+        elif op in ("eq", "neq", "gt", "gte", "lt", "lte"):
+            query = getattr(query, op)(column, value)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return query
+
+
+class SupabaseBackend(StorageBackend):
+    """Storage backend backed by the pooled async Supabase client."""
+
+    name = "supabase"
+
+    async def select(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        columns: str = "*",
+        order_by: Optional[str] = None,
+        desc: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        supabase = await get_async_supabase_client()
+        query = _apply_filters(supabase.table(table).select(columns), filters)
+        if order_by:
+            for column in order_by.split(","):
+                query = query.order(column.strip(), desc=desc)
+        if limit:
+            query = query.limit(limit)
+        result = await query.execute()
+        return result.data or []
+
+    async def select_latest(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        *,
+        partition_by: str,
+        order_by: str,
+    ) -> List[dict]:
+        # PostgREST has no DISTINCT ON: served by SQL functions (migration 008)
+        if (table, partition_by, order_by) != ("price_snapshots", "ticker_id", "taken_at"):
+            raise ValueError(f"select_latest is not available for {table} by {partition_by}/{order_by}")
+        params = {}
+        for column, op, value in filters:
+            if (column, op) == ("ticker_id", "in"):
+                params["p_ticker_ids"] = list(value)
+            elif (column, op) == ("taken_at", "lt"):
+                params["p_before"] = value
+            elif (column, op) == ("game_id", "eq"):
+                params["p_game_id"] = value
+            elif (column, op) == ("round_id", "eq"):
+                params["p_round_id"] = value
+            else:
+                raise ValueError(f"Unsupported select_latest filter on {table}: {column} {op}")
+        if "p_ticker_ids" not in params:
+            raise ValueError("select_latest on price_snapshots needs a ticker_id 'in' filter")
+        supabase = await get_async_supabase_client()
+        result = await supabase.rpc("price_snapshots_latest", params).execute()
+        return result.data or []
+
+    async def insert(self, table: str, rows: Union[dict, List[dict]]) -> List[dict]:
+        supabase = await get_async_supabase_client()
+        result = await supabase.table(table).insert(rows).execute()
+        return result.data or []
+
+    async def update(self, table: str, values: dict, filters: Sequence[Filter]) -> List[dict]:
+        supabase = await get_async_supabase_client()
+        query = _apply_filters(supabase.table(table).update(values), filters)
+        result = await query.execute()
+        return result.data or []
+
+    async def delete(self, table: str, filters: Sequence[Filter]) -> List[dict]:
+        supabase = await get_async_supabase_client()
+        query = _apply_filters(supabase.table(table).delete(), filters)
+        result = await query.execute()
+        return result.data or []
+
+    async def count(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        supabase = await get_async_supabase_client()
+        query = _apply_filters(supabase.table(table).select("id", count="exact"), filters)
+        result = await query.limit(1).execute()
+        return result.count or 0
+
+    async def close(self) -> None:
+        await close_async_supabase_client()
@@ -1,8 +1,12 @@
 """
 Supabase client configuration and initialization.
 """
+import asyncio
 import os
-from supabase import create_client, Client
+from typing import Optional
+
+import httpx
+from supabase import create_client, Client, AsyncClient, AsyncClientOptions, acreate_client
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,23 +16,89 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError(
-        "Missing Supabase credentials. Please set SUPABASE_URL and SUPABASE_KEY "
-        "in your .env file or environment variables."
-    )
+# Connection pool / timeout configuration for the async client
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "200"))
+SUPABASE_POOL_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "50"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "30"))
+SUPABASE_POOL_TIMEOUT = float(os.getenv("SUPABASE_POOL_TIMEOUT", "10"))
+
+# Clients are created lazily so non-Supabase storage backends need no credentials
+supabase: Optional[Client] = None
+_async_supabase: Optional[AsyncClient] = None
+_async_http: Optional[httpx.AsyncClient] = None
+_async_lock = asyncio.Lock()
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def _require_credentials() -> None:
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError(
+            "Missing Supabase credentials. Please set SUPABASE_URL and SUPABASE_KEY "
+            "in your .env file or environment variables."
+        )
 
 
 def get_supabase_client() -> Client:
     """Get the Supabase client instance."""
+    global supabase
+    if supabase is None:
+        _require_credentials()
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
     return supabase
 
 
+def _build_http_client() -> httpx.AsyncClient:
+    """Build the shared, pooled HTTP client used by the async Supabase client."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_SIZE,
+            max_keepalive_connections=SUPABASE_POOL_KEEPALIVE,
+        ),
+        timeout=httpx.Timeout(
+            SUPABASE_TIMEOUT,
+            connect=SUPABASE_CONNECT_TIMEOUT,
+            pool=SUPABASE_POOL_TIMEOUT,
+        ),
+        follow_redirects=True,
+        http2=True,
+    )
+
+
+async def get_async_supabase_client() -> AsyncClient:
+    """
+    Get the async Supabase client instance.
+
+    All requests share one pooled HTTP client, so many DB calls can be in
+    flight at once without blocking the event loop.
+    """
+    global _async_supabase, _async_http
+    if _async_supabase is not None:
+        return _async_supabase
+
+    _require_credentials()
+    async with _async_lock:
+        if _async_supabase is None:
+            _async_http = _build_http_client()
+            _async_supabase = await acreate_client(
+                SUPABASE_URL,
+                SUPABASE_KEY,
+                options=AsyncClientOptions(httpx_client=_async_http),
+            )
+    return _async_supabase
+
+
+async def close_async_supabase_client() -> None:
+    """Close the pooled HTTP connections of the async client."""
+    global _async_supabase, _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+    _async_supabase = None
+    _async_http = None
+
+
 def test_connection() -> bool:
     """Test the Supabase connection."""
+    supabase = get_supabase_client()
     try:
         # Try a simple query to test connection
         result = supabase.table("events").select("id").limit(1).execute()
@@ -44,3 +114,13 @@ def test_connection() -> bool:
             print(f"Detailed connection test failed: {e2}")
             return False
 
+
+async def test_connection_async() -> bool:
+    """Test the Supabase connection without blocking the event loop."""
+    try:
+        client = await get_async_supabase_client()
+        await client.table("events").select("id").limit(1).execute()
+        return True
+    except Exception as e:
+        print(f"Supabase connection test failed: {e}")
+        return False
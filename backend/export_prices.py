@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Export price snapshots to CSV, Arrow or Parquet for offline analysis.
+
+Pages through the table with keyset pagination and writes each page as it
+arrives, so memory stays flat however many games are exported. Uses the
+storage backend configured by STORAGE_BACKEND (see backend/README.md).
+
+Usage (from project root):
+    python -m backend.export_prices --game-id 1 --game-id 2 -o games.csv
+    python -m backend.export_prices --round-id 7 --format parquet -o round7.parquet
+    python -m backend.export_prices --format arrow > all.arrows
+"""
+import argparse
+import asyncio
+import sys
+
+from backend.database import get_storage
+from backend.services import price_export
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export price snapshots")
+    parser.add_argument("--game-id", type=int, action="append", dest="game_ids", help="Game to export (repeatable; default: all games)")
+    parser.add_argument("--round-id", type=int, help="Only this round")
+    parser.add_argument("--ticker-id", type=int, action="append", dest="ticker_ids", help="Only this ticker (repeatable)")
+    parser.add_argument("--format", choices=sorted(price_export.EXPORT_FORMATS), default="csv")
+    parser.add_argument("--page-size", type=int, help="Rows per page, record batch or row group")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+async def _export(args: argparse.Namespace) -> int:
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        async for chunk in price_export.export_price_snapshots(
+            fmt=args.format,
+            game_ids=args.game_ids,
+            round_id=args.round_id,
+            ticker_ids=args.ticker_ids,
+            page_size=args.page_size
+        ):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+        await get_storage().close()
+    return written
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    try:
+        price_export.check_format(args.format)
+    except (ValueError, price_export.ExportUnavailable) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    written = asyncio.run(_export(args))
+    print(f"Exported {written} bytes of {args.format}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 import os
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from backend.routers import events, tickers, games, round_scores, price_snapshots
-from backend.database import test_connection
+from backend.routers import events, tickers, games, round_scores, leaderboard, price_snapshots
+from backend.database import get_storage, close_storage
+from backend.services import event_bus, event_service, leaderboard_service, price_compaction, price_store
 
 app = FastAPI(
     title="Hedge Game Events API",
@@ -46,9 +47,27 @@ app.include_router(events.router)
 app.include_router(tickers.router)
 app.include_router(games.router)
 app.include_router(round_scores.router)
+app.include_router(leaderboard.router)
 app.include_router(price_snapshots.router)
 
 
+@app.on_event("startup")
+async def startup():
+    """Build the leaderboards and start background jobs."""
+    await leaderboard_service.ensure_loaded()
+    leaderboard_service.start()
+    price_compaction.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background jobs, flush background writes and release pooled database connections."""
+    await price_compaction.stop()
+    await leaderboard_service.stop()
+    await event_service.flush_pending_writes()
+    await close_storage()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -59,6 +78,9 @@ async def root():
             "GET /api/events": "Get all events (with optional filters)",
             "GET /api/events/{id}": "Get a specific event by runtimeId",
             "POST /api/events": "Generate a new event",
+            "POST /api/events/batch": "Generate several events with one bulk insert",
+            "GET /api/events/stream": "Stream new events as Server-Sent Events (game_id/round_id filters)",
+            "WS /api/events/ws": "Push new events over a WebSocket (game_id/round_id filters)",
             "GET /api/events/blackswan": "Get all blackswan events",
             "GET /api/events/news": "Get all news events (MACRO/MICRO)",
             "GET /api/tickers": "Get all tickers",
@@ -73,10 +95,14 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    db_connected = test_connection()
+    storage = get_storage()
+    db_connected = await storage.ping()
     return {
         "status": "healthy",
-        "database": "connected" if db_connected else "disconnected"
+        "storage": storage.name,
+        "database": "connected" if db_connected else "disconnected",
+        "event_subscribers": event_bus.subscriber_count(),
+        "price_store": {"games": price_store.game_count(), "bytes": price_store.memory_bytes()}
     }
 
 
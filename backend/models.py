@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List, Literal
+from pydantic import BaseModel, Field
+from typing import Optional, List, Literal, Dict, Union
 from datetime import datetime
 
 EventType = Literal["MACRO", "MICRO", "BLACKSWAN"]
@@ -39,6 +39,23 @@ class Event(EventBase):
 class EventCreate(BaseModel):
     type: Optional[EventType] = None  # If None, randomly select MACRO or MICRO
     forceBlackSwan: Optional[bool] = False  # Force blackswan event
+    game_id: Optional[int] = None  # If set, avoid repeats within this game only and use its latest round
+    round_id: Optional[int] = None  # Round to attach the event to (default: the game's latest round)
+
+
+class EventBatchCreate(BaseModel):
+    count: int = Field(..., ge=1, le=500)  # Number of events to generate
+    mix: Optional[Dict[EventType, float]] = None  # Ratio per type; default MACRO/MICRO 50/50
+    game_id: Optional[int] = None  # If set, avoid repeats within this game only and use its latest round
+    round_id: Optional[int] = None  # Round to attach the events to (default: the game's latest round)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "count": 10,
+                "mix": {"MACRO": 0.45, "MICRO": 0.45, "BLACKSWAN": 0.1}
+            }
+        }
 
 
 class EventResponse(BaseModel):
@@ -51,6 +68,7 @@ class EventsListResponse(BaseModel):
     success: bool
     events: List[Event]
     count: int
+    next_cursor: Optional[int] = None  # Pass as ?cursor= for the next page, None at the end
 
 
 class EventUpdate(BaseModel):
@@ -146,6 +164,14 @@ class RoundResponse(BaseModel):
     message: Optional[str] = None
 
 
+class RoundTimelineResponse(BaseModel):
+    success: bool
+    round_id: int
+    events: List[Event]
+    count: int
+    next_cursor: Optional[int] = None  # Position of the following event, None at the end
+
+
 # Round Score Models
 class RoundScore(BaseModel):
     id: int
@@ -165,6 +191,19 @@ class RoundScoreCreate(BaseModel):
     reaction_ms: Optional[int] = None
 
 
+class RoundScoreEntry(BaseModel):
+    """One participant's score within a RoundScoreBatchCreate."""
+    participant_id: int
+    pnl_delta: float
+    reacted: bool
+    reaction_ms: Optional[int] = None
+
+
+class RoundScoreBatchCreate(BaseModel):
+    round_id: int
+    scores: List[RoundScoreEntry] = Field(..., min_length=1, max_length=1000)  # One per participant
+
+
 class RoundScoreResponse(BaseModel):
     success: bool
     score: Optional[RoundScore] = None
@@ -177,6 +216,29 @@ class RoundScoresListResponse(BaseModel):
     count: int
 
 
+class LeaderboardEntry(BaseModel):
+    rank: int  # 1 = best
+    participant_id: int
+    score: float  # Sum of pnl_delta in the scope
+    rounds: int  # Scores counted
+
+
+class LeaderboardResponse(BaseModel):
+    success: bool
+    scope: str  # round, game or global
+    scope_id: Optional[int] = None
+    entries: List[LeaderboardEntry]
+    total: int  # Participants on the board
+
+
+class LeaderboardRankResponse(BaseModel):
+    success: bool
+    scope: str
+    scope_id: Optional[int] = None
+    entry: LeaderboardEntry
+    total: int
+
+
 # Price Snapshot Models
 class PriceSnapshot(BaseModel):
     id: int
@@ -198,6 +260,30 @@ class PriceSnapshotBatchCreate(BaseModel):
     snapshots: List[PriceSnapshotCreate]
 
 
+class PriceSnapshotColumnarCreate(BaseModel):
+    """Compact batch: parallel ticker_ids/prices arrays sharing one game and round."""
+    game_id: int
+    round_id: int
+    ticker_ids: List[int]
+    prices: List[float]
+
+
+class SnapshotChunkFailure(BaseModel):
+    index: int  # Chunk number
+    start: int  # Position of the chunk's first snapshot in the request
+    count: int  # Snapshots in the chunk (none of them were stored)
+    error: str
+
+
+class PriceSnapshotBatchResponse(BaseModel):
+    success: bool  # True if every chunk was stored
+    snapshots: List[PriceSnapshot]  # Snapshots stored by this request
+    count: int
+    skipped_count: int = 0  # Unchanged prices that were not stored
+    failed_count: int = 0
+    failed_chunks: List[SnapshotChunkFailure] = []
+
+
 class PriceSnapshotResponse(BaseModel):
     success: bool
     snapshot: Optional[PriceSnapshot] = None
@@ -209,3 +295,94 @@ class PriceSnapshotsListResponse(BaseModel):
     snapshots: List[PriceSnapshot]
     count: int
 
+
+class TickerPriceHistory(BaseModel):
+    ticker_id: int
+    snapshots: List[PriceSnapshot]
+
+
+class PriceHistoryResponse(BaseModel):
+    success: bool
+    history: List[TickerPriceHistory]  # One entry per requested ticker, in request order
+    count: int  # Total number of snapshots across all tickers
+
+
+class PriceSeries(BaseModel):
+    ticker_id: int
+    timestamps: Union[List[int], str]  # ms since epoch; when packed, base64 ms offsets from t0
+    prices: Union[List[float], str]  # base64 float32 (little-endian) when packed
+    t0: Optional[int] = None  # Packed only: first timestamp (ms since epoch)
+    timestamps_dtype: Optional[Literal["uint32", "float64"]] = None  # Packed only: offset type
+
+
+class PriceSeriesResponse(BaseModel):
+    success: bool
+    format: Literal["columnar"] = "columnar"
+    encoding: Literal["json", "float32"] = "json"
+    series: List[PriceSeries]
+    count: int  # Total number of points across all series
+
+
+class PriceRollup(BaseModel):
+    id: int
+    game_id: int
+    round_id: int
+    ticker_id: int
+    open: float
+    high: float
+    low: float
+    close: float  # Last price of the round
+    count: int  # Raw snapshots summarized
+    first_at: Optional[datetime] = None
+    last_at: Optional[datetime] = None
+
+
+class PriceRollupsListResponse(BaseModel):
+    success: bool
+    rollups: List[PriceRollup]
+    count: int
+
+
+class PriceCompactionStatus(BaseModel):
+    running: bool  # A pass is in progress
+    enabled: bool  # Background job scheduled
+    interval_seconds: float
+    purge_enabled: bool = False  # Raw snapshots of rolled-up rounds are deleted
+    retention_hours: float
+    archive_dir: Optional[str] = None
+    runs: int
+    last_run_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    rounds_rolled_up: int
+    snapshots_rolled_up: int
+    rollups_written: int
+    rounds_purged: int
+    snapshots_deleted: int
+    snapshots_archived: int
+    purges_aborted: int = 0  # Purges skipped because rollups or archive missed rows
+    pending_rollup: Optional[int] = None  # Ended rounds not rolled up yet (as of the last pass)
+    pending_purge: Optional[int] = None  # Rolled-up rounds whose raw rows are still stored
+
+
+class PriceCompactionResponse(BaseModel):
+    success: bool
+    status: PriceCompactionStatus
+
+
+class PriceCandles(BaseModel):
+    ticker_id: int
+    timestamps: List[int]  # Bucket start (ohlc) or sampled point time (lttb), ms
+    open: Optional[List[float]] = None  # ohlc only
+    high: Optional[List[float]] = None  # ohlc only
+    low: Optional[List[float]] = None  # ohlc only
+    close: List[float]  # Last price in the bucket, or the sampled price
+    count: Optional[List[int]] = None  # ohlc only: snapshots per bucket
+
+
+class PriceCandlesResponse(BaseModel):
+    success: bool
+    method: Literal["ohlc", "lttb"]
+    series: List[PriceCandles]
+    count: int  # Points returned across all series
+    source_count: int  # Snapshots aggregated
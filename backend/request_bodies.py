@@ -0,0 +1,34 @@
+"""
+Decoding of compact request bodies.
+
+Batch uploads may be sent as MessagePack (`Content-Type: application/msgpack`)
+instead of JSON. msgpack is optional: without it such bodies are rejected and
+JSON keeps working.
+"""
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+class UnsupportedBody(ValueError):
+    """The request body's content type cannot be decoded."""
+
+
+def is_msgpack(content_type: str) -> bool:
+    """True if a Content-Type header names MessagePack."""
+    return content_type.split(";", 1)[0].strip().lower() in MSGPACK_CONTENT_TYPES
+
+
+def load_msgpack(body: bytes) -> Any:
+    """Decode a MessagePack body into plain Python values."""
+    if msgpack is None:
+        raise UnsupportedBody("MessagePack bodies require the msgpack package")
+    try:
+        return msgpack.unpackb(body, raw=False)
+    except Exception as e:
+        raise ValueError(f"Invalid MessagePack body: {str(e) or type(e).__name__}")
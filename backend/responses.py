@@ -0,0 +1,79 @@
+"""
+Fast JSON encoding for large list responses.
+
+Uses orjson when installed, then msgspec, and otherwise falls back to
+Pydantic's own serializer, so the optional libraries are never required.
+Routes return `FastJSONResponse(SomeListResponse(...))` directly: that skips
+FastAPI's response-model validation and encodes the models' field dicts
+natively (datetimes in UTC as `...Z`, matching Pydantic's output).
+"""
+import base64
+import json
+import sys
+from array import array
+from typing import Any, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+
+def _model_fields(obj: Any) -> dict:
+    # Models built by the services hold exactly their fields in __dict__
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+if orjson is not None:
+    JSON_ENCODER = "orjson"
+    _ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def json_dumps(content: Any) -> bytes:
+        """Encode content (models, dicts, lists) to JSON bytes."""
+        return orjson.dumps(content, default=_model_fields, option=_ORJSON_OPTIONS)
+
+elif msgspec is not None:
+    JSON_ENCODER = "msgspec"
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=_model_fields)
+
+    def json_dumps(content: Any) -> bytes:
+        """Encode content (models, dicts, lists) to JSON bytes."""
+        return _msgspec_encoder.encode(content)
+
+else:
+    JSON_ENCODER = "pydantic"
+
+    def json_dumps(content: Any) -> bytes:
+        """Encode content (models, dicts, lists) to JSON bytes."""
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fastest available encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def pack_array(values: Sequence[float], typecode: str = "f") -> str:
+    """
+    Pack numbers as base64 little-endian binary ("f" float32, "d" float64,
+    "I" uint32), readable in the browser with e.g. new Float32Array(bytes.buffer).
+    """
+    packed = array(typecode, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
@@ -1,35 +1,185 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from backend.models import Event, EventCreate, EventResponse, EventsListResponse, EventType, EventUpdate
-from backend.services import event_service
-from backend.database import get_supabase_client
+from backend.models import Event, EventCreate, EventBatchCreate, EventResponse, EventsListResponse, EventType, EventUpdate
+from backend.services import event_bus, event_service
+from backend.services.listing_cache import etag_matches
+from backend.responses import FastJSONResponse, json_dumps
+from backend.database import get_storage
+import asyncio
 import os
 import random
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
 
+async def _list_events(
+    listing: str,
+    event_type: Optional[EventType],
+    limit: Optional[int],
+    cursor: Optional[int],
+    format: str,
+    if_none_match: Optional[str] = None
+):
+    """
+    Build a paged JSON response or an NDJSON stream for an event listing.
+    JSON pages come from the listing cache and answer 304 when the client's
+    If-None-Match still matches.
+    
+    A storage error before the first NDJSON line answers 500; a later one
+    aborts the stream, so a partial listing never looks complete.
+    """
+    if format == "ndjson":
+        events = event_service.iter_events(listing, event_type, limit=limit, before_id=cursor)
+        try:
+            first = await anext(events, None)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error fetching {listing} events: {str(e)}")
+        
+        async def body():
+            if first is None:
+                return
+            yield json_dumps(first) + b"\n"
+            async for event in events:
+                yield json_dumps(event) + b"\n"
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+    
+    page = await event_service.get_events_page_body(listing, event_type, limit=limit, before_id=cursor)
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+
 @router.get("", response_model=EventsListResponse)
 async def get_events(
     limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of events to return"),
-    type: Optional[EventType] = Query(None, description="Filter by event type (MACRO, MICRO, BLACKSWAN)")
+    type: Optional[EventType] = Query(None, description="Filter by event type (MACRO, MICRO, BLACKSWAN)"),
+    cursor: Optional[int] = Query(None, ge=1, description="Return events older than this cursor (next_cursor of the previous page)"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json (paged) or ndjson (streamed)"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get all events with optional filtering.
     
     - **limit**: Maximum number of events to return (default: all)
     - **type**: Filter by event type (MACRO, MICRO, or BLACKSWAN)
+    - **cursor**: Continue after the previous page (its `next_cursor`)
+    - **format**: `ndjson` streams one event per line instead of a JSON body
     
     Returns the most recent events first.
     """
-    events = event_service.get_all_events(limit=limit, event_type=type)
-    return EventsListResponse(
-        success=True,
-        events=events,
-        count=len(events)
+    return await _list_events("all", type, limit, cursor, format, if_none_match)
+
+
+@router.get("/blackswan", response_model=EventsListResponse)
+async def get_blackswan_events(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of events to return"),
+    cursor: Optional[int] = Query(None, ge=1, description="Return events older than this cursor (next_cursor of the previous page)"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json (paged) or ndjson (streamed)"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get all blackswan events.
+    
+    - **limit**: Maximum number of events to return (default: all)
+    - **cursor**: Continue after the previous page (its `next_cursor`)
+    - **format**: `ndjson` streams one event per line instead of a JSON body
+    
+    Returns blackswan events sorted by timestamp (most recent first).
+    """
+    return await _list_events("blackswan", None, limit, cursor, format, if_none_match)
+
+
+@router.get("/news", response_model=EventsListResponse)
+async def get_news_events(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of events to return"),
+    cursor: Optional[int] = Query(None, ge=1, description="Return events older than this cursor (next_cursor of the previous page)"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json (paged) or ndjson (streamed)"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get all news events (MACRO and MICRO events).
+    
+    - **limit**: Maximum number of events to return (default: all)
+    - **cursor**: Continue after the previous page (its `next_cursor`)
+    - **format**: `ndjson` streams one event per line instead of a JSON body
+    
+    Returns news events sorted by timestamp (most recent first).
+    """
+    return await _list_events("news", None, limit, cursor, format, if_none_match)
+
+
+@router.get("/stream")
+async def stream_events(
+    game_id: Optional[int] = Query(None, description="Only stream events generated for this game"),
+    round_id: Optional[int] = Query(None, description="Only stream events of this round")
+):
+    """
+    Stream newly generated events as Server-Sent Events.
+    
+    - **game_id**: Only events generated for this game
+    - **round_id**: Only events of this round (takes precedence over game_id)
+    
+    Each event is sent as `event: event` with the Event JSON as data. A client
+    that falls more than EVENT_STREAM_QUEUE_SIZE events behind receives
+    `event: dropped` and the stream ends; it may reconnect.
+    """
+    sub = event_bus.subscribe(game_id=game_id, round_id=round_id)
+    
+    async def body():
+        try:
+            while True:
+                try:
+                    event = await sub.get(timeout=event_bus.EVENT_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    yield "event: dropped\ndata: {}\n\n"
+                    return
+                yield f"event: event\ndata: {event.model_dump_json()}\n\n"
+        finally:
+            event_bus.unsubscribe(sub)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+@router.websocket("/ws")
+async def events_websocket(
+    websocket: WebSocket,
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None
+):
+    """
+    Push newly generated events over a WebSocket, one Event JSON per message.
+    
+    Query parameters `game_id` / `round_id` narrow the stream as for /stream.
+    A client too slow to keep up is closed with code 1013 (try again later).
+    """
+    await websocket.accept()
+    sub = event_bus.subscribe(game_id=game_id, round_id=round_id)
+    try:
+        while True:
+            try:
+                event = await sub.get(timeout=event_bus.EVENT_STREAM_KEEPALIVE)
+            except asyncio.TimeoutError:
+                await websocket.send_json({"type": "keepalive"})
+                continue
+            if event is None:
+                await websocket.close(code=1013, reason="Slow consumer dropped")
+                return
+            await websocket.send_text(event.model_dump_json())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        event_bus.unsubscribe(sub)
+
+
 @router.get("/{event_id}", response_model=EventResponse)
 async def get_event_by_id(event_id: str):
     """
@@ -37,7 +187,7 @@ async def get_event_by_id(event_id: str):
     
     - **event_id**: The runtimeId of the event to retrieve
     """
-    event = event_service.get_event_by_id(event_id)
+    event = await event_service.get_event_by_id(event_id)
     if not event:
         raise HTTPException(status_code=404, detail=f"Event with id '{event_id}' not found")
     
@@ -55,6 +205,9 @@ async def create_event(event_data: EventCreate):
     
     - **type**: Optional event type (MACRO or MICRO). If not provided, randomly selects between MACRO and MICRO.
     - **forceBlackSwan**: If True, generates a blackswan event instead
+    - **game_id**: Optional game ID; templates are not repeated within the game's recent window,
+      and the event is attached to the game's latest round
+    - **round_id**: Optional round to attach the event to (default: the game's latest round)
     
     The generated event will have:
     - A unique runtimeId
@@ -70,7 +223,12 @@ async def create_event(event_data: EventCreate):
         elif event_data.type:
             event_type = event_data.type
         
-        event = event_service.generate_event(event_type=event_type, force_blackswan=force_blackswan)
+        event = await event_service.generate_event(
+            event_type=event_type,
+            force_blackswan=force_blackswan,
+            game_id=event_data.game_id,
+            round_id=event_data.round_id
+        )
         
         return EventResponse(
             success=True,
@@ -81,23 +239,34 @@ async def create_event(event_data: EventCreate):
         raise HTTPException(status_code=500, detail=f"Error generating event: {str(e)}")
 
 
-@router.get("/blackswan", response_model=EventsListResponse)
-async def get_blackswan_events(
-    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of events to return")
-):
+@router.post("/batch", response_model=EventsListResponse, status_code=201)
+async def create_events_batch(batch_data: EventBatchCreate):
     """
-    Get all blackswan events.
-    
-    - **limit**: Maximum number of events to return (default: all)
+    Generate several events in one request and store them with a single bulk insert.
     
-    Returns blackswan events sorted by timestamp (most recent first).
+    - **count**: Number of events to generate (1-500)
+    - **mix**: Optional ratio per type, e.g. {"MACRO": 0.45, "MICRO": 0.45, "BLACKSWAN": 0.1}
+    - **game_id**: Optional game ID; templates are not repeated within the game's recent window,
+      and the events are attached to the game's latest round
+    - **round_id**: Optional round to attach the events to (default: the game's latest round)
     """
-    events = event_service.get_blackswan_events(limit=limit)
-    return EventsListResponse(
-        success=True,
-        events=events,
-        count=len(events)
-    )
+    try:
+        events = await event_service.generate_events_batch(
+            count=batch_data.count,
+            mix=batch_data.mix,
+            game_id=batch_data.game_id,
+            round_id=batch_data.round_id
+        )
+        return FastJSONResponse(EventsListResponse(
+            success=True,
+            events=events,
+            count=len(events)
+        ), status_code=201)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating events batch: {str(e)}")
+
 
 @router.put("/{event_id}", response_model=EventResponse)
 async def update_event(event_id: str, update: EventUpdate):
@@ -105,7 +274,7 @@ async def update_event(event_id: str, update: EventUpdate):
     Update an existing event by database ID or runtime_id.
     Only provided fields will be updated.
     """
-    updated = event_service.update_event(event_id, update.model_dump(exclude_none=True))
+    updated = await event_service.update_event(event_id, update.model_dump(exclude_none=True))
     if not updated:
         raise HTTPException(status_code=404, detail=f"Event with id '{event_id}' not found or not updated")
     return EventResponse(success=True, event=updated, message="Event updated successfully")
@@ -116,7 +285,7 @@ async def delete_event(event_id: str):
     """
     Delete an event by database ID or runtime_id.
     """
-    ok = event_service.delete_event(event_id)
+    ok = await event_service.delete_event(event_id)
     if not ok:
         raise HTTPException(status_code=404, detail=f"Event with id '{event_id}' not found")
     return EventResponse(success=True, event=None, message="Event deleted successfully")
@@ -124,9 +293,9 @@ async def delete_event(event_id: str):
 @router.get("/_debug/meta")
 async def debug_events_meta():
     """
-    Debug endpoint: returns Supabase project info and events table stats seen by the backend.
+    Debug endpoint: returns storage backend info and events table stats seen by the backend.
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     supabase_url = os.getenv("SUPABASE_URL", "")
     project_ref = ""
     try:
@@ -136,15 +305,15 @@ async def debug_events_meta():
     except Exception:
         project_ref = ""
     try:
-        count_result = supabase.table("events").select("id", count="exact").limit(1).execute()
-        row_count = count_result.count or 0
+        row_count = await storage.count("events")
     except Exception as e:
         row_count = -1
     try:
-        sample = supabase.table("events").select("*").order("id", desc=True).limit(3).execute().data
+        sample = await storage.select("events", order_by="id", desc=True, limit=3)
     except Exception:
         sample = []
     return {
+        "storage_backend": storage.name,
         "supabase_url": supabase_url,
         "project_ref": project_ref,
         "row_count": row_count,
@@ -155,19 +324,19 @@ async def debug_events_meta():
 async def debug_insert_once():
     """
     Debug endpoint: directly inserts a minimal row into public.events using legacy columns.
-    Returns Supabase response or error message.
+    Returns the stored row or error message.
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     import time
     try:
         # Resolve a valid round_id (latest or create default)
         try:
-            rid_res = supabase.table("rounds").select("id").order("id", desc=True).limit(1).execute()
-            if rid_res.data and len(rid_res.data) > 0 and rid_res.data[0].get("id") is not None:
-                round_id = int(rid_res.data[0]["id"])
+            rid_rows = await storage.select("rounds", columns="id", order_by="id", desc=True, limit=1)
+            if rid_rows and rid_rows[0].get("id") is not None:
+                round_id = int(rid_rows[0]["id"])
             else:
                 try:
-                    supabase.table("rounds").insert({"id": 1, "game_id": 1, "round_no": 1}).execute()
+                    await storage.insert("rounds", {"id": 1, "game_id": 1, "round_no": 1})
                 except Exception:
                     pass
                 round_id = 1
@@ -179,34 +348,17 @@ async def debug_insert_once():
         payload = {
             "headline": "Debug Insert Headline",
             "description": "Inserted via _debug/insert-once",
+            "kind": etype,
             "etype": etype,
             "severity": "HIGH",
             "impulse_pct": 0.01,
             "impact_pct": 0.0123,
             "round_id": round_id,
             "target_ticker_id": None,
+            "ts": int(time.time() * 1000),  # Listings hide rows without a past ts
         }
-        result = supabase.table("events").insert(payload).execute()
-        return {"ok": True, "data": result.data}
+        rows = await storage.insert("events", payload)
+        event_service.listing_cache.invalidate()
+        return {"ok": True, "data": rows}
     except Exception as e:
         return {"ok": False, "error": str(e)}
-
-
-@router.get("/news", response_model=EventsListResponse)
-async def get_news_events(
-    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of events to return")
-):
-    """
-    Get all news events (MACRO and MICRO events).
-    
-    - **limit**: Maximum number of events to return (default: all)
-    
-    Returns news events sorted by timestamp (most recent first).
-    """
-    events = event_service.get_news_events(limit=limit)
-    return EventsListResponse(
-        success=True,
-        events=events,
-        count=len(events)
-    )
-
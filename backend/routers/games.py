@@ -1,9 +1,11 @@
 """
 API routes for games and rounds.
 """
-from fastapi import APIRouter, HTTPException
-from backend.models import Game, GameCreate, GameResponse, Round, RoundCreate, RoundResponse
-from backend.services import game_service
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from backend.models import Game, GameCreate, GameResponse, Round, RoundCreate, RoundResponse, RoundTimelineResponse
+from backend.services import game_service, timeline_service
+from backend.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api/games", tags=["games"])
 
@@ -18,7 +20,7 @@ async def create_or_get_game(game_data: GameCreate):
     - **status**: Game status (default: "active")
     """
     try:
-        game = game_service.create_or_get_game(
+        game = await game_service.create_or_get_game(
             code=game_data.code,
             starting_cash=game_data.starting_cash,
             status=game_data.status
@@ -40,7 +42,7 @@ async def get_game_by_id(game_id: int):
     
     - **game_id**: The game ID
     """
-    game = game_service.get_game_by_id(game_id)
+    game = await game_service.get_game_by_id(game_id)
     if not game:
         raise HTTPException(status_code=404, detail=f"Game with id '{game_id}' not found")
     
@@ -60,7 +62,7 @@ async def create_or_get_round(round_data: RoundCreate):
     - **round_no**: The round number (1, 2, 3...)
     """
     try:
-        round_obj = game_service.create_or_get_round(
+        round_obj = await game_service.create_or_get_round(
             game_id=round_data.game_id,
             round_no=round_data.round_no
         )
@@ -81,7 +83,7 @@ async def get_round_by_id(round_id: int):
     
     - **round_id**: The round ID
     """
-    round_obj = game_service.get_round_by_id(round_id)
+    round_obj = await game_service.get_round_by_id(round_id)
     if not round_obj:
         raise HTTPException(status_code=404, detail=f"Round with id '{round_id}' not found")
     
@@ -92,6 +94,36 @@ async def get_round_by_id(round_id: int):
     )
 
 
+@router.get("/rounds/{round_id}/timeline", response_model=RoundTimelineResponse)
+async def get_round_timeline(
+    round_id: int,
+    cursor: int = Query(0, ge=0, description="Position of the first event to return"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of events to return (default: all)")
+):
+    """
+    Get the pre-generated event timeline of a round.
+    
+    - **round_id**: The round ID
+    - **cursor**: Position of the first event to return (default: 0)
+    - **limit**: Maximum number of events to return; use limit=1 to read the next event
+    
+    Events are ordered by scheduled `ts`. Pass `next_cursor` back to continue.
+    """
+    events = await timeline_service.get_round_timeline(round_id)
+    if events is None:
+        raise HTTPException(status_code=404, detail=f"Timeline for round '{round_id}' not found")
+    
+    end = len(events) if limit is None else min(cursor + limit, len(events))
+    page = events[cursor:end]
+    return FastJSONResponse(RoundTimelineResponse(
+        success=True,
+        round_id=round_id,
+        events=page,
+        count=len(page),
+        next_cursor=end if end < len(events) else None
+    ))
+
+
 @router.put("/rounds/{round_id}/end", response_model=RoundResponse)
 async def end_round(round_id: int):
     """
@@ -99,7 +131,7 @@ async def end_round(round_id: int):
     
     - **round_id**: The round ID
     """
-    round_obj = game_service.end_round(round_id)
+    round_obj = await game_service.end_round(round_id)
     if not round_obj:
         raise HTTPException(status_code=404, detail=f"Round with id '{round_id}' not found")
     
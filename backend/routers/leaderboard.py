@@ -0,0 +1,76 @@
+"""
+API routes for leaderboards.
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from backend.models import LeaderboardEntry, LeaderboardResponse, LeaderboardRankResponse
+from backend.services import leaderboard_service
+from backend.responses import FastJSONResponse
+
+router = APIRouter(prefix="/api/leaderboard", tags=["leaderboard"])
+
+
+def _scope(round_id: Optional[int], game_id: Optional[int]):
+    if round_id and game_id:
+        raise HTTPException(status_code=400, detail="Provide round_id or game_id, not both")
+    if round_id:
+        return "round", round_id
+    if game_id:
+        return "game", game_id
+    return "global", None
+
+
+@router.get("", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    round_id: Optional[int] = Query(None, description="Leaderboard of this round"),
+    game_id: Optional[int] = Query(None, description="Leaderboard of this game (all its rounds)"),
+    limit: int = Query(10, ge=1, le=1000, description="Entries to return"),
+    offset: int = Query(0, ge=0, description="Entries to skip")
+):
+    """
+    Get the top participants by total pnl_delta, served from memory.
+    
+    Ties are broken by rounds played (more first), then participant ID.
+    
+    - **round_id**: One round
+    - **game_id**: All rounds of a game
+    - neither: All games
+    """
+    scope, scope_id = _scope(round_id, game_id)
+    try:
+        entries, total = await leaderboard_service.get_top(scope, scope_id, limit, offset)
+        return FastJSONResponse(LeaderboardResponse(
+            success=True,
+            scope=scope,
+            scope_id=scope_id,
+            entries=[LeaderboardEntry(**entry) for entry in entries],
+            total=total
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching leaderboard: {str(e)}")
+
+
+@router.get("/participants/{participant_id}", response_model=LeaderboardRankResponse)
+async def get_participant_rank(
+    participant_id: int,
+    round_id: Optional[int] = Query(None, description="Rank in this round"),
+    game_id: Optional[int] = Query(None, description="Rank in this game")
+):
+    """
+    Get a participant's rank, score and rounds played, served from memory.
+    
+    - **participant_id**: The participant ID
+    - **round_id** / **game_id**: Scope (neither: all games)
+    """
+    scope, scope_id = _scope(round_id, game_id)
+    entry, total = await leaderboard_service.get_rank(participant_id, scope, scope_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail=f"Participant '{participant_id}' has no scores on this leaderboard")
+    
+    return LeaderboardRankResponse(
+        success=True,
+        scope=scope,
+        scope_id=scope_id,
+        entry=LeaderboardEntry(**entry),
+        total=total
+    )
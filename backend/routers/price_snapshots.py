@@ -1,13 +1,23 @@
 """
 API routes for price snapshots.
 """
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from datetime import datetime
+from typing import List, Optional, Union
 from backend.models import (
-    PriceSnapshot, PriceSnapshotCreate, PriceSnapshotBatchCreate,
-    PriceSnapshotResponse, PriceSnapshotsListResponse
+    PriceSnapshot, PriceSnapshotCreate, PriceSnapshotBatchCreate, PriceSnapshotColumnarCreate,
+    PriceSnapshotResponse, PriceSnapshotsListResponse, PriceSeries, PriceSeriesResponse,
+    PriceCandles, PriceCandlesResponse, TickerPriceHistory, PriceHistoryResponse,
+    PriceSnapshotBatchResponse, SnapshotChunkFailure, PriceRollupsListResponse,
+    PriceCompactionStatus, PriceCompactionResponse
 )
-from backend.services import price_snapshot_service
+from backend.services import price_compaction, price_export, price_snapshot_service
+from backend.services.row_convert import as_utc, models_to_rows
+from backend.request_bodies import UnsupportedBody, is_msgpack, load_msgpack
+from backend.responses import FastJSONResponse, pack_array
 
 router = APIRouter(prefix="/api/price-snapshots", tags=["price-snapshots"])
 
@@ -23,7 +33,7 @@ async def create_price_snapshot(snapshot_data: PriceSnapshotCreate):
     - **price**: The price at snapshot time
     """
     try:
-        snapshot = price_snapshot_service.create_price_snapshot(
+        snapshot = await price_snapshot_service.create_price_snapshot(
             game_id=snapshot_data.game_id,
             round_id=snapshot_data.round_id,
             ticker_id=snapshot_data.ticker_id,
@@ -44,24 +54,111 @@ async def create_price_snapshot(snapshot_data: PriceSnapshotCreate):
         raise HTTPException(status_code=500, detail=f"Error creating price snapshot: {str(e)}")
 
 
-@router.post("/batch", response_model=PriceSnapshotsListResponse, status_code=201)
-async def create_price_snapshots_batch(batch_data: PriceSnapshotBatchCreate):
+_batch_body = TypeAdapter(Union[PriceSnapshotBatchCreate, PriceSnapshotColumnarCreate])
+
+# The route reads the raw body (JSON or MessagePack), so document both shapes here
+_batch_body_schema = {
+    "oneOf": [
+        model.model_json_schema(ref_template="#/components/schemas/{model}")
+        for model in (PriceSnapshotBatchCreate, PriceSnapshotColumnarCreate)
+    ]
+}
+for _schema in _batch_body_schema["oneOf"]:
+    _schema.pop("$defs", None)
+
+
+async def _batch_rows(request: Request) -> List[dict]:
+    """Decode a batch body (rows or columnar, JSON or MessagePack) into insert rows."""
+    body = await request.body()
+    try:
+        if is_msgpack(request.headers.get("content-type", "")):
+            batch = _batch_body.validate_python(load_msgpack(body))
+        else:
+            batch = _batch_body.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+    except UnsupportedBody as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if isinstance(batch, PriceSnapshotColumnarCreate):
+        if len(batch.ticker_ids) != len(batch.prices):
+            raise HTTPException(status_code=422, detail="ticker_ids and prices must have the same length")
+        return price_snapshot_service.rows_from_columns(batch.game_id, batch.round_id, batch.ticker_ids, batch.prices)
+    return models_to_rows(PriceSnapshotCreate, batch.snapshots)
+
+
+@router.post(
+    "/batch",
+    response_model=PriceSnapshotBatchResponse,
+    status_code=201,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/json": {"schema": _batch_body_schema},
+        "application/msgpack": {"schema": _batch_body_schema},
+    }}}
+)
+async def create_price_snapshots_batch(
+    request: Request,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000, description="Snapshots per insert (default: PRICE_SNAPSHOT_CHUNK_SIZE)")
+):
     """
     Create multiple price snapshots in a batch.
     
+    The body is JSON or MessagePack (`Content-Type: application/msgpack`), in either shape:
+    
     - **snapshots**: Array of {game_id, round_id, ticker_id, price}
+    - or columnar: **game_id**, **round_id** and parallel **ticker_ids** / **prices** arrays
+    
+    - **chunk_size**: Snapshots per insert; chunks are inserted concurrently
+    
+    Snapshots repeating their ticker's last stored price are not stored
+    (`skipped_count`). A failing chunk does not lose the others: the response
+    lists it in `failed_chunks` and the status is 207 (or 500 if nothing was stored).
     """
+    rows = await _batch_rows(request)
     try:
-        snapshots_dict = [snapshot.dict() for snapshot in batch_data.snapshots]
-        snapshots = price_snapshot_service.create_price_snapshots_batch(snapshots_dict)
-        
-        return PriceSnapshotsListResponse(
-            success=True,
-            snapshots=snapshots,
-            count=len(snapshots)
-        )
+        snapshots, failures, skipped = await price_snapshot_service.ingest_price_snapshots(rows, chunk_size=chunk_size)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating price snapshots batch: {str(e)}")
+    
+    if failures and not snapshots and not skipped:
+        raise HTTPException(status_code=500, detail=f"Error creating price snapshots batch: {failures[0]['error']}")
+    
+    return FastJSONResponse(PriceSnapshotBatchResponse(
+        success=not failures,
+        snapshots=snapshots,
+        count=len(snapshots),
+        skipped_count=skipped,
+        failed_count=sum(failure["count"] for failure in failures),
+        failed_chunks=[SnapshotChunkFailure(**failure) for failure in failures]
+    ), status_code=207 if failures else 201)
+
+
+def _columnar_response(series: dict, encoding: str) -> PriceSeriesResponse:
+    """Build a PriceSeriesResponse from {ticker_id: (timestamps, prices)}."""
+    items = []
+    for ticker_id, (timestamps, prices) in series.items():
+        if encoding == "float32":
+            # ms offsets from the first point fit in uint32 for any span under ~49 days
+            t0 = timestamps[0] if timestamps else 0
+            offsets = [ts - t0 for ts in timestamps]
+            dtype = "uint32" if not offsets or offsets[-1] < 2 ** 32 else "float64"
+            items.append(PriceSeries(
+                ticker_id=ticker_id,
+                timestamps=pack_array(offsets, "I" if dtype == "uint32" else "d"),
+                prices=pack_array(prices, "f"),
+                t0=t0,
+                timestamps_dtype=dtype
+            ))
+        else:
+            items.append(PriceSeries(ticker_id=ticker_id, timestamps=timestamps, prices=prices))
+    return PriceSeriesResponse(
+        success=True,
+        encoding=encoding,
+        series=items,
+        count=sum(len(prices) for _, prices in series.values())
+    )
 
 
 @router.get("", response_model=PriceSnapshotsListResponse)
@@ -69,7 +166,9 @@ async def get_price_snapshots(
     game_id: Optional[int] = Query(None, description="Filter by game ID"),
     round_id: Optional[int] = Query(None, description="Filter by round ID"),
     ticker_id: Optional[int] = Query(None, description="Filter by ticker ID"),
-    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of snapshots to return")
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of snapshots to return"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="rows (one object per snapshot) or columnar (arrays per ticker)"),
+    encoding: str = Query("json", pattern="^(json|float32)$", description="Columnar arrays as JSON numbers or base64 binary")
 ):
     """
     Get price snapshots with optional filtering.
@@ -78,29 +177,251 @@ async def get_price_snapshots(
     - **round_id**: Filter by round ID
     - **ticker_id**: Filter by ticker ID (requires game_id)
     - **limit**: Maximum number of snapshots to return
+    - **format**: `columnar` returns one `{ticker_id, timestamps, prices}` series per ticker
+      (a PriceSeriesResponse) instead of one object per snapshot
+    - **encoding**: With `columnar`, `float32` packs prices as base64 float32 and
+      timestamps as base64 uint32 ms offsets from `t0` (little-endian)
     """
     try:
+        if not game_id and not round_id:
+            raise HTTPException(status_code=400, detail="Must provide at least game_id or round_id")
+        
+        if format == "columnar":
+            series = await price_snapshot_service.get_price_series(
+                game_id=game_id,
+                round_id=round_id,
+                ticker_id=ticker_id,
+                limit=limit
+            )
+            return FastJSONResponse(_columnar_response(series, encoding))
+        
         if ticker_id and game_id:
-            snapshots = price_snapshot_service.get_price_history(
+            snapshots = await price_snapshot_service.get_price_history(
                 ticker_id=ticker_id,
                 game_id=game_id,
                 round_id=round_id,
                 limit=limit
             )
         elif round_id:
-            snapshots = price_snapshot_service.get_price_snapshots_by_round(round_id)
+            snapshots = await price_snapshot_service.get_price_snapshots_by_round(round_id)
         elif game_id:
-            snapshots = price_snapshot_service.get_price_snapshots_by_game(game_id)
+            snapshots = await price_snapshot_service.get_price_snapshots_by_game(game_id)
         else:
             raise HTTPException(status_code=400, detail="Must provide at least game_id or round_id")
         
-        return PriceSnapshotsListResponse(
+        return FastJSONResponse(PriceSnapshotsListResponse(
             success=True,
             snapshots=snapshots,
             count=len(snapshots)
-        )
+        ))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching price snapshots: {str(e)}")
 
+
+@router.get("/history", response_model=PriceHistoryResponse)
+async def get_multi_ticker_history(
+    ticker_ids: List[int] = Query(..., description="Ticker IDs (repeat the parameter: ticker_ids=1&ticker_ids=2)"),
+    game_id: Optional[int] = Query(None, description="Filter by game ID"),
+    round_id: Optional[int] = Query(None, description="Filter by round ID"),
+    start: Optional[datetime] = Query(None, description="Only snapshots taken at or after this time (ISO-8601)"),
+    end: Optional[datetime] = Query(None, description="Only snapshots taken before this time (ISO-8601)"),
+    limit: Optional[int] = Query(None, ge=1, le=50000, description="Maximum number of snapshots to return in total"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="rows (snapshots per ticker) or columnar (arrays per ticker)"),
+    encoding: str = Query("json", pattern="^(json|float32)$", description="Columnar arrays as JSON numbers or base64 binary")
+):
+    """
+    Get price history for several tickers in one request, grouped per ticker.
+    
+    All tickers are read with one filtered query
+    (`ticker_id IN (...)` plus the optional round, game and time window), paged
+    on (taken_at, id) so the backend's row cap never truncates it. With
+    `start`, one more query fetches every ticker's last snapshot before the window.
+    
+    - **ticker_ids**: Tickers to fetch (up to 100)
+    - **game_id** / **round_id**: Optional scope
+    - **start** / **end**: Optional time window, `start <= taken_at < end`
+    - **limit**: Maximum number of snapshots across all tickers
+    - **format** / **encoding**: As for `GET /api/price-snapshots`
+    """
+    ticker_ids = list(dict.fromkeys(ticker_ids))
+    if len(ticker_ids) > 100:
+        raise HTTPException(status_code=400, detail="At most 100 ticker_ids per request")
+    if start and end and as_utc(start) >= as_utc(end):
+        raise HTTPException(status_code=400, detail="start must be before end")
+    
+    try:
+        if format == "columnar":
+            series = await price_snapshot_service.get_price_series(
+                game_id=game_id,
+                round_id=round_id,
+                limit=limit,
+                ticker_ids=ticker_ids,
+                start=start,
+                end=end
+            )
+            return FastJSONResponse(_columnar_response(series, encoding))
+        
+        history = await price_snapshot_service.get_price_history_multi(
+            ticker_ids=ticker_ids,
+            game_id=game_id,
+            round_id=round_id,
+            start=start,
+            end=end,
+            limit=limit
+        )
+        return FastJSONResponse(PriceHistoryResponse(
+            success=True,
+            history=[TickerPriceHistory(ticker_id=tid, snapshots=snaps) for tid, snaps in history.items()],
+            count=sum(len(snaps) for snaps in history.values())
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching price history: {str(e)}")
+
+
+@router.get("/candles", response_model=PriceCandlesResponse)
+async def get_price_candles(
+    game_id: Optional[int] = Query(None, description="Filter by game ID"),
+    round_id: Optional[int] = Query(None, description="Filter by round ID"),
+    ticker_id: Optional[int] = Query(None, description="Filter by ticker ID"),
+    method: str = Query("ohlc", pattern="^(ohlc|lttb)$", description="ohlc candles or lttb downsampled line"),
+    bucket_ms: Optional[int] = Query(None, ge=1, description="Candle width in milliseconds (ohlc)"),
+    max_points: Optional[int] = Query(None, ge=3, le=10000, description="Maximum points per ticker")
+):
+    """
+    Get price history aggregated for charts, one series per ticker.
+    
+    - **game_id** / **round_id**: At least one is required
+    - **ticker_id**: Only this ticker
+    - **method**: `ohlc` (open/high/low/close per bucket) or `lttb`
+      (Largest-Triangle-Three-Buckets downsampling of the price line)
+    - **bucket_ms**: Candle width for `ohlc`
+    - **max_points**: Point budget per ticker; required for `lttb`, and picks the
+      bucket width for `ohlc` when `bucket_ms` is not given
+    """
+    if not game_id and not round_id:
+        raise HTTPException(status_code=400, detail="Must provide at least game_id or round_id")
+    if method == "lttb" and not max_points:
+        raise HTTPException(status_code=400, detail="max_points is required for lttb")
+    if method == "ohlc" and not bucket_ms and not max_points:
+        raise HTTPException(status_code=400, detail="Must provide bucket_ms or max_points")
+    
+    try:
+        series, source_count = await price_snapshot_service.get_price_candles(
+            game_id=game_id,
+            round_id=round_id,
+            ticker_id=ticker_id,
+            method=method,
+            bucket_ms=bucket_ms,
+            max_points=max_points
+        )
+        items = [PriceCandles(ticker_id=tid, **arrays) for tid, arrays in series.items()]
+        return FastJSONResponse(PriceCandlesResponse(
+            success=True,
+            method=method,
+            series=items,
+            count=sum(len(item.timestamps) for item in items),
+            source_count=source_count
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error aggregating price snapshots: {str(e)}")
+
+
+@router.get("/export")
+async def export_price_snapshots(
+    game_ids: Optional[List[int]] = Query(None, description="Games to export (repeat the parameter)"),
+    round_id: Optional[int] = Query(None, description="Only this round"),
+    ticker_ids: Optional[List[int]] = Query(None, description="Only these tickers (repeat the parameter)"),
+    format: str = Query("csv", pattern="^(csv|arrow|parquet)$", description="csv, arrow (IPC stream) or parquet"),
+    page_size: Optional[int] = Query(None, ge=100, le=100000, description="Rows per page, record batch or row group")
+):
+    """
+    Stream price snapshots for offline analysis, in id order.
+    
+    The table is read with keyset pagination (`id > last id`) and each page is
+    encoded and sent as it arrives, so memory stays flat however large the export.
+    
+    - **game_ids** / **round_id**: At least one is required
+    - **ticker_ids**: Only these tickers
+    - **format**: `csv`, `arrow` (Arrow IPC stream) or `parquet` (needs pyarrow)
+    """
+    if not game_ids and not round_id:
+        raise HTTPException(status_code=400, detail="Must provide at least game_ids or round_id")
+    try:
+        price_export.check_format(format)
+    except price_export.ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    pages = price_snapshot_service.iter_price_snapshot_pages(
+        game_ids=game_ids,
+        round_id=round_id,
+        ticker_ids=ticker_ids,
+        page_size=page_size
+    )
+    # Read the first page before answering, so storage errors still get a proper status
+    try:
+        first = await anext(pages, None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting price snapshots: {str(e)}")
+    
+    async def all_pages():
+        if first:
+            yield first
+        async for rows in pages:
+            yield rows
+    
+    spec = price_export.EXPORT_FORMATS[format]
+    filename = f"price-snapshots.{spec['extension']}"
+    return StreamingResponse(
+        price_export.encode_pages(all_pages(), format),
+        media_type=spec["media_type"],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/rollups", response_model=PriceRollupsListResponse)
+async def get_price_rollups(
+    game_id: Optional[int] = Query(None, description="Filter by game ID"),
+    round_id: Optional[int] = Query(None, description="Filter by round ID"),
+    ticker_ids: Optional[List[int]] = Query(None, description="Only these tickers (repeat the parameter)")
+):
+    """
+    Get per-round OHLC summaries of ended rounds.
+    
+    Written by the compaction job once a round ends; they remain after the raw
+    snapshots are purged.
+    
+    - **game_id** / **round_id**: At least one is required
+    """
+    if not game_id and not round_id:
+        raise HTTPException(status_code=400, detail="Must provide at least game_id or round_id")
+    try:
+        rollups = await price_snapshot_service.get_price_rollups(game_id, round_id, ticker_ids)
+        return FastJSONResponse(PriceRollupsListResponse(
+            success=True,
+            rollups=rollups,
+            count=len(rollups)
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching price rollups: {str(e)}")
+
+
+@router.get("/compaction", response_model=PriceCompactionResponse)
+async def get_compaction_status():
+    """Progress metrics and settings of the price snapshot compaction job."""
+    return PriceCompactionResponse(success=True, status=PriceCompactionStatus(**price_compaction.status()))
+
+
+@router.post("/compaction/run", response_model=PriceCompactionResponse)
+async def run_compaction():
+    """
+    Run one compaction pass now (waits for a pass already in progress).
+    
+    Rolls up ended rounds and purges raw snapshots past the retention window.
+    """
+    await price_compaction.compact_once()
+    status = PriceCompactionStatus(**price_compaction.status())
+    return PriceCompactionResponse(success=status.last_error is None, status=status)
@@ -4,10 +4,12 @@ API routes for round scores.
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 from backend.models import (
-    RoundScore, RoundScoreCreate, RoundScoreResponse,
+    RoundScore, RoundScoreCreate, RoundScoreBatchCreate, RoundScoreEntry, RoundScoreResponse,
     RoundScoresListResponse
 )
+from backend.services.row_convert import models_to_rows
 from backend.services import round_score_service
+from backend.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api/round-scores", tags=["round-scores"])
 
@@ -24,7 +26,7 @@ async def create_round_score(score_data: RoundScoreCreate):
     - **reaction_ms**: Reaction time in milliseconds (optional)
     """
     try:
-        score = round_score_service.create_round_score(
+        score = await round_score_service.create_round_score(
             participant_id=score_data.participant_id,
             round_id=score_data.round_id,
             pnl_delta=score_data.pnl_delta,
@@ -46,6 +48,46 @@ async def create_round_score(score_data: RoundScoreCreate):
         raise HTTPException(status_code=500, detail=f"Error creating round score: {str(e)}")
 
 
+@router.post("/batch", response_model=RoundScoresListResponse, status_code=201)
+async def create_round_scores_batch(batch_data: RoundScoreBatchCreate):
+    """
+    Submit every participant's score for a round in one request.
+    
+    The scores are validated together and stored with a single bulk insert;
+    leaderboards are updated once for the whole batch.
+    
+    - **round_id**: The round ID
+    - **scores**: Up to 1000 entries of participant_id, pnl_delta, reacted and
+      reaction_ms (optional), one per participant
+    """
+    seen, duplicates = set(), set()
+    for score in batch_data.scores:
+        if score.participant_id in seen:
+            duplicates.add(score.participant_id)
+        seen.add(score.participant_id)
+    if duplicates:
+        raise HTTPException(status_code=422, detail=f"Duplicate participant_id in batch: {sorted(duplicates)}")
+    
+    try:
+        scores = await round_score_service.create_round_scores_batch(
+            batch_data.round_id,
+            models_to_rows(RoundScoreEntry, batch_data.scores)
+        )
+        
+        if not scores:
+            raise HTTPException(status_code=500, detail="Failed to create round scores")
+        
+        return FastJSONResponse(RoundScoresListResponse(
+            success=True,
+            scores=scores,
+            count=len(scores)
+        ), status_code=201)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating round scores batch: {str(e)}")
+
+
 @router.get("", response_model=RoundScoresListResponse)
 async def get_round_scores(
     round_id: Optional[int] = Query(None, description="Filter by round ID"),
@@ -59,17 +101,17 @@ async def get_round_scores(
     """
     try:
         if round_id:
-            scores = round_score_service.get_round_scores_by_round(round_id)
+            scores = await round_score_service.get_round_scores_by_round(round_id)
         elif participant_id:
-            scores = round_score_service.get_round_scores_by_participant(participant_id)
+            scores = await round_score_service.get_round_scores_by_participant(participant_id)
         else:
             raise HTTPException(status_code=400, detail="Must provide either round_id or participant_id")
         
-        return RoundScoresListResponse(
+        return FastJSONResponse(RoundScoresListResponse(
             success=True,
             scores=scores,
             count=len(scores)
-        )
+        ))
     except HTTPException:
         raise
     except Exception as e:
@@ -83,7 +125,7 @@ async def get_round_score_by_id(score_id: int):
     
     - **score_id**: The round score ID
     """
-    score = round_score_service.get_round_score_by_id(score_id)
+    score = await round_score_service.get_round_score_by_id(score_id)
     if not score:
         raise HTTPException(status_code=404, detail=f"Round score with id '{score_id}' not found")
     
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 from backend.models import Ticker, TickerCreate, TickerResponse, TickersListResponse
 from backend.services import ticker_service
+from backend.responses import FastJSONResponse
 
 router = APIRouter(prefix="/api/tickers", tags=["tickers"])
 
@@ -16,12 +17,12 @@ async def get_tickers():
     
     Returns all tickers sorted by symbol.
     """
-    tickers = ticker_service.get_all_tickers()
-    return TickersListResponse(
+    tickers = await ticker_service.get_all_tickers()
+    return FastJSONResponse(TickersListResponse(
         success=True,
         tickers=tickers,
         count=len(tickers)
-    )
+    ))
 
 
 @router.get("/{ticker_id}", response_model=TickerResponse)
@@ -31,7 +32,7 @@ async def get_ticker_by_id(ticker_id: int):
     
     - **ticker_id**: The ticker ID
     """
-    ticker = ticker_service.get_ticker_by_id(ticker_id)
+    ticker = await ticker_service.get_ticker_by_id(ticker_id)
     if not ticker:
         raise HTTPException(status_code=404, detail=f"Ticker with id '{ticker_id}' not found")
     
@@ -49,7 +50,7 @@ async def get_ticker_by_symbol(symbol: str):
     
     - **symbol**: The ticker symbol (e.g., "AAPL")
     """
-    ticker = ticker_service.get_ticker_by_symbol(symbol)
+    ticker = await ticker_service.get_ticker_by_symbol(symbol)
     if not ticker:
         raise HTTPException(status_code=404, detail=f"Ticker with symbol '{symbol}' not found")
     
@@ -71,11 +72,11 @@ async def create_ticker(ticker_data: TickerCreate):
     """
     try:
         # Check if ticker already exists
-        existing = ticker_service.get_ticker_by_symbol(ticker_data.symbol)
+        existing = await ticker_service.get_ticker_by_symbol(ticker_data.symbol)
         if existing:
             raise HTTPException(status_code=400, detail=f"Ticker with symbol '{ticker_data.symbol}' already exists")
         
-        ticker = ticker_service.create_ticker(
+        ticker = await ticker_service.create_ticker(
             symbol=ticker_data.symbol,
             name=ticker_data.name,
             sector=ticker_data.sector
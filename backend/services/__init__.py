@@ -1,9 +1,14 @@
 # Services package
+from . import event_bus
 from . import event_service
+from . import timeline_service
 from . import ticker_service
 from . import game_service
+from . import leaderboard_service
 from . import round_score_service
+from . import price_store
 from . import price_snapshot_service
+from . import price_compaction
 
-__all__ = ["event_service", "ticker_service", "game_service", "round_score_service", "price_snapshot_service"]
+__all__ = ["event_bus", "event_service", "timeline_service", "ticker_service", "game_service", "leaderboard_service", "round_score_service", "price_store", "price_snapshot_service", "price_compaction"]
 
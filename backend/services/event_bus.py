@@ -0,0 +1,120 @@
+"""
+In-process fan-out of generated events to live subscribers.
+
+Each subscriber owns a bounded queue. Publishing never waits: an event is
+put on every matching queue, and a subscriber whose queue is already full is
+too slow to keep up, so it is dropped (its stream ends and it may reconnect)
+instead of holding back everyone else.
+"""
+import asyncio
+import os
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+from backend.models import Event
+
+# Events buffered per subscriber before it is treated as a slow consumer
+EVENT_STREAM_QUEUE_SIZE = int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "100"))
+# Seconds of silence before a stream sends a keepalive
+EVENT_STREAM_KEEPALIVE = float(os.getenv("EVENT_STREAM_KEEPALIVE", "15"))
+
+# Topic keys: ("round", id), ("game", id) or ("all", None)
+Topic = Tuple[str, Hashable]
+
+_subscribers: Dict[Topic, Set["Subscription"]] = {}
+
+
+def _topic(game_id: Optional[int] = None, round_id: Optional[int] = None) -> Topic:
+    if round_id is not None:
+        return ("round", round_id)
+    if game_id is not None:
+        return ("game", game_id)
+    return ("all", None)
+
+
+class Subscription:
+    """A live subscriber's bounded event queue."""
+
+    __slots__ = ("topic", "queue", "dropped")
+
+    def __init__(self, topic: Topic, maxsize: int):
+        self.topic = topic
+        self.queue: "asyncio.Queue[Optional[Event]]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def offer(self, event: Event) -> bool:
+        """Queue an event without waiting; drop the subscriber if its queue is full."""
+        if self.dropped:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self._drop()
+            return False
+
+    def _drop(self) -> None:
+        self.dropped = True
+        # Discard the backlog and wake the reader with the end-of-stream marker
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+        unsubscribe(self)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """
+        Wait for the next event.
+        Returns None once the subscriber has been dropped; raises
+        asyncio.TimeoutError if nothing arrives within timeout.
+        """
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+def subscribe(game_id: Optional[int] = None, round_id: Optional[int] = None, maxsize: Optional[int] = None) -> Subscription:
+    """
+    Subscribe to newly generated events.
+
+    Args:
+        game_id: Only receive events generated for this game
+        round_id: Only receive events of this round (takes precedence over game_id)
+        maxsize: Queue size before the subscriber is dropped (default: EVENT_STREAM_QUEUE_SIZE)
+    """
+    sub = Subscription(_topic(game_id, round_id), maxsize or EVENT_STREAM_QUEUE_SIZE)
+    _subscribers.setdefault(sub.topic, set()).add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscription) -> None:
+    """Stop delivering events to a subscriber."""
+    subs = _subscribers.get(sub.topic)
+    if subs is None:
+        return
+    subs.discard(sub)
+    if not subs:
+        del _subscribers[sub.topic]
+
+
+def publish(events: Iterable[Event], game_id: Optional[int] = None, round_id: Optional[int] = None) -> int:
+    """
+    Fan events out to subscribers of their round, their game and all events.
+
+    Returns:
+        Number of deliveries made
+    """
+    targets = []
+    for topic in {_topic(round_id=round_id), _topic(game_id=game_id), _topic()}:
+        subs = _subscribers.get(topic)
+        if subs:
+            targets.extend(subs)
+    if not targets:
+        return 0
+
+    delivered = 0
+    for event in events:
+        for sub in targets:
+            if sub.offer(event):
+                delivered += 1
+    return delivered
+
+
+def subscriber_count() -> int:
+    """Number of live subscribers across all topics."""
+    return sum(len(subs) for subs in _subscribers.values())
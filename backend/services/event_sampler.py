@@ -0,0 +1,209 @@
+"""
+Weighted event sampling with sliding-window recency exclusion.
+
+Each event type gets a Fenwick (binary indexed) tree over integer template
+weights. A draw is a single O(log n) descent of the tree, and excluding a
+recently used template is an O(log n) point update that sets its weight to
+zero until it slides out of the "no repeat within N" window. Nothing is
+rebuilt per draw.
+"""
+import os
+import random
+from collections import deque
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Weights are scaled to integers so point updates never drift
+WEIGHT_SCALE = 1000
+
+
+def parse_weights(value: str, name: str = "weights") -> Dict[str, float]:
+    """
+    Parse "KEY=weight,KEY=weight" (e.g. "HIGH=0.5,tech=2") into a dict.
+    Malformed or negative entries are reported and skipped.
+    """
+    weights: Dict[str, float] = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        key, _, raw = item.partition("=")
+        try:
+            weight = float(raw)
+            if not key.strip() or weight < 0:
+                raise ValueError
+        except ValueError:
+            print(f"Ignoring invalid {name} entry: {item!r}")
+            continue
+        weights[key.strip()] = weight
+    return weights
+
+
+# Relative weights by difficulty (|baseImpactPct| bucket, same cut-offs as severity).
+# Uniform by default, like the frontend's pick; e.g. EVENT_DIFFICULTY_WEIGHTS="LOW=1,NORMAL=1,HIGH=0.5"
+DIFFICULTY_WEIGHTS = {
+    "LOW": 1.0, "NORMAL": 1.0, "HIGH": 1.0,
+    **parse_weights(os.getenv("EVENT_DIFFICULTY_WEIGHTS", ""), "EVENT_DIFFICULTY_WEIGHTS"),
+}
+
+# Relative weights by sector tag; templates without a listed tag weigh 1.0
+# e.g. EVENT_SECTOR_WEIGHTS="tech=2,energy=1.5,retail=0.5"
+SECTOR_WEIGHTS: Dict[str, float] = parse_weights(os.getenv("EVENT_SECTOR_WEIGHTS", ""), "EVENT_SECTOR_WEIGHTS")
+
+
+def template_difficulty(template: Mapping) -> str:
+    """Bucket a template by the size of its base impact."""
+    impact = abs(float(template["baseImpactPct"]))
+    if template["type"] == "BLACKSWAN" or impact >= 0.02:
+        return "HIGH"
+    if impact >= 0.01:
+        return "NORMAL"
+    return "LOW"
+
+
+def default_weight(template: Mapping) -> float:
+    """Template weight: explicit "weight" key, times difficulty and sector factors."""
+    weight = float(template.get("weight", 1.0))
+    weight *= DIFFICULTY_WEIGHTS.get(template_difficulty(template), 1.0)
+    for tag in template.get("tags", ()):
+        if tag in SECTOR_WEIGHTS:
+            weight *= SECTOR_WEIGHTS[tag]
+            break
+    return weight
+
+
+class FenwickTree:
+    """Binary indexed tree over non-negative integer weights."""
+
+    __slots__ = ("_n", "_tree", "_top")
+
+    def __init__(self, weights: Sequence[int]):
+        n = len(weights)
+        tree = [0] * (n + 1)
+        for i, w in enumerate(weights, 1):
+            tree[i] += w
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self._n = n
+        self._tree = tree
+        self._top = 1 << (n.bit_length() - 1) if n else 0
+
+    def add(self, index: int, delta: int) -> None:
+        """Add delta to the weight at a 0-based index."""
+        i = index + 1
+        tree = self._tree
+        while i <= self._n:
+            tree[i] += delta
+            i += i & -i
+
+    def total(self) -> int:
+        """Sum of all weights."""
+        i = self._n
+        total = 0
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, value: int) -> int:
+        """0-based index of the item whose cumulative weight range contains value."""
+        pos = 0
+        step = self._top
+        tree = self._tree
+        while step:
+            nxt = pos + step
+            if nxt <= self._n and tree[nxt] <= value:
+                pos = nxt
+                value -= tree[nxt]
+            step >>= 1
+        return pos
+
+
+class _TypeSampler:
+    """Fenwick-backed sampler for the templates of one event type."""
+
+    __slots__ = ("templates", "index", "base", "fallback", "weights", "tree", "total")
+
+    def __init__(self, templates: Sequence[Mapping], weight_fn: Callable[[Mapping], float]):
+        self.templates = tuple(templates)
+        self.index = {t["id"]: i for i, t in enumerate(self.templates)}
+        self.base = [max(0, round(weight_fn(t) * WEIGHT_SCALE)) for t in self.templates]
+        self.fallback = self.base if any(self.base) else None
+        self.weights = list(self.base)
+        self.tree = FenwickTree(self.weights)
+        self.total = sum(self.base)
+
+    def set_weight(self, i: int, weight: int) -> None:
+        delta = weight - self.weights[i]
+        if delta:
+            self.weights[i] = weight
+            self.tree.add(i, delta)
+            self.total += delta
+
+    def draw(self, rng: random.Random) -> Mapping:
+        if self.total > 0:
+            return self.templates[self.tree.find(rng.randrange(self.total))]
+        # Everything is in the recency window: ignore exclusion (as before)
+        return rng.choices(self.templates, weights=self.fallback)[0]
+
+
+class EventSampler:
+    """
+    Weighted sampler over all event types with a shared recency window.
+
+    A template drawn (or marked used) is excluded from draws until `window`
+    newer events have been recorded.
+    """
+
+    def __init__(
+        self,
+        pools: Mapping[str, Sequence[Mapping]],
+        window: int = 20,
+        weight_fn: Callable[[Mapping], float] = default_weight,
+        rng: Optional[random.Random] = None,
+    ):
+        self._types = {t: _TypeSampler(pool, weight_fn) for t, pool in pools.items() if pool}
+        self._owner: Dict[str, Tuple[_TypeSampler, int]] = {}
+        for sampler in self._types.values():
+            for template_id, i in sampler.index.items():
+                self._owner[template_id] = (sampler, i)
+        self._window = window
+        self._recent: deque = deque()
+        self._in_window: Dict[str, int] = {}
+        self._rng = rng or random
+
+    def draw(self, event_type: str) -> Mapping:
+        """Draw a template of the given type and record it as used."""
+        sampler = self._types.get(event_type)
+        if sampler is None:
+            raise ValueError(f"Cannot pick from empty pool: {event_type}")
+        template = sampler.draw(self._rng)
+        self.mark_used(template["id"])
+        return template
+
+    def mark_used(self, template_id: str) -> None:
+        """Record a template as used, sliding the oldest one out of the window."""
+        owner = self._owner.get(template_id)
+        if owner is None or self._window <= 0:
+            return
+        sampler, i = owner
+        self._recent.append(template_id)
+        count = self._in_window.get(template_id, 0) + 1
+        self._in_window[template_id] = count
+        if count == 1:
+            sampler.set_weight(i, 0)
+
+        if len(self._recent) > self._window:
+            oldest = self._recent.popleft()
+            remaining = self._in_window[oldest] - 1
+            if remaining:
+                self._in_window[oldest] = remaining
+            else:
+                del self._in_window[oldest]
+                old_sampler, j = self._owner[oldest]
+                old_sampler.set_weight(j, old_sampler.base[j])
+
+    def recent_ids(self) -> List[str]:
+        """Template IDs currently in the recency window, oldest first."""
+        return list(self._recent)
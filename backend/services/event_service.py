@@ -1,8 +1,17 @@
+import asyncio
+import os
 import random
 import time
-from typing import List, Optional
-from backend.models import Event, EventType
-from backend.database import get_supabase_client
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Literal, Mapping, Optional, Tuple
+from backend.models import Event, EventType, EventsListResponse
+from backend.database import get_storage
+from backend.responses import json_dumps
+from backend.services import event_bus
+from backend.services.event_templates import TemplateRegistry
+from backend.services.listing_cache import CachedBody, ListingCache
+from backend.services.row_convert import construct, parse_timestamp
+from backend.services.event_sampler import EventSampler, default_weight
 
 # Event pools - expanded with many more events
 MACRO_POOL = [
@@ -55,82 +64,127 @@ BLACKSWAN_POOL = [
     {"id": "bs-8", "type": "BLACKSWAN", "title": "Commodity Shock: Resource Shortage", "baseImpactPct": -0.085, "icon": "⚡", "details": "Critical resource shortage creates widespread economic disruption."},
 ]
 
+# Immutable template index, built once at import
+TEMPLATES = TemplateRegistry(MACRO_POOL + MICRO_POOL + BLACKSWAN_POOL)
+
 _seq_counter = 0
 _bs_seq_counter = 0
 
-# Track recently used events to avoid repetition
-_recently_used_events = []  # List of event IDs used in the last N events
-_MAX_RECENT_TRACK = 10  # Track last 10 events to avoid repetition
+# Track recently used events to avoid repetition ("no repeat within N" per sampler)
+_MAX_RECENT_TRACK = int(os.getenv("EVENT_NO_REPEAT_WINDOW", "20"))
+_MAX_GAME_SAMPLERS = 1024  # Per-game samplers kept, least recently used evicted first
+_sampler: Optional[EventSampler] = None  # Shared sampler, seeded from the database once
+_game_samplers: "OrderedDict[int, EventSampler]" = OrderedDict()
+_weight_fn: Callable[[Mapping], float] = default_weight
+
+# Latest round id (any game) and latest round id per game, resolved once and
+# then kept warm by game_service
+_current_round_id: Optional[int] = None
+_current_game_rounds: "OrderedDict[int, int]" = OrderedDict()
+
+# Event listings: "all" (optionally by type), "news" (MACRO/MICRO) or "blackswan"
+EventListing = Literal["all", "news", "blackswan"]
+
+# Rows fetched per query when streaming event listings
+EVENT_PAGE_SIZE = int(os.getenv("EVENT_PAGE_SIZE", "500"))
 
+# runtime_id -> database row id for recently stored or read events
+_MAX_RUNTIME_INDEX = int(os.getenv("EVENT_RUNTIME_INDEX_SIZE", "10000"))
+_runtime_index: "OrderedDict[str, int]" = OrderedDict()
 
-def _get_recently_used_event_ids(limit: int = 20) -> set:
+# Encoded list responses, invalidated whenever events are written
+listing_cache = ListingCache(
+    max_entries=int(os.getenv("EVENT_LIST_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("EVENT_LIST_CACHE_TTL", "5"))
+)
+
+# Persist generated events in the background instead of on the request path
+EVENT_WRITE_BEHIND = os.getenv("EVENT_WRITE_BEHIND", "true").lower() in ("1", "true", "yes")
+_pending_writes: set = set()
+
+
+async def _get_recently_used_event_ids(limit: int = _MAX_RECENT_TRACK) -> List[str]:
     """
     Get recently used event IDs from the database to avoid repetition.
-    Returns a set of event template IDs (like 'macro-1', 'micro-2') that were recently used.
+    Returns event template IDs (like 'macro-1', 'micro-2'), most recent first.
+    Only used to warm the in-process tracker.
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     try:
         # Get recent events from database (last 20 events)
-        result = supabase.table("events").select("headline").order("id", desc=True).limit(limit).execute()
+        rows = await storage.select("events", columns="template_id,headline", order_by="id", desc=True, limit=limit)
         
-        # Extract event IDs by matching headlines to our pools
-        recent_ids = set()
-        for row in result.data:
-            headline = row.get("headline", "")
-            # Match headline to find the event ID from our pools
-            for event in MACRO_POOL + MICRO_POOL + BLACKSWAN_POOL:
-                if event["title"] == headline:
-                    recent_ids.add(event["id"])
-                    break
+        # Prefer the stored template id; older rows are matched by headline
+        recent_ids = []
+        for row in rows:
+            template_id = row.get("template_id") or TEMPLATES.id_for_title(row.get("headline") or "")
+            if template_id:
+                recent_ids.append(template_id)
         return recent_ids
     except Exception as e:
         print(f"Error fetching recent events: {e}")
-        return set()
+        return []
 
 
-def _pick_random(arr: List[dict], avoid_recent: bool = True) -> dict:
+def _new_sampler() -> EventSampler:
+    pools = {t: TEMPLATES.of_type(t) for t in ("MACRO", "MICRO", "BLACKSWAN")}
+    return EventSampler(pools, window=_MAX_RECENT_TRACK, weight_fn=_weight_fn)
+
+
+async def _get_sampler(game_id: Optional[int] = None) -> EventSampler:
     """
-    Pick a random item from a list, avoiding recently used events.
-    
-    Args:
-        arr: List of event dictionaries
-        avoid_recent: If True, avoid events that were recently used
-    
-    Returns:
-        Random event dictionary
+    Get the sampler that tracks recency for a game (or the shared one).
+    The shared sampler is seeded from the database once, then kept up to date in memory.
     """
-    if not arr:
-        raise ValueError("Cannot pick from empty array")
-    
-    if not avoid_recent or len(arr) <= 1:
-        return random.choice(arr)
-    
-    # Get recently used event IDs
-    recent_ids = _get_recently_used_event_ids()
-    
-    # Filter out recently used events
-    available = [e for e in arr if e["id"] not in recent_ids]
-    
-    # If all events were recently used, use the full pool anyway (to avoid infinite loop)
-    if not available:
-        available = arr
-    
-    return random.choice(available)
+    global _sampler
+    if game_id is None:
+        if _sampler is None:
+            _sampler = _new_sampler()
+            for event_id in reversed(await _get_recently_used_event_ids(_MAX_RECENT_TRACK)):
+                _sampler.mark_used(event_id)
+        return _sampler
+
+    sampler = _game_samplers.get(game_id)
+    if sampler is None:
+        sampler = _game_samplers[game_id] = _new_sampler()
+        if len(_game_samplers) > _MAX_GAME_SAMPLERS:
+            _game_samplers.popitem(last=False)
+    else:
+        _game_samplers.move_to_end(game_id)
+    return sampler
+
 
-def _get_or_create_round_id() -> int:
+def configure_sampling(
+    window: Optional[int] = None,
+    weight_fn: Optional[Callable[[Mapping], float]] = None
+) -> None:
+    """
+    Change the no-repeat window or template weighting.
+    Samplers are rebuilt lazily on the next draw.
+    """
+    global _MAX_RECENT_TRACK, _weight_fn, _sampler
+    if window is not None:
+        _MAX_RECENT_TRACK = window
+    if weight_fn is not None:
+        _weight_fn = weight_fn
+    _sampler = None
+    _game_samplers.clear()
+
+
+async def _get_or_create_round_id() -> int:
     """
     Resolve a valid round_id to satisfy FK:
     - Try latest round id from public.rounds
     - If none exists, create a default one with id=1
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     try:
-        res = supabase.table("rounds").select("id").order("id", desc=True).limit(1).execute()
-        if res.data and len(res.data) > 0 and res.data[0].get("id") is not None:
-            return int(res.data[0]["id"])
+        rows = await storage.select("rounds", columns="id", order_by="id", desc=True, limit=1)
+        if rows and rows[0].get("id") is not None:
+            return int(rows[0]["id"])
         # Create a default round if table exists but empty
         try:
-            create_res = supabase.table("rounds").insert({"id": 1, "game_id": 1, "round_no": 1}).execute()
+            await storage.insert("rounds", {"id": 1, "game_id": 1, "round_no": 1})
             # If created, return 1; if conflict, still use 1
             return 1
         except Exception:
@@ -138,6 +192,61 @@ def _get_or_create_round_id() -> int:
     except Exception:
         # If rounds table not accessible, fallback to 1
         return 1
+
+
+async def _game_round_id(game_id: int) -> Optional[int]:
+    """Latest round of a game (cached), or None if it has none."""
+    round_id = _current_game_rounds.get(game_id)
+    if round_id is None:
+        try:
+            rows = await get_storage().select(
+                "rounds", [("game_id", "eq", game_id)], columns="id", order_by="id", desc=True, limit=1
+            )
+        except Exception as e:
+            print(f"Error resolving round of game {game_id}: {e}")
+            return None
+        if not rows:
+            return None
+        round_id = int(rows[0]["id"])
+        set_current_round_id(round_id, game_id)
+    else:
+        _current_game_rounds.move_to_end(game_id)
+    return round_id
+
+
+async def _resolve_round_id(game_id: Optional[int] = None) -> Tuple[int, Optional[int]]:
+    """
+    Resolve the round to store events under, hitting the database only on first use.
+
+    Returns:
+        (round id to store, round id to publish under). For a game this is its
+        latest round; a game without rounds stores under the latest round of
+        any game (round_id is required) but publishes to no round.
+    """
+    global _current_round_id
+    if game_id is not None:
+        round_id = await _game_round_id(game_id)
+        if round_id is not None:
+            return round_id, round_id
+    if _current_round_id is None:
+        _current_round_id = await _get_or_create_round_id()
+    return _current_round_id, None if game_id is not None else _current_round_id
+
+
+def set_current_round_id(round_id: int, game_id: Optional[int] = None) -> None:
+    """Keep the round-id resolver warm when a newer round is created or fetched."""
+    global _current_round_id
+    if _current_round_id is None or round_id > _current_round_id:
+        _current_round_id = round_id
+    if game_id is not None:
+        current = _current_game_rounds.get(game_id)
+        if current is None or round_id > current:
+            _current_game_rounds[game_id] = round_id
+        _current_game_rounds.move_to_end(game_id)
+        while len(_current_game_rounds) > _MAX_GAME_SAMPLERS:
+            _current_game_rounds.popitem(last=False)
+
+
 def _map_event_type_for_enum(event_type: str) -> str:
     """
     Map internal event type to DB enum expected values.
@@ -152,6 +261,11 @@ def _event_to_db_dict(event: Event, round_id: Optional[int] = None, target_ticke
     Convert Event model to database dictionary format.
     Maps to the ACTUAL Supabase schema:
     - id (auto-generated)
+    - runtime_id (text, unique) - runtimeId handed to clients
+    - template_id (text) - event template ID (e.g., "macro-1")
+    - kind (text) - exact event type: MACRO, MICRO or BLACKSWAN
+    - ts (int8) - event time in milliseconds (scheduled time for timelines)
+    - scheduled (bool) - part of a pre-generated round timeline
     - round_id (int8)
     - etype (event_type enum: MACRO, MICRO)
     - severity (event_severity enum)
@@ -178,6 +292,10 @@ def _event_to_db_dict(event: Event, round_id: Optional[int] = None, target_ticke
     
     # Build dictionary matching actual schema
     db_dict = {
+        "runtime_id": event.runtimeId,
+        "template_id": event.id,
+        "kind": event.type,
+        "ts": event.ts,
         "etype": mapped_type,
         "severity": severity,
         "headline": event.title,
@@ -197,34 +315,25 @@ def _event_to_db_dict(event: Event, round_id: Optional[int] = None, target_ticke
 
 def _db_dict_to_event(db_dict: dict) -> Event:
     """
-    Convert database dictionary to Event model.
+    Convert a trusted database row to an Event model (no validation).
     Maps from ACTUAL Supabase table structure to Event model.
     """
-    # Extract event type from etype (actual column name)
-    event_type = db_dict.get("etype") or db_dict.get("type", "MACRO")
-    # If stored as MICRO but severity is HIGH, it might be a BLACKSWAN
-    if event_type == "MICRO" and db_dict.get("severity") == "HIGH" and abs(float(db_dict.get("impact_pct", 0))) > 0.05:
-        event_type = "BLACKSWAN"
+    # Exact type from kind; etype (BLACKSWAN stored as MICRO) only for rows not yet migrated
+    event_type = db_dict.get("kind") or db_dict.get("etype") or db_dict.get("type", "MACRO")
     
     # Extract title from headline (actual column name)
     title = db_dict.get("headline") or db_dict.get("title", "")
     # Extract description/details
     details = db_dict.get("description") or db_dict.get("details")
     
-    # Generate runtime id from database id and timestamp
-    db_id = db_dict.get("id", "unknown")
-    runtime_id = f"event-{db_id}-{int(time.time() * 1000)}"
+    # Stored runtime id; rows written before it was persisted get a stable one from the db id
+    runtime_id = db_dict.get("runtime_id") or f"event-{db_dict.get('id', 'unknown')}"
     
-    # Timestamp from created_at
+    # Timestamp from ts, else created_at
     ts = db_dict.get("ts")
     if not ts and db_dict.get("created_at"):
         # Convert created_at timestamp to milliseconds
-        import datetime
-        if isinstance(db_dict["created_at"], str):
-            dt = datetime.datetime.fromisoformat(db_dict["created_at"].replace('Z', '+00:00'))
-        else:
-            dt = db_dict["created_at"]
-        ts = int(dt.timestamp() * 1000)
+        ts = int(parse_timestamp(db_dict["created_at"]).timestamp() * 1000)
     if not ts:
         ts = int(time.time() * 1000)
     
@@ -236,107 +345,54 @@ def _db_dict_to_event(db_dict: dict) -> Event:
     if base_impact_pct is None:
         base_impact_pct = impact_pct  # Use impact_pct as fallback
     
-    # Generate a template ID based on type and title
-    event_id = f"{event_type.lower()}-{abs(hash(title)) % 1000}"
+    # Resolve the template: stored template_id first, then O(1) headline lookup
+    template = TEMPLATES.get(db_dict.get("template_id") or "") or TEMPLATES.by_title(title)
+    if template is not None:
+        event_id = template["id"]
+        icon = template["icon"]
+        tags = list(template.get("tags", ()))
+    else:
+        # Generate a template ID based on type and title
+        event_id = db_dict.get("template_id") or f"{event_type.lower()}-{abs(hash(title)) % 1000}"
+        icon = "📰"  # Default icon (not stored in actual schema)
+        tags = []  # Tags not stored in actual schema
     
-    return Event(
-        id=event_id,
-        type=event_type,
-        title=title,
-        baseImpactPct=float(base_impact_pct),
-        impactPct=float(impact_pct),
-        icon="📰",  # Default icon (not stored in actual schema)
-        tags=[],  # Tags not stored in actual schema
-        runtimeId=runtime_id,
-        ts=ts,
-        details=details,
-    )
+    return construct(Event, {
+        "id": event_id,
+        "type": event_type,
+        "title": title,
+        "baseImpactPct": float(base_impact_pct),
+        "icon": icon,
+        "tags": tags,
+        "impactPct": float(impact_pct),
+        "ts": int(ts),
+        "runtimeId": runtime_id,
+        "details": details,
+    })
 
 
-def generate_event(event_type: Optional[EventType] = None, force_blackswan: bool = False) -> Event:
-    """
-    Generate a new event and store it in Supabase.
-    Matches the frontend's nextEvent() and nextBlackSwan() logic.
-    
-    Args:
-        event_type: If provided, generate this specific type (MACRO or MICRO)
-        force_blackswan: If True, generate a blackswan event
-    
-    Returns:
-        Event object with generated data
-    """
-    global _seq_counter, _bs_seq_counter
-    supabase = get_supabase_client()
-    
-    if force_blackswan or event_type == "BLACKSWAN":
-        # Generate blackswan event (avoid recent ones)
-        base = _pick_random(BLACKSWAN_POOL, avoid_recent=True)
-        jitter = (random.random() - 0.5) * 0.04
-        impact_pct = round(base["baseImpactPct"] + jitter, 4)
-        runtime_id = f"{base['id']}-{int(time.time() * 1000)}-{_bs_seq_counter}"
-        _bs_seq_counter += 1
-        
-        event = Event(
-            id=base["id"],
-            type="BLACKSWAN",
-            title=base["title"],
-            baseImpactPct=base["baseImpactPct"],
-            icon=base["icon"],
-            tags=base.get("tags", []),
-            impactPct=impact_pct,
-            ts=int(time.time() * 1000),
-            runtimeId=runtime_id,
-            details=base.get("details", "Severe market dislocation detected.")
-        )
-    else:
-        # Generate MACRO or MICRO event
-        if event_type == "MACRO":
-            pool = MACRO_POOL
-        elif event_type == "MICRO":
-            pool = MICRO_POOL
-        else:
-            # Randomly choose between MACRO and MICRO (50/50)
-            pool = random.choice([MACRO_POOL, MICRO_POOL])
-        
-        # Pick random event avoiding recently used ones
-        base = _pick_random(pool, avoid_recent=True)
-        jitter = (random.random() - 0.5) * 0.008  # ±0.4%
-        impact_pct = round(base["baseImpactPct"] + jitter, 4)
-        runtime_id = f"{base['id']}-{int(time.time() * 1000)}-{_seq_counter}"
-        _seq_counter += 1
-        
-        event = Event(
-            id=base["id"],
-            type=base["type"],
-            title=base["title"],
-            baseImpactPct=base["baseImpactPct"],
-            icon=base["icon"],
-            tags=base.get("tags", []),
-            impactPct=impact_pct,
-            ts=int(time.time() * 1000),
-            runtimeId=runtime_id
-        )
-    
-    # Store the event in Supabase
+async def _persist_event(event: Event, db_dict: dict) -> None:
+    """Insert a generated event row, logging (not raising) on failure."""
+    storage = get_storage()
+    resolved_round_id = db_dict.get("round_id")
+    runtime_id = event.runtimeId
     try:
-        # Use latest round id (with safe fallback) to satisfy FK/NOT NULL if round_id is required
-        resolved_round_id = _get_or_create_round_id()
-        db_dict = _event_to_db_dict(event, round_id=resolved_round_id, target_ticker_id=None)
-        
         # Log what we're trying to insert for debugging
         print(f"[DEBUG] Attempting to insert {event.type} event: headline='{event.title}', round_id={resolved_round_id}")
         print(f"[DEBUG] Full db_dict: {db_dict}")
         
-        result = supabase.table("events").insert(db_dict).execute()
-        if not result.data:
+        rows = await storage.insert("events", db_dict)
+        listing_cache.invalidate()
+        _index_rows(rows)
+        if not rows:
             print(f"⚠️ Warning: {event.type} event inserted but no data returned: {runtime_id}")
             print(f"   This might indicate a constraint violation or RLS policy issue")
         else:
             event_type_label = "BLACKSWAN" if event.type == "BLACKSWAN" else event.type
-            print(f"✓ Successfully stored {event_type_label} event in Supabase: '{event.title}' (runtime_id: {runtime_id}, db_id: {result.data[0].get('id', 'unknown')}, round_id: {resolved_round_id})")
+            print(f"✓ Successfully stored {event_type_label} event: '{event.title}' (runtime_id: {runtime_id}, db_id: {rows[0].get('id', 'unknown')}, round_id: {resolved_round_id})")
     except Exception as e:
         error_msg = str(e)
-        print(f"✗ Error storing {event.type} event in Supabase: {error_msg}")
+        print(f"✗ Error storing {event.type} event: {error_msg}")
         print(f"   Event headline: '{event.title}'")
         print(f"   Round ID: {resolved_round_id}")
         print(f"   Full db_dict: {db_dict}")
@@ -356,55 +412,421 @@ def generate_event(event_type: Optional[EventType] = None, force_blackswan: bool
         traceback.print_exc()
         # Continue anyway - event is still generated, just not stored
         # In production, you might want to raise this or handle it differently
+
+
+async def _persist_events(events: List[Event], db_dicts: List[dict]) -> None:
+    """Insert a batch of generated event rows in one statement, logging on failure."""
+    storage = get_storage()
+    try:
+        rows = await storage.insert("events", db_dicts)
+        listing_cache.invalidate()
+        _index_rows(rows)
+        print(f"✓ Successfully stored {len(rows)}/{len(events)} events in one batch insert")
+    except Exception as e:
+        print(f"✗ Error storing batch of {len(events)} events: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+def _index_rows(rows: List[dict]) -> None:
+    """Remember the row id of each stored runtime id (bounded, oldest evicted first)."""
+    for row in rows:
+        runtime_id = row.get("runtime_id")
+        if runtime_id and row.get("id") is not None:
+            _runtime_index[runtime_id] = row["id"]
+            _runtime_index.move_to_end(runtime_id)
+    while len(_runtime_index) > _MAX_RUNTIME_INDEX:
+        _runtime_index.popitem(last=False)
+
+
+def _event_filters(event_id: str) -> list:
+    """
+    Storage filters selecting one event by database id or runtimeId.
+    Known runtime ids become a primary-key lookup; otherwise the indexed
+    runtime_id column is used.
+    """
+    if event_id.isdigit():
+        return [("id", "eq", int(event_id))]
+    row_id = _runtime_index.get(event_id)
+    if row_id is not None:
+        return [("id", "eq", row_id), ("runtime_id", "eq", event_id)]
+    legacy_id = event_id[len("event-"):] if event_id.startswith("event-") else ""
+    if legacy_id.isdigit():
+        # Stable runtime id synthesized for rows stored without one
+        return [("id", "eq", int(legacy_id))]
+    return [("runtime_id", "eq", event_id)]
+
+
+def _schedule_write(coro) -> None:
+    """Run a persistence coroutine in the background, tracked for flushing."""
+    task = asyncio.create_task(coro)
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def flush_pending_writes() -> None:
+    """Wait for background event inserts to finish (e.g. on shutdown)."""
+    if _pending_writes:
+        await asyncio.gather(*list(_pending_writes), return_exceptions=True)
+
+
+def _build_event(
+    sampler: EventSampler,
+    event_type: Optional[EventType] = None,
+    force_blackswan: bool = False,
+    ts: Optional[int] = None
+) -> Event:
+    """
+    Draw a template and build a runtime Event from it (no I/O).
+    Matches the frontend's nextEvent() and nextBlackSwan() logic.
+    """
+    global _seq_counter, _bs_seq_counter
+    if ts is None:
+        ts = int(time.time() * 1000)
+    
+    if force_blackswan or event_type == "BLACKSWAN":
+        # Generate blackswan event (avoid recent ones)
+        base = sampler.draw("BLACKSWAN")
+        jitter = (random.random() - 0.5) * 0.04
+        impact_pct = round(base["baseImpactPct"] + jitter, 4)
+        runtime_id = f"{base['id']}-{ts}-{_bs_seq_counter}"
+        _bs_seq_counter += 1
+        
+        return Event(
+            id=base["id"],
+            type="BLACKSWAN",
+            title=base["title"],
+            baseImpactPct=base["baseImpactPct"],
+            icon=base["icon"],
+            tags=base.get("tags", []),
+            impactPct=impact_pct,
+            ts=ts,
+            runtimeId=runtime_id,
+            details=base.get("details", "Severe market dislocation detected.")
+        )
+    
+    # Generate MACRO or MICRO event
+    if event_type not in ("MACRO", "MICRO"):
+        # Randomly choose between MACRO and MICRO (50/50)
+        event_type = random.choice(["MACRO", "MICRO"])
+    
+    # Weighted draw avoiding recently used ones
+    base = sampler.draw(event_type)
+    jitter = (random.random() - 0.5) * 0.008  # ±0.4%
+    impact_pct = round(base["baseImpactPct"] + jitter, 4)
+    runtime_id = f"{base['id']}-{ts}-{_seq_counter}"
+    _seq_counter += 1
+    
+    return Event(
+        id=base["id"],
+        type=base["type"],
+        title=base["title"],
+        baseImpactPct=base["baseImpactPct"],
+        icon=base["icon"],
+        tags=base.get("tags", []),
+        impactPct=impact_pct,
+        ts=ts,
+        runtimeId=runtime_id
+    )
+
+
+async def generate_event(
+    event_type: Optional[EventType] = None,
+    force_blackswan: bool = False,
+    wait_for_persist: Optional[bool] = None,
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None
+) -> Event:
+    """
+    Generate a new event and store it.
+    Matches the frontend's nextEvent() and nextBlackSwan() logic.
+    
+    Recency and round id come from warm in-process state, so the only DB call
+    is the insert, which runs in the background unless wait_for_persist is set.
+    
+    Args:
+        event_type: If provided, generate this specific type (MACRO or MICRO)
+        force_blackswan: If True, generate a blackswan event
+        wait_for_persist: Await the insert before returning
+            (defaults to the inverse of EVENT_WRITE_BEHIND)
+        game_id: Apply the no-repeat window per game instead of globally; the
+            event goes to the game's latest round unless round_id is given
+        round_id: Round to attach the event to
+    
+    Returns:
+        Event object with generated data
+    """
+    sampler = await _get_sampler(game_id)
+    event = _build_event(sampler, event_type=event_type, force_blackswan=force_blackswan)
+    
+    # The game's round (or latest round, as a safe fallback) to satisfy FK/NOT NULL
+    if round_id is not None:
+        resolved_round_id = publish_round_id = round_id
+    else:
+        resolved_round_id, publish_round_id = await _resolve_round_id(game_id)
+    db_dict = _event_to_db_dict(event, round_id=resolved_round_id, target_ticker_id=None)
+    
+    if wait_for_persist is None:
+        wait_for_persist = not EVENT_WRITE_BEHIND
+    if wait_for_persist:
+        await _persist_event(event, db_dict)
+    else:
+        _schedule_write(_persist_event(event, db_dict))
+    
+    # Push to live subscribers of this game/round
+    event_bus.publish([event], game_id=game_id, round_id=publish_round_id)
     
     return event
 
 
-def get_all_events(limit: Optional[int] = None, event_type: Optional[EventType] = None) -> List[Event]:
+def _apportion(count: int, mix: Dict[str, float]) -> List[str]:
+    """
+    Split count into event types by ratio (largest remainder), shuffled.
+    e.g. count=10, mix={"MACRO": 0.45, "MICRO": 0.45, "BLACKSWAN": 0.1} -> 5/4/1 or 4/5/1
+    """
+    weights = {t: max(0.0, float(r)) for t, r in mix.items() if t in ("MACRO", "MICRO", "BLACKSWAN")}
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Event type mix must contain at least one positive ratio")
+    
+    exact = {t: count * w / total for t, w in weights.items()}
+    counts = {t: int(x) for t, x in exact.items()}
+    leftover = count - sum(counts.values())
+    by_remainder = sorted(exact, key=lambda t: (exact[t] - counts[t], random.random()), reverse=True)
+    for t in by_remainder[:leftover]:
+        counts[t] += 1
+    
+    types = [t for t, n in counts.items() for _ in range(n)]
+    random.shuffle(types)
+    return types
+
+
+async def generate_events_batch(
+    count: int,
+    mix: Optional[Dict[str, float]] = None,
+    game_id: Optional[int] = None,
+    wait_for_persist: Optional[bool] = None,
+    round_id: Optional[int] = None,
+    types: Optional[List[EventType]] = None,
+    timestamps: Optional[List[int]] = None
+) -> List[Event]:
+    """
+    Generate several events at once and store them with a single bulk insert.
+    
+    Args:
+        count: Number of events to generate
+        mix: Ratio per event type, e.g. {"MACRO": 0.45, "MICRO": 0.45, "BLACKSWAN": 0.1}
+            (default: MACRO/MICRO 50/50)
+        game_id: Apply the no-repeat window per game instead of globally
+        wait_for_persist: Await the insert before returning
+            (defaults to the inverse of EVENT_WRITE_BEHIND)
+        round_id: Round to attach the events to (default: the game's latest round)
+        types: Exact event type per position (overrides count and mix)
+        timestamps: Scheduled ts per position in milliseconds (default: now)
+    
+    Returns:
+        List of generated events, in timeline order
+    """
+    if types is None:
+        if count <= 0:
+            return []
+        types = _apportion(count, mix or {"MACRO": 0.5, "MICRO": 0.5})
+    scheduled = timestamps
+    if timestamps is None:
+        timestamps = [int(time.time() * 1000)] * len(types)
+    elif len(timestamps) != len(types):
+        raise ValueError("timestamps must have one entry per event")
+    if not types:
+        return []
+    
+    sampler = await _get_sampler(game_id)
+    if round_id is not None:
+        resolved_round_id = publish_round_id = round_id
+    else:
+        resolved_round_id, publish_round_id = await _resolve_round_id(game_id)
+    
+    events = [_build_event(sampler, event_type=t, ts=ts) for t, ts in zip(types, timestamps)]
+    db_dicts = [_event_to_db_dict(e, round_id=resolved_round_id, target_ticker_id=None) for e in events]
+    if scheduled is not None:
+        # Marks timeline rows, so get_scheduled_events skips ad-hoc events of the round
+        for db_dict in db_dicts:
+            db_dict["scheduled"] = True
+    
+    if wait_for_persist is None:
+        wait_for_persist = not EVENT_WRITE_BEHIND
+    if wait_for_persist:
+        await _persist_events(events, db_dicts)
+    else:
+        _schedule_write(_persist_events(events, db_dicts))
+    
+    # Scheduled (timeline) events are pushed when due (timeline_service), not now
+    if scheduled is None:
+        event_bus.publish(events, game_id=game_id, round_id=publish_round_id)
+    
+    return events
+
+
+def _listing_filters(listing: EventListing = "all", event_type: Optional[EventType] = None) -> list:
+    """
+    Storage filters for an event listing ("all", "news" or "blackswan").
+    Timeline events scheduled later in a round are left out until they are due.
     """
-    Get all stored events from Supabase, optionally filtered by type and limited.
+    due = [("ts", "lte", int(time.time() * 1000))]
+    if listing == "news":
+        return [("kind", "in", ["MACRO", "MICRO"])] + due
+    if listing == "blackswan":
+        # Served by the partial blackswan index
+        return [("kind", "eq", "BLACKSWAN")] + due
+    
+    # Filter by type if specified (use kind column)
+    if event_type:
+        return [("kind", "eq", event_type)] + due
+    return due
+
+
+async def get_events_page(
+    listing: EventListing = "all",
+    event_type: Optional[EventType] = None,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None
+) -> Tuple[List[Event], Optional[int]]:
+    """
+    Get one page of events, most recent first, using keyset pagination on id.
+    
+    Args:
+        listing: "all", "news" (MACRO and MICRO) or "blackswan"
+        event_type: Filter by event type (only for "all")
+        limit: Page size (default: everything)
+        before_id: Only return events with a database id below this cursor
+    
+    Returns:
+        (events, next_cursor) where next_cursor is passed as before_id for the
+        following page, or None when there are no more events
+    """
+    try:
+        return await _fetch_events_page(listing, event_type, limit, before_id)
+    except Exception as e:
+        print(f"Error fetching {listing} events: {e}")
+        return [], None
+
+
+async def get_events_page_body(
+    listing: EventListing = "all",
+    event_type: Optional[EventType] = None,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None
+) -> CachedBody:
+    """
+    Get one page of events as an encoded EventsListResponse with its ETag,
+    served from the listing cache while fresh (see get_events_page).
+    """
+    key = (listing, event_type, limit, before_id)
+    entry = listing_cache.get(key)
+    if entry is not None:
+        return entry
+    
+    version = listing_cache.version
+    try:
+        events, next_cursor = await _fetch_events_page(listing, event_type, limit, before_id)
+    except Exception as e:
+        print(f"Error fetching {listing} events: {e}")
+        events, next_cursor, version = [], None, -1  # Never cache a failed read
+    
+    response = EventsListResponse(success=True, events=events, count=len(events), next_cursor=next_cursor)
+    return listing_cache.put(key, json_dumps(response), version=version)
+
+
+async def _fetch_events_page(
+    listing: EventListing,
+    event_type: Optional[EventType],
+    limit: Optional[int],
+    before_id: Optional[int]
+) -> Tuple[List[Event], Optional[int]]:
+    storage = get_storage()
+    filters = _listing_filters(listing, event_type)
+    if before_id is not None:
+        filters.append(("id", "lt", before_id))
+    
+    # Order by id (descending for most recent first)
+    rows = await storage.select("events", filters, order_by="id", desc=True, limit=limit)
+    
+    # Convert database records to Event models
+    events = [_db_dict_to_event(row) for row in rows]
+    next_cursor = rows[-1]["id"] if limit and len(rows) == limit else None
+    return events, next_cursor
+
+
+async def iter_events(
+    listing: EventListing = "all",
+    event_type: Optional[EventType] = None,
+    limit: Optional[int] = None,
+    before_id: Optional[int] = None,
+    page_size: int = EVENT_PAGE_SIZE
+) -> AsyncIterator[Event]:
+    """
+    Yield events most recent first, fetching EVENT_PAGE_SIZE rows at a time,
+    so scanning a large events table keeps memory flat.
+    
+    Args:
+        listing: "all", "news" (MACRO and MICRO) or "blackswan"
+        event_type: Filter by event type (only for "all")
+        limit: Stop after this many events (default: everything)
+        before_id: Start below this cursor
+        page_size: Rows fetched per query
+    
+    Raises:
+        Exception: Storage errors are not swallowed, so a stream that fails
+            midway is never mistaken for the end of the listing
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        events, before_id = await _fetch_events_page(listing, event_type, size, before_id)
+        for event in events:
+            yield event
+        if remaining is not None:
+            remaining -= len(events)
+        if before_id is None:
+            return
+
+
+async def get_all_events(
+    limit: Optional[int] = None,
+    event_type: Optional[EventType] = None,
+    before_id: Optional[int] = None
+) -> List[Event]:
+    """
+    Get all stored events, optionally filtered by type and limited.
     
     Args:
         limit: Maximum number of events to return
         event_type: Filter by event type (MACRO, MICRO, BLACKSWAN)
+        before_id: Only return events older than this cursor
     
     Returns:
         List of events, most recent first
     """
-    supabase = get_supabase_client()
+    events, _ = await get_events_page("all", event_type, limit=limit, before_id=before_id)
+    return events
+
+
+async def get_scheduled_events(round_id: int) -> List[Event]:
+    """Get a round's timeline events (not its ad-hoc events) in scheduled (ts) order."""
+    storage = get_storage()
     
     try:
-        query = supabase.table("events").select("*")
-        
-        # Order by id (descending for most recent first)
-        query = query.order("id", desc=True)
-        
-        # Filter by type if specified (use etype column)
-        if event_type:
-            # Map BLACKSWAN to MICRO for query (since BLACKSWAN is stored as MICRO in etype)
-            mapped_type = _map_event_type_for_enum(event_type)
-            query = query.eq("etype", mapped_type)
-            # If looking for BLACKSWAN, also filter by severity
-            if event_type == "BLACKSWAN":
-                query = query.eq("severity", "HIGH")
-        
-        # Apply limit
-        if limit:
-            query = query.limit(limit)
-        
-        result = query.execute()
-        
-        # Convert database records to Event models
-        events = [_db_dict_to_event(row) for row in result.data]
-        return events
+        rows = await storage.select(
+            "events", [("round_id", "eq", round_id), ("scheduled", "eq", True)], order_by="ts"
+        )
+        return [_db_dict_to_event(row) for row in rows]
     except Exception as e:
-        print(f"Error fetching events from Supabase: {e}")
+        print(f"Error fetching scheduled events: {e}")
         return []
 
 
-def get_event_by_id(event_id: str) -> Optional[Event]:
+async def get_event_by_id(event_id: str) -> Optional[Event]:
     """
-    Get a specific event by its ID from Supabase.
+    Get a specific event by its ID.
     
     Args:
         event_id: The database ID (integer) or runtimeId of the event
@@ -412,85 +834,37 @@ def get_event_by_id(event_id: str) -> Optional[Event]:
     Returns:
         Event if found, None otherwise
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        # Try to find by database ID first (if event_id is numeric)
-        if event_id.isdigit():
-            result = supabase.table("events").select("*").eq("id", int(event_id)).limit(1).execute()
-            if result.data and len(result.data) > 0:
-                return _db_dict_to_event(result.data[0])
-        
-        # Fallback: try to find by runtime_id if that column exists
-        try:
-            result = supabase.table("events").select("*").eq("runtime_id", event_id).limit(1).execute()
-            if result.data and len(result.data) > 0:
-                return _db_dict_to_event(result.data[0])
-        except:
-            pass  # runtime_id column might not exist
-        
-        return None
+        rows = await storage.select("events", _event_filters(event_id), limit=1)
+        if not rows:
+            return None
+        _index_rows(rows)
+        return _db_dict_to_event(rows[0])
     except Exception as e:
-        print(f"Error fetching event from Supabase: {e}")
+        print(f"Error fetching event: {e}")
         return None
 
 
-def get_blackswan_events(limit: Optional[int] = None) -> List[Event]:
-    """Get all blackswan events from Supabase."""
-    # BLACKSWAN events are stored as etype="MICRO" with severity="HIGH"
-    supabase = get_supabase_client()
-    
-    try:
-        query = supabase.table("events").select("*")
-        
-        # Filter by HIGH severity (BLACKSWAN events are stored as MICRO with HIGH severity)
-        query = query.eq("etype", "MICRO").eq("severity", "HIGH")
-        
-        # Order by id (descending for most recent first)
-        query = query.order("id", desc=True)
-        
-        if limit:
-            query = query.limit(limit)
-        
-        result = query.execute()
-        events = [_db_dict_to_event(row) for row in result.data]
-        
-        return events
-    except Exception as e:
-        print(f"Error fetching blackswan events from Supabase: {e}")
-        return []
+async def get_blackswan_events(limit: Optional[int] = None, before_id: Optional[int] = None) -> List[Event]:
+    """Get all blackswan events."""
+    events, _ = await get_events_page("blackswan", limit=limit, before_id=before_id)
+    return events
 
 
-def get_news_events(limit: Optional[int] = None) -> List[Event]:
-    """Get all news events (MACRO and MICRO) from Supabase."""
-    supabase = get_supabase_client()
-    
-    try:
-        query = supabase.table("events").select("*")
-        
-        # Filter for MACRO and MICRO events (use etype column)
-        query = query.in_("etype", ["MACRO", "MICRO"])
-        
-        # Order by id (descending for most recent first)
-        query = query.order("id", desc=True)
-        
-        if limit:
-            query = query.limit(limit)
-        
-        result = query.execute()
-        events = [_db_dict_to_event(row) for row in result.data]
-        return events
-    except Exception as e:
-        print(f"Error fetching news events from Supabase: {e}")
-        return []
+async def get_news_events(limit: Optional[int] = None, before_id: Optional[int] = None) -> List[Event]:
+    """Get all news events (MACRO and MICRO)."""
+    events, _ = await get_events_page("news", limit=limit, before_id=before_id)
+    return events
 
 
-def update_event(event_id: str, updates: dict) -> Optional[Event]:
+async def update_event(event_id: str, updates: dict) -> Optional[Event]:
     """
-    Update an event row in Supabase by database id or runtime_id.
+    Update an event row by database id or runtime_id.
     'updates' should use API model field names; this function maps to DB columns.
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     try:
         # Map API fields to DB columns
         field_map = {
@@ -500,7 +874,7 @@ def update_event(event_id: str, updates: dict) -> Optional[Event]:
             "baseImpactPct": "impulse_pct",
             "icon": "icon",
             "tags": "tags",
-            "type": "etype",
+            "type": "kind",
         }
         db_updates = {}
         for k, v in updates.items():
@@ -508,36 +882,37 @@ def update_event(event_id: str, updates: dict) -> Optional[Event]:
                 continue
             if k in field_map:
                 db_updates[field_map[k]] = v
+        if "kind" in db_updates:
+            db_updates["etype"] = _map_event_type_for_enum(db_updates["kind"])
         if not db_updates:
-            return get_event_by_id(event_id)
+            return await get_event_by_id(event_id)
 
         # Update by numeric id or by runtime_id
-        if event_id.isdigit():
-            result = supabase.table("events").update(db_updates).eq("id", int(event_id)).execute()
-        else:
-            result = supabase.table("events").update(db_updates).eq("runtime_id", event_id).execute()
+        rows = await storage.update("events", db_updates, _event_filters(event_id))
 
-        if not result.data:
+        if not rows:
             return None
-        return _db_dict_to_event(result.data[0])
+        listing_cache.invalidate()
+        return _db_dict_to_event(rows[0])
     except Exception as e:
         print(f"Error updating event in Supabase: {e}")
         return None
 
 
-def delete_event(event_id: str) -> bool:
+async def delete_event(event_id: str) -> bool:
     """
-    Delete an event row in Supabase by database id or runtime_id.
+    Delete an event row by database id or runtime_id.
     Returns True if a row was deleted.
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     try:
-        if event_id.isdigit():
-            result = supabase.table("events").delete().eq("id", int(event_id)).execute()
-        else:
-            result = supabase.table("events").delete().eq("runtime_id", event_id).execute()
-        # Supabase python client returns deleted rows in data
-        return bool(result.data)
+        rows = await storage.delete("events", _event_filters(event_id))
+        # Storage backends return the deleted rows
+        for row in rows:
+            _runtime_index.pop(row.get("runtime_id"), None)
+        if rows:
+            listing_cache.invalidate()
+        return bool(rows)
     except Exception as e:
-        print(f"Error deleting event from Supabase: {e}")
+        print(f"Error deleting event: {e}")
         return False
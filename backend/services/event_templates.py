@@ -0,0 +1,65 @@
+"""
+Immutable registry of event templates.
+
+Built once at import from the event pools, it gives O(1) lookups by template
+id and by headline, plus read-only per-type views.
+"""
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+
+def _freeze(template: dict) -> Mapping:
+    frozen = dict(template)
+    if "tags" in frozen:
+        frozen["tags"] = tuple(frozen["tags"])
+    return MappingProxyType(frozen)
+
+
+class TemplateRegistry:
+    """Read-only index over event templates."""
+
+    __slots__ = ("_all", "_by_id", "_by_title", "_by_type")
+
+    def __init__(self, templates: Iterable[dict]):
+        all_templates = tuple(_freeze(t) for t in templates)
+        by_id: Dict[str, Mapping] = {}
+        by_title: Dict[str, Mapping] = {}
+        by_type: Dict[str, list] = {}
+        for template in all_templates:
+            if template["id"] in by_id:
+                raise ValueError(f"Duplicate event template id: {template['id']}")
+            by_id[template["id"]] = template
+            # First template wins if two share a headline
+            by_title.setdefault(template["title"], template)
+            by_type.setdefault(template["type"], []).append(template)
+
+        self._all: Tuple[Mapping, ...] = all_templates
+        self._by_id = MappingProxyType(by_id)
+        self._by_title = MappingProxyType(by_title)
+        self._by_type = MappingProxyType({k: tuple(v) for k, v in by_type.items()})
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def __iter__(self):
+        return iter(self._all)
+
+    def __contains__(self, template_id: str) -> bool:
+        return template_id in self._by_id
+
+    def get(self, template_id: str) -> Optional[Mapping]:
+        """Look up a template by its id (e.g. 'macro-1')."""
+        return self._by_id.get(template_id)
+
+    def by_title(self, title: str) -> Optional[Mapping]:
+        """Look up a template by its headline."""
+        return self._by_title.get(title)
+
+    def id_for_title(self, title: str) -> Optional[str]:
+        """Return the template id for a headline, if it is a known template."""
+        template = self._by_title.get(title)
+        return template["id"] if template is not None else None
+
+    def of_type(self, event_type: str) -> Tuple[Mapping, ...]:
+        """All templates of one type (MACRO, MICRO or BLACKSWAN)."""
+        return self._by_type.get(event_type, ())
@@ -4,7 +4,8 @@ Service layer for game and round operations.
 from typing import Optional
 from datetime import datetime
 from backend.models import Game, Round
-from backend.database import get_supabase_client
+from backend.database import get_storage
+from backend.services import event_service, leaderboard_service, price_store, timeline_service
 
 
 def _db_dict_to_game(db_dict: dict) -> Game:
@@ -29,7 +30,7 @@ def _db_dict_to_round(db_dict: dict) -> Round:
     )
 
 
-def create_or_get_game(code: Optional[str] = None, starting_cash: float = 10000, status: str = "active") -> Game:
+async def create_or_get_game(code: Optional[str] = None, starting_cash: float = 10000, status: str = "active") -> Game:
     """
     Create a new game or get existing game by code.
     If code is provided and game exists, return existing game.
@@ -43,46 +44,49 @@ def create_or_get_game(code: Optional[str] = None, starting_cash: float = 10000,
     Returns:
         Game object
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
         # If code provided, try to find existing game
         if code:
-            result = supabase.table("games").select("*").eq("code", code).eq("status", "active").limit(1).execute()
-            if result.data and len(result.data) > 0:
-                return _db_dict_to_game(result.data[0])
+            rows = await storage.select("games", [("code", "eq", code), ("status", "eq", "active")], limit=1)
+            if rows:
+                return _db_dict_to_game(rows[0])
         
         # Create new game
-        result = supabase.table("games").insert({
+        rows = await storage.insert("games", {
             "code": code,
             "starting_cash": starting_cash,
             "status": status
-        }).execute()
+        })
         
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_game(result.data[0])
+        if rows:
+            game = _db_dict_to_game(rows[0])
+            # New game: its price history can be served from memory
+            price_store.track_game(game.id)
+            return game
         
         raise Exception("Failed to create game")
     except Exception as e:
-        print(f"Error creating/getting game in Supabase: {e}")
+        print(f"Error creating/getting game: {e}")
         raise
 
 
-def get_game_by_id(game_id: int) -> Optional[Game]:
+async def get_game_by_id(game_id: int) -> Optional[Game]:
     """Get a game by its ID."""
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("games").select("*").eq("id", game_id).limit(1).execute()
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_game(result.data[0])
+        rows = await storage.select("games", [("id", "eq", game_id)], limit=1)
+        if rows:
+            return _db_dict_to_game(rows[0])
         return None
     except Exception as e:
-        print(f"Error fetching game by ID from Supabase: {e}")
+        print(f"Error fetching game by ID: {e}")
         return None
 
 
-def create_or_get_round(game_id: int, round_no: int) -> Round:
+async def create_or_get_round(game_id: int, round_no: int) -> Round:
     """
     Create a new round or get existing round for the game and round number.
     
@@ -93,57 +97,68 @@ def create_or_get_round(game_id: int, round_no: int) -> Round:
     Returns:
         Round object
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
         # Try to find existing round
-        result = supabase.table("rounds").select("*").eq("game_id", game_id).eq("round_no", round_no).limit(1).execute()
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_round(result.data[0])
+        rows = await storage.select("rounds", [("game_id", "eq", game_id), ("round_no", "eq", round_no)], limit=1)
+        if rows:
+            round_obj = _db_dict_to_round(rows[0])
+            event_service.set_current_round_id(round_obj.id, game_id)
+            return round_obj
         
         # Create new round
-        result = supabase.table("rounds").insert({
+        rows = await storage.insert("rounds", {
             "game_id": game_id,
             "round_no": round_no,
             "starts_at": datetime.utcnow().isoformat()
-        }).execute()
+        })
         
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_round(result.data[0])
+        if rows:
+            round_obj = _db_dict_to_round(rows[0])
+            event_service.set_current_round_id(round_obj.id, game_id)
+            price_store.track_round(game_id, round_obj.id)
+            leaderboard_service.track_round(game_id, round_obj.id)
+            # Pre-generate the round's event timeline (bulk-stored and cached)
+            try:
+                await timeline_service.build_round_timeline(round_obj)
+            except Exception as e:
+                print(f"Error building round timeline: {e}")
+            return round_obj
         
         raise Exception("Failed to create round")
     except Exception as e:
-        print(f"Error creating/getting round in Supabase: {e}")
+        print(f"Error creating/getting round: {e}")
         raise
 
 
-def get_round_by_id(round_id: int) -> Optional[Round]:
+async def get_round_by_id(round_id: int) -> Optional[Round]:
     """Get a round by its ID."""
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("rounds").select("*").eq("id", round_id).limit(1).execute()
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_round(result.data[0])
+        rows = await storage.select("rounds", [("id", "eq", round_id)], limit=1)
+        if rows:
+            return _db_dict_to_round(rows[0])
         return None
     except Exception as e:
-        print(f"Error fetching round by ID from Supabase: {e}")
+        print(f"Error fetching round by ID: {e}")
         return None
 
 
-def end_round(round_id: int) -> Optional[Round]:
+async def end_round(round_id: int) -> Optional[Round]:
     """Mark a round as ended by setting ends_at timestamp."""
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("rounds").update({
+        rows = await storage.update("rounds", {
             "ends_at": datetime.utcnow().isoformat()
-        }).eq("id", round_id).execute()
+        }, [("id", "eq", round_id)])
         
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_round(result.data[0])
+        if rows:
+            return _db_dict_to_round(rows[0])
         return None
     except Exception as e:
-        print(f"Error ending round in Supabase: {e}")
+        print(f"Error ending round: {e}")
         return None
 
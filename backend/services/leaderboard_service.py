@@ -0,0 +1,293 @@
+"""
+In-memory leaderboards per round, per game and across all games.
+
+Each board keeps participants in a SortedList ordered by total pnl_delta
+(highest first), then rounds played, then participant id, so inserting a score
+and finding a rank are O(log n) and top-K is O(log n + K). Boards are built
+from round_scores once (at startup or on first use) and then updated by every
+new score, so reads never touch the database.
+
+Boards only see scores stored through this process. When more than one
+instance serves the API, set LEADERBOARD_RESYNC_SECONDS so each instance
+periodically rebuilds its boards from the database and picks up scores stored
+by the others.
+"""
+import asyncio
+import os
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from backend.database import get_storage
+
+# Rows per page when loading round_scores
+_LOAD_PAGE_SIZE = 5000
+# Seconds between rebuilds from the database (0 = never; needed with several instances)
+LEADERBOARD_RESYNC_SECONDS = float(os.getenv("LEADERBOARD_RESYNC_SECONDS", "0"))
+
+# (-total, -rounds, participant_id): ascending order is best first
+_Key = Tuple[float, int, int]
+
+
+class Leaderboard:
+    """Participants of one scope, ordered best first."""
+
+    __slots__ = ("_keys", "_totals")
+
+    def __init__(self):
+        self._keys: SortedList = SortedList()
+        self._totals: Dict[int, Tuple[float, int]] = {}  # participant_id -> (total, rounds)
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    @staticmethod
+    def _key(participant_id: int, total: float, rounds: int) -> _Key:
+        return (-total, -rounds, participant_id)
+
+    def add(self, participant_id: int, pnl_delta: float, rounds: int = 1) -> None:
+        """Add pnl_delta (summed over `rounds` scores) to a participant's total."""
+        total, played = self._totals.get(participant_id, (0.0, 0))
+        if played:
+            self._keys.remove(self._key(participant_id, total, played))
+        total, rounds = total + pnl_delta, played + rounds
+        self._totals[participant_id] = (total, rounds)
+        self._keys.add(self._key(participant_id, total, rounds))
+
+    def entry(self, participant_id: int) -> Optional[dict]:
+        """A participant's rank (1 = best), total and rounds, or None if absent."""
+        totals = self._totals.get(participant_id)
+        if totals is None:
+            return None
+        rank = self._keys.index(self._key(participant_id, *totals)) + 1
+        return {"rank": rank, "participant_id": participant_id, "score": totals[0], "rounds": totals[1]}
+
+    def top(self, limit: int, offset: int = 0) -> List[dict]:
+        """Entries ranked offset + 1 to offset + limit."""
+        return [
+            {"rank": offset + i + 1, "participant_id": pid, "score": -neg_total, "rounds": -neg_rounds}
+            for i, (neg_total, neg_rounds, pid) in enumerate(self._keys.islice(offset, offset + limit))
+        ]
+
+
+_boards: Dict[Tuple[str, Optional[int]], Leaderboard] = {}
+_round_games: Dict[int, int] = {}
+# Scores with ids up to this were loaded from the database
+_loaded_through: Optional[int] = None
+_load_lock = asyncio.Lock()
+# Rows recorded while a rebuild is running, replayed onto the new boards
+_recorded_during_load: Optional[List[dict]] = None
+_resync_task: Optional[asyncio.Task] = None
+
+_Boards = Dict[Tuple[str, Optional[int]], Leaderboard]
+
+
+def _board(boards: _Boards, scope: str, scope_id: Optional[int]) -> Leaderboard:
+    board = boards.get((scope, scope_id))
+    if board is None:
+        board = boards[(scope, scope_id)] = Leaderboard()
+    return board
+
+
+def _apply(rows: Iterable[dict], boards: Optional[_Boards] = None) -> None:
+    """Add score rows to their boards, one update per (board, participant)."""
+    sums: Dict[Tuple[str, Optional[int], int], List[float]] = {}
+    for row in rows:
+        participant_id = row["participant_id"]
+        pnl_delta = float(row["pnl_delta"])
+        scopes = [("round", row["round_id"]), ("global", None)]
+        game_id = _round_games.get(row["round_id"])
+        if game_id is not None:
+            scopes.append(("game", game_id))
+        for scope, scope_id in scopes:
+            entry = sums.get((scope, scope_id, participant_id))
+            if entry is None:
+                sums[(scope, scope_id, participant_id)] = [pnl_delta, 1]
+            else:
+                entry[0] += pnl_delta
+                entry[1] += 1
+    if boards is None:
+        boards = _boards
+    for (scope, scope_id, participant_id), (pnl_delta, rounds) in sums.items():
+        _board(boards, scope, scope_id).add(participant_id, pnl_delta, rounds)
+
+
+def track_round(game_id: int, round_id: int) -> None:
+    """Remember which game a round belongs to (called when rounds are created)."""
+    _round_games[round_id] = game_id
+
+
+async def _select_pages(table: str, filters: list, columns: str) -> AsyncIterator[List[dict]]:
+    """Yield rows in id order, one keyset page at a time, until a page comes back empty."""
+    storage = get_storage()
+    after = 0
+    while True:
+        rows = await storage.select(
+            table, [("id", "gt", after)] + filters, columns=columns, order_by="id", limit=_LOAD_PAGE_SIZE
+        )
+        # A short page is not the end: PostgREST caps responses at max_rows
+        if not rows:
+            return
+        yield rows
+        after = rows[-1]["id"]
+
+
+async def _load() -> None:
+    """Build every board from rounds and round_scores, then swap them in."""
+    global _boards, _loaded_through, _recorded_during_load
+    storage = get_storage()
+    _recorded_during_load = []
+    try:
+        last = await storage.select("round_scores", columns="id", order_by="id", desc=True, limit=1)
+        through = last[0]["id"] if last else 0
+
+        async for rows in _select_pages("rounds", [], "id,game_id"):
+            for row in rows:
+                _round_games[row["id"]] = row["game_id"]
+
+        boards: _Boards = {}
+        async for rows in _select_pages("round_scores", [("id", "lte", through)], "id,participant_id,round_id,pnl_delta"):
+            _apply(rows, boards)
+        # Scores this process stored while loading, past the snapshot
+        _apply((row for row in _recorded_during_load if row["id"] > through), boards)
+
+        _boards, _loaded_through = boards, through
+    finally:
+        _recorded_during_load = None
+
+
+async def ensure_loaded() -> bool:
+    """
+    Build the boards from the database if not done yet.
+
+    Returns:
+        True if the boards are ready, False if loading failed
+    """
+    if _loaded_through is not None:
+        return True
+    async with _load_lock:
+        if _loaded_through is None:
+            try:
+                await _load()
+            except Exception as e:
+                print(f"Error loading leaderboards: {e}")
+                return False
+    return True
+
+
+async def resync() -> bool:
+    """
+    Rebuild the boards from the database, picking up scores stored by other
+    instances; reads keep using the old boards until the new ones are ready.
+
+    Returns:
+        True if the boards were rebuilt
+    """
+    async with _load_lock:
+        try:
+            await _load()
+            return True
+        except Exception as e:
+            print(f"Error resyncing leaderboards: {e}")
+            return False
+
+
+async def record_scores(rows: Iterable[dict]) -> None:
+    """
+    Add newly stored round_scores rows to the boards.
+
+    Args:
+        rows: Rows as returned by the insert (id, participant_id, round_id, pnl_delta)
+    """
+    rows = list(rows)
+    if not await ensure_loaded():
+        return
+    storage = get_storage()
+    unknown = {row["round_id"] for row in rows if row["round_id"] not in _round_games}
+    if unknown:
+        try:
+            found = await storage.select("rounds", [("id", "in", list(unknown))], columns="id,game_id")
+            for row in found:
+                _round_games[row["id"]] = row["game_id"]
+        except Exception as e:
+            print(f"Error fetching rounds for leaderboard: {e}")
+    if _recorded_during_load is not None:
+        _recorded_during_load.extend(rows)
+    # Rows stored while the boards were loading may already be counted
+    _apply(row for row in rows if row["id"] > _loaded_through)
+
+
+def reset() -> None:
+    """Drop every board; the next read rebuilds them from the database."""
+    global _loaded_through
+    _boards.clear()
+    _round_games.clear()
+    _loaded_through = None
+
+
+async def get_top(scope: str, scope_id: Optional[int] = None, limit: int = 10, offset: int = 0) -> Tuple[List[dict], int]:
+    """
+    Get the best participants of a board.
+
+    Args:
+        scope: "round", "game" or "global"
+        scope_id: Round or game ID (ignored for global)
+        limit: Entries to return
+        offset: Entries to skip
+
+    Returns:
+        (entries with rank, participant_id, score and rounds, participants on the board)
+    """
+    if not await ensure_loaded():
+        return [], 0
+    board = _boards.get((scope, None if scope == "global" else scope_id))
+    if board is None:
+        return [], 0
+    return board.top(limit, offset), len(board)
+
+
+async def get_rank(participant_id: int, scope: str, scope_id: Optional[int] = None) -> Tuple[Optional[dict], int]:
+    """
+    Get one participant's entry on a board.
+
+    Args:
+        participant_id: The participant ID
+        scope: "round", "game" or "global"
+        scope_id: Round or game ID (ignored for global)
+
+    Returns:
+        (entry with rank, score and rounds or None if not on the board, participants on the board)
+    """
+    if not await ensure_loaded():
+        return None, 0
+    board = _boards.get((scope, None if scope == "global" else scope_id))
+    if board is None:
+        return None, 0
+    return board.entry(participant_id), len(board)
+
+
+async def _resync_forever() -> None:
+    while True:
+        await asyncio.sleep(LEADERBOARD_RESYNC_SECONDS)
+        await resync()
+
+
+def start() -> None:
+    """Schedule rebuilds every LEADERBOARD_RESYNC_SECONDS (no-op if 0)."""
+    global _resync_task
+    if LEADERBOARD_RESYNC_SECONDS <= 0 or (_resync_task is not None and not _resync_task.done()):
+        return
+    _resync_task = asyncio.create_task(_resync_forever())
+
+
+async def stop() -> None:
+    """Cancel scheduled rebuilds."""
+    global _resync_task
+    if _resync_task is None:
+        return
+    task, _resync_task = _resync_task, None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,78 @@
+"""
+Bounded, TTL-limited cache of serialized list responses.
+
+Entries hold the response body already encoded as JSON together with its
+ETag, so a hit costs a dict lookup and no serialization. Writers call
+invalidate(), which also bumps a version number: a fill that started before
+the write is discarded instead of caching stale rows.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches the ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ListingCache:
+    """LRU cache of encoded responses with a per-entry time to live."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = 0
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        """Return a live entry, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, body: bytes, version: Optional[int] = None) -> CachedBody:
+        """
+        Store an encoded body and return its entry.
+        If version is given and a write happened since, the entry is returned
+        but not stored.
+        """
+        entry = CachedBody(body, make_etag(body), time.monotonic() + self.ttl)
+        if self.ttl <= 0 or self.max_entries <= 0 or (version is not None and version != self.version):
+            return entry
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self) -> None:
+        """Drop every entry after a write."""
+        self.version += 1
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,130 @@
+"""
+Vectorized aggregation of price series for charts.
+
+- ohlc(): open/high/low/close per fixed-width time bucket.
+- lttb(): Largest-Triangle-Three-Buckets downsampling to a point budget,
+  keeping the visual shape (peaks and dips) of the line.
+
+Inputs are one ticker's timestamps (ms) and prices, ordered by time. Stored
+snapshots form a step series (unchanged prices are not stored), so a price
+holds until the next point.
+"""
+import math
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Upper bound on candles produced when filling gaps
+MAX_FILLED_BUCKETS = 100_000
+
+
+def ohlc(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    bucket_ms: int,
+    fill: bool = False,
+    end_ms: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Aggregate a series into candles of bucket_ms milliseconds.
+
+    With fill, empty buckets between the first point and end_ms (default: the
+    last point) are emitted as flat candles at the previous close with count 0.
+
+    Returns:
+        Arrays keyed timestamps (bucket start), open, high, low, close and
+        count (snapshots per bucket); without fill, empty buckets are omitted
+    """
+    if bucket_ms <= 0:
+        raise ValueError("bucket_ms must be positive")
+    ts = np.asarray(timestamps, dtype=np.int64)
+    px = np.asarray(prices, dtype=np.float64)
+    if ts.size == 0:
+        empty = np.empty(0)
+        return {"timestamps": empty.astype(np.int64), "open": empty, "high": empty, "low": empty, "close": empty, "count": empty.astype(np.int64)}
+
+    buckets = ts // bucket_ms
+    # Index where each bucket starts (input is time-ordered)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.concatenate((starts[1:], [ts.size]))
+    candles = {
+        "timestamps": buckets[starts] * bucket_ms,
+        "open": px[starts],
+        "high": np.maximum.reduceat(px, starts),
+        "low": np.minimum.reduceat(px, starts),
+        "close": px[ends - 1],
+        "count": ends - starts,
+    }
+    if fill:
+        candles = _fill_forward(candles, bucket_ms, end_ms)
+    return candles
+
+
+def _fill_forward(candles: Dict[str, np.ndarray], bucket_ms: int, end_ms: Optional[int]) -> Dict[str, np.ndarray]:
+    present = candles["timestamps"] // bucket_ms
+    last = present[-1] if end_ms is None else max(present[-1], end_ms // bucket_ms)
+    total = int(last - present[0]) + 1
+    if total == present.size:
+        return candles
+    if total > MAX_FILLED_BUCKETS:
+        raise ValueError(f"{total} buckets exceed the limit of {MAX_FILLED_BUCKETS}; use a wider bucket")
+
+    every = np.arange(present[0], last + 1)
+    # Latest real candle at or before each bucket
+    src = np.searchsorted(present, every, side="right") - 1
+    hit = present[src] == every
+    close = candles["close"][src]
+    return {
+        "timestamps": every * bucket_ms,
+        "open": np.where(hit, candles["open"][src], close),
+        "high": np.where(hit, candles["high"][src], close),
+        "low": np.where(hit, candles["low"][src], close),
+        "close": close,
+        "count": np.where(hit, candles["count"][src], 0),
+    }
+
+
+def bucket_for(timestamps: Sequence[int], max_points: int) -> int:
+    """Smallest whole-ms bucket width giving at most max_points candles."""
+    if len(timestamps) < 2 or max_points <= 0:
+        return 1
+    span = int(timestamps[-1]) - int(timestamps[0]) + 1
+    return max(1, math.ceil(span / max_points))
+
+
+def lttb(timestamps: Sequence[int], prices: Sequence[float], max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series to at most max_points points with LTTB.
+    The first and last points are always kept.
+    """
+    ts = np.asarray(timestamps, dtype=np.int64)
+    px = np.asarray(prices, dtype=np.float64)
+    n = ts.size
+    if max_points >= n or max_points < 3:
+        return ts, px
+
+    x = ts.astype(np.float64)
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Interior points split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    prev = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        if i + 2 < max_points - 1:
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[nlo:nhi].mean(), px[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = x[n - 1], px[n - 1]
+        # Triangle area (x2) between previous pick, candidate and next average
+        areas = np.abs(
+            (x[prev] - avg_x) * (px[lo:hi] - px[prev])
+            - (x[prev] - x[lo:hi]) * (avg_y - px[prev])
+        )
+        prev = lo + int(np.argmax(areas))
+        selected[i + 1] = prev
+
+    return ts[selected], px[selected]
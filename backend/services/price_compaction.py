@@ -0,0 +1,336 @@
+"""
+Background compaction of price snapshots for ended rounds.
+
+Each pass works through rounds whose ends_at is set (game_service.end_round):
+
+1. Roll up: the round's raw snapshots are read page by page and summarized per
+   ticker (open/high/low/close, count, first/last time) into price_rollups;
+   the round is then marked compacted_at.
+2. Purge: once a rolled-up round ended more than PRICE_RAW_RETENTION_HOURS ago,
+   its raw snapshots are archived to PRICE_ARCHIVE_DIR (if set) and deleted in
+   bounded batches; the round is then marked purged_at.
+
+Both steps are idempotent, so a pass interrupted halfway is simply redone.
+Every instance may run the job: before each step a round is claimed with a
+conditional update of its compaction_lease, so only one instance works on it
+at a time. Purging is off unless PRICE_PURGE_ENABLED is set.
+Raw rows are only deleted once the round's rollups and archive are known to
+cover every one of them (row counts checked against storage.count()); a round
+that fails the check is left in place and rolled up again on the next pass.
+Progress counters are kept in `metrics` and served by
+GET /api/price-snapshots/compaction.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from backend.database import get_storage
+from backend.services import price_export, price_snapshot_service, price_store
+from backend.services.price_store import to_micros
+
+# Seconds between background passes (0 disables the background job)
+PRICE_COMPACTION_INTERVAL = float(os.getenv("PRICE_COMPACTION_INTERVAL", "300"))
+# Rounds rolled up (and purged) per pass
+PRICE_COMPACTION_BATCH = int(os.getenv("PRICE_COMPACTION_BATCH", "20"))
+# Delete raw snapshots of rolled-up rounds (off by default: rollups only)
+PRICE_PURGE_ENABLED = os.getenv("PRICE_PURGE_ENABLED", "false").lower() in ("1", "true", "yes")
+# Raw snapshots are kept this long after a round ends
+PRICE_RAW_RETENTION_HOURS = float(os.getenv("PRICE_RAW_RETENTION_HOURS", "24"))
+# A claimed round is left to its instance this long (must outlast one step)
+PRICE_COMPACTION_LEASE_SECONDS = float(os.getenv("PRICE_COMPACTION_LEASE_SECONDS", "900"))
+# Write raw snapshots here (one file per round) before deleting them; empty = delete only
+PRICE_ARCHIVE_DIR = os.getenv("PRICE_ARCHIVE_DIR", "")
+PRICE_ARCHIVE_FORMAT = os.getenv("PRICE_ARCHIVE_FORMAT", "csv")
+# Raw rows deleted per statement
+_DELETE_BATCH = 5000
+
+# Any real timestamp sorts after this, in every backend (ends_at IS NOT NULL)
+_EPOCH_ISO = "1970-01-01T00:00:00"
+
+metrics: Dict[str, object] = {
+    "runs": 0,
+    "last_run_at": None,
+    "last_duration_ms": None,
+    "last_error": None,
+    "rounds_rolled_up": 0,
+    "snapshots_rolled_up": 0,
+    "rollups_written": 0,
+    "rounds_purged": 0,
+    "snapshots_deleted": 0,
+    "snapshots_archived": 0,
+    "purges_aborted": 0,
+    "pending_rollup": None,
+    "pending_purge": None,
+}
+
+_lock = asyncio.Lock()
+_task: Optional[asyncio.Task] = None
+
+
+class IncompleteRound(Exception):
+    """Fewer rows were read than the round holds; its raw rows must not be deleted."""
+
+
+def _now_iso() -> str:
+    # Same format as game_service.end_round writes to ends_at
+    return datetime.utcnow().isoformat()
+
+
+async def _claim(round_id: int, pending: str) -> bool:
+    """
+    Take the round's compaction lease for one step, if that step is still
+    pending (`pending` column NULL) and no other instance holds a live lease.
+    Each attempt is a single conditional update, so only one instance wins.
+    """
+    storage = get_storage()
+    now = datetime.utcnow()
+    lease = (now + timedelta(seconds=PRICE_COMPACTION_LEASE_SECONDS)).isoformat()
+    base = [("id", "eq", round_id), (pending, "is", None)]
+    for free in (("compaction_lease", "is", None), ("compaction_lease", "lt", now.isoformat())):
+        if await storage.update("rounds", {"compaction_lease": lease}, base + [free]):
+            return True
+    return False
+
+
+async def _release(round_id: int) -> None:
+    await get_storage().update("rounds", {"compaction_lease": None}, [("id", "eq", round_id)])
+
+
+async def _stored_count(round_id: int) -> int:
+    return await get_storage().count("price_snapshots", [("round_id", "eq", round_id)])
+
+
+async def _summarize_round(round_id: int) -> Dict[int, dict]:
+    """Per-ticker OHLC of a round's raw snapshots, read one keyset page at a time."""
+    summary: Dict[int, dict] = {}
+    async for rows in price_snapshot_service.iter_price_snapshot_pages(round_id=round_id):
+        for row in rows:
+            price = float(row["price"])
+            at = to_micros(row.get("taken_at")) or 0
+            entry = summary.get(row["ticker_id"])
+            if entry is None:
+                summary[row["ticker_id"]] = {
+                    "game_id": row["game_id"],
+                    "open": price, "high": price, "low": price, "close": price, "count": 1,
+                    "first_at": row.get("taken_at"), "last_at": row.get("taken_at"),
+                    "_first": at, "_last": at,
+                }
+                continue
+            entry["count"] += 1
+            if price > entry["high"]:
+                entry["high"] = price
+            if price < entry["low"]:
+                entry["low"] = price
+            if at < entry["_first"]:
+                entry["open"], entry["first_at"], entry["_first"] = price, row.get("taken_at"), at
+            if at >= entry["_last"]:
+                entry["close"], entry["last_at"], entry["_last"] = price, row.get("taken_at"), at
+    return summary
+
+
+async def _roll_up(round_row: dict) -> None:
+    storage = get_storage()
+    round_id = round_row["id"]
+    summary = await _summarize_round(round_id)
+    summarized = sum(entry["count"] for entry in summary.values())
+    stored = await _stored_count(round_id)
+    if summarized != stored:
+        raise IncompleteRound(f"round {round_id}: rolled up {summarized} of {stored} snapshots")
+    rollups = [
+        {
+            "game_id": entry["game_id"],
+            "round_id": round_id,
+            "ticker_id": ticker_id,
+            "open": entry["open"],
+            "high": entry["high"],
+            "low": entry["low"],
+            "close": entry["close"],
+            "count": entry["count"],
+            "first_at": entry["first_at"],
+            "last_at": entry["last_at"],
+        }
+        for ticker_id, entry in summary.items()
+    ]
+    # Replace rollups left by an interrupted earlier pass
+    await storage.delete("price_rollups", [("round_id", "eq", round_id)])
+    if rollups:
+        await storage.insert("price_rollups", rollups)
+    await storage.update("rounds", {"compacted_at": _now_iso()}, [("id", "eq", round_id)])
+
+    metrics["rounds_rolled_up"] += 1
+    metrics["snapshots_rolled_up"] += summarized
+    metrics["rollups_written"] += len(rollups)
+
+
+async def _archive(round_id: int, expected: int) -> int:
+    """
+    Write a round's raw snapshots to PRICE_ARCHIVE_DIR.
+
+    Returns:
+        Rows written
+
+    Raises:
+        IncompleteRound: Fewer than `expected` rows were written (the file is removed)
+    """
+    spec = price_export.EXPORT_FORMATS[PRICE_ARCHIVE_FORMAT]
+    os.makedirs(PRICE_ARCHIVE_DIR, exist_ok=True)
+    path = os.path.join(PRICE_ARCHIVE_DIR, f"round-{round_id}.{spec['extension']}")
+    partial = path + ".partial"
+    written = 0
+
+    async def counted_pages():
+        nonlocal written
+        async for rows in price_snapshot_service.iter_price_snapshot_pages(round_id=round_id):
+            written += len(rows)
+            yield rows
+
+    with open(partial, "wb") as out:
+        async for chunk in price_export.encode_pages(counted_pages(), PRICE_ARCHIVE_FORMAT):
+            out.write(chunk)
+    if written != expected:
+        os.remove(partial)
+        raise IncompleteRound(f"round {round_id}: archived {written} of {expected} snapshots")
+    # Only a complete file gets the final name
+    os.replace(partial, path)
+    return written
+
+
+async def _purge(round_row: dict) -> None:
+    storage = get_storage()
+    round_id = round_row["id"]
+    stored = await _stored_count(round_id)
+    rollups = await storage.select("price_rollups", [("round_id", "eq", round_id)], columns="count")
+    rolled_up = sum(row["count"] for row in rollups)
+    if rolled_up != stored:
+        # Snapshots stored after the rollup, or a short read: roll up again next pass
+        await storage.update("rounds", {"compacted_at": None}, [("id", "eq", round_id)])
+        raise IncompleteRound(f"round {round_id}: rollups cover {rolled_up} of {stored} snapshots")
+    if PRICE_ARCHIVE_DIR:
+        metrics["snapshots_archived"] += await _archive(round_id, stored)
+
+    while True:
+        page = await storage.select(
+            "price_snapshots", [("round_id", "eq", round_id)],
+            columns="id", order_by="id", limit=_DELETE_BATCH
+        )
+        if not page:
+            break
+        deleted = await storage.delete(
+            "price_snapshots", [("round_id", "eq", round_id), ("id", "lte", page[-1]["id"])]
+        )
+        metrics["snapshots_deleted"] += len(deleted)
+
+    await storage.update("rounds", {"purged_at": _now_iso()}, [("id", "eq", round_id)])
+    # Memory may still hold the deleted rows
+    price_store.drop_game(round_row["game_id"])
+    price_snapshot_service.forget_last_prices(round_row["game_id"])
+    metrics["rounds_purged"] += 1
+
+
+async def compact_once(batch: Optional[int] = None) -> Dict[str, object]:
+    """
+    Run one compaction pass: roll up ended rounds, then purge rounds past retention.
+
+    Args:
+        batch: Rounds handled per step (default: PRICE_COMPACTION_BATCH)
+
+    Returns:
+        The updated metrics
+    """
+    storage = get_storage()
+    size = batch or PRICE_COMPACTION_BATCH
+    async with _lock:
+        started = time.perf_counter()
+        metrics["last_error"] = None
+        try:
+            ended = [("ends_at", "gt", _EPOCH_ISO)]
+            to_roll_up = await storage.select(
+                "rounds", ended + [("compacted_at", "is", None)], order_by="ends_at", limit=size
+            )
+            for round_row in to_roll_up:
+                if not await _claim(round_row["id"], "compacted_at"):
+                    continue  # Another instance is on it
+                try:
+                    await _roll_up(round_row)
+                except IncompleteRound as e:
+                    print(f"Skipping price rollup: {e}")
+                    metrics["last_error"] = str(e)
+                finally:
+                    await _release(round_row["id"])
+
+            to_purge = []
+            if PRICE_PURGE_ENABLED:
+                cutoff = (datetime.utcnow() - timedelta(hours=PRICE_RAW_RETENTION_HOURS)).isoformat()
+                to_purge = await storage.select(
+                    "rounds",
+                    [("ends_at", "gt", _EPOCH_ISO), ("ends_at", "lt", cutoff),
+                     ("compacted_at", "gt", _EPOCH_ISO), ("purged_at", "is", None)],
+                    order_by="ends_at",
+                    limit=size
+                )
+            for round_row in to_purge:
+                if not await _claim(round_row["id"], "purged_at"):
+                    continue
+                try:
+                    await _purge(round_row)
+                except IncompleteRound as e:
+                    print(f"Keeping raw price snapshots: {e}")
+                    metrics["last_error"] = str(e)
+                    metrics["purges_aborted"] += 1
+                finally:
+                    await _release(round_row["id"])
+
+            metrics["pending_rollup"] = await storage.count("rounds", ended + [("compacted_at", "is", None)])
+            metrics["pending_purge"] = await storage.count(
+                "rounds", [("compacted_at", "gt", _EPOCH_ISO), ("purged_at", "is", None)]
+            )
+        except Exception as e:
+            print(f"Error compacting price snapshots: {e}")
+            metrics["last_error"] = str(e)
+        finally:
+            metrics["runs"] += 1
+            metrics["last_run_at"] = datetime.utcnow()
+            metrics["last_duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return metrics
+
+
+def status() -> Dict[str, object]:
+    """Current metrics plus configuration."""
+    return {
+        **metrics,
+        "running": _lock.locked(),
+        "enabled": _task is not None and not _task.done(),
+        "interval_seconds": PRICE_COMPACTION_INTERVAL,
+        "purge_enabled": PRICE_PURGE_ENABLED,
+        "retention_hours": PRICE_RAW_RETENTION_HOURS,
+        "archive_dir": PRICE_ARCHIVE_DIR or None,
+    }
+
+
+async def _run_forever() -> None:
+    while True:
+        await asyncio.sleep(PRICE_COMPACTION_INTERVAL)
+        await compact_once()
+
+
+def start() -> None:
+    """Schedule background passes every PRICE_COMPACTION_INTERVAL seconds (no-op if 0)."""
+    global _task
+    if PRICE_COMPACTION_INTERVAL <= 0 or (_task is not None and not _task.done()):
+        return
+    _task = asyncio.create_task(_run_forever())
+
+
+async def stop() -> None:
+    """Cancel the background job, letting a pass in progress finish its current step."""
+    global _task
+    if _task is None:
+        return
+    task, _task = _task, None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
@@ -0,0 +1,165 @@
+"""
+Streaming export of price snapshots for offline analysis.
+
+Each format turns the keyset pages of
+price_snapshot_service.iter_price_snapshot_pages() into encoded chunks as they
+arrive, so only one page is ever held in memory:
+
+- csv: header, then one block of lines per page
+- arrow: Arrow IPC stream, one record batch per page
+- parquet: Parquet file, one row group per page
+
+Arrow and Parquet need the optional pyarrow package.
+"""
+import csv
+import io
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+from backend.services import price_snapshot_service
+from backend.services.price_store import to_micros
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+COLUMNS = ("id", "game_id", "round_id", "ticker_id", "price", "taken_at")
+
+EXPORT_FORMATS: Dict[str, Dict[str, str]] = {
+    "csv": {"media_type": "text/csv", "extension": "csv"},
+    "arrow": {"media_type": "application/vnd.apache.arrow.stream", "extension": "arrows"},
+    "parquet": {"media_type": "application/vnd.apache.parquet", "extension": "parquet"},
+}
+
+if pa is not None:
+    SCHEMA = pa.schema([
+        ("id", pa.int64()),
+        ("game_id", pa.int64()),
+        ("round_id", pa.int64()),
+        ("ticker_id", pa.int64()),
+        ("price", pa.float64()),
+        ("taken_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+class ExportUnavailable(RuntimeError):
+    """The requested export format needs a package that is not installed."""
+
+
+def check_format(fmt: str) -> None:
+    """Raise ValueError for unknown formats and ExportUnavailable if pyarrow is missing."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'. Use {', '.join(EXPORT_FORMATS)}.")
+    if fmt != "csv" and pa is None:
+        raise ExportUnavailable(f"{fmt} export requires the pyarrow package")
+
+
+class _Drain:
+    """Write-only file object whose contents are taken out as they are produced."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _csv_block(rows: List[dict], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(COLUMNS)
+    writer.writerows([row.get(column) for column in COLUMNS] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _record_batch(rows: List[dict]) -> "pa.RecordBatch":
+    return pa.RecordBatch.from_arrays([
+        pa.array([row["id"] for row in rows], type=pa.int64()),
+        pa.array([row["game_id"] for row in rows], type=pa.int64()),
+        pa.array([row["round_id"] for row in rows], type=pa.int64()),
+        pa.array([row["ticker_id"] for row in rows], type=pa.int64()),
+        pa.array([float(row["price"]) for row in rows], type=pa.float64()),
+        pa.array([to_micros(row.get("taken_at")) for row in rows], type=pa.timestamp("us", tz="UTC")),
+    ], schema=SCHEMA)
+
+
+async def encode_pages(pages: AsyncIterator[List[dict]], fmt: str) -> AsyncIterator[bytes]:
+    """Encode row pages into chunks of the given format."""
+    check_format(fmt)
+    if fmt == "csv":
+        yield _csv_block([], header=True)
+        async for rows in pages:
+            yield _csv_block(rows)
+        return
+
+    sink = _Drain()
+    if fmt == "arrow":
+        writer = pa.ipc.new_stream(sink, SCHEMA)
+    else:
+        writer = pq.ParquetWriter(sink, SCHEMA)
+    try:
+        async for rows in pages:
+            batch = _record_batch(rows)
+            if fmt == "arrow":
+                writer.write_batch(batch)
+            else:
+                # One row group per page
+                writer.write_batch(batch, row_group_size=batch.num_rows)
+            chunk = sink.take()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+async def export_price_snapshots(
+    fmt: str = "csv",
+    game_ids: Optional[Sequence[int]] = None,
+    round_id: Optional[int] = None,
+    ticker_ids: Optional[Sequence[int]] = None,
+    page_size: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Stream price snapshots as CSV, Arrow IPC or Parquet chunks.
+
+    Args:
+        fmt: "csv", "arrow" or "parquet"
+        game_ids: Only these games
+        round_id: Only this round
+        ticker_ids: Only these tickers
+        page_size: Rows per database page (and per record batch / row group)
+    """
+    pages = price_snapshot_service.iter_price_snapshot_pages(
+        game_ids=game_ids,
+        round_id=round_id,
+        ticker_ids=ticker_ids,
+        page_size=page_size
+    )
+    async for chunk in encode_pages(pages, fmt):
+        yield chunk
@@ -1,10 +1,35 @@
 """
 Service layer for price snapshot operations.
 """
-from typing import List, Optional
+import asyncio
+import os
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
 from datetime import datetime
-from backend.models import PriceSnapshot
-from backend.database import get_supabase_client
+from backend.models import PriceRollup, PriceSnapshot
+from backend.database import get_storage
+import numpy as np
+from backend.services import price_aggregation, price_store
+from backend.services.row_convert import as_utc, construct, parse_timestamp, rows_to_models
+
+# Rows per insert when ingesting a batch, and inserts sent at once
+PRICE_SNAPSHOT_CHUNK_SIZE = int(os.getenv("PRICE_SNAPSHOT_CHUNK_SIZE", "500"))
+PRICE_SNAPSHOT_CHUNK_CONCURRENCY = int(os.getenv("PRICE_SNAPSHOT_CHUNK_CONCURRENCY", "4"))
+
+# Rows fetched per keyset page when exporting
+PRICE_EXPORT_PAGE_SIZE = int(os.getenv("PRICE_EXPORT_PAGE_SIZE", "5000"))
+
+# Skip snapshots that repeat the last stored price of their (game, ticker) in
+# the same round; readers treat the stored rows as a step series. Off by
+# default: the last prices live in this process, so with several instances a
+# price stored elsewhere in between would be missed and the repeat dropped.
+PRICE_SNAPSHOT_DEDUP = os.getenv("PRICE_SNAPSHOT_DEDUP", "false").lower() in ("1", "true", "yes")
+# Relative price change below which a snapshot counts as a repeat (0 = exact)
+PRICE_SNAPSHOT_DEDUP_TOLERANCE = float(os.getenv("PRICE_SNAPSHOT_DEDUP_TOLERANCE", "0"))
+_MAX_LAST_PRICES = int(os.getenv("PRICE_LAST_CACHE_SIZE", "100000"))
+
+# (game_id, ticker_id) -> last stored snapshot row, most recently used last
+_last_prices: "OrderedDict[Tuple[int, int], dict]" = OrderedDict()
 
 
 def _db_dict_to_price_snapshot(db_dict: dict) -> PriceSnapshot:
@@ -19,7 +44,67 @@ def _db_dict_to_price_snapshot(db_dict: dict) -> PriceSnapshot:
     )
 
 
-def create_price_snapshot(
+def _is_repeat(row: dict, last: Optional[dict]) -> bool:
+    """True if row repeats the last stored price of its ticker within the tolerance."""
+    if last is None or last["round_id"] != row["round_id"]:
+        return False
+    previous, price = float(last["price"]), float(row["price"])
+    return abs(price - previous) <= PRICE_SNAPSHOT_DEDUP_TOLERANCE * abs(previous)
+
+
+def _last_price(game_id: int, ticker_id: int) -> Optional[dict]:
+    return _last_prices.get((game_id, ticker_id))
+
+
+def _remember(rows: List[dict]) -> None:
+    """Record stored rows as the last price of their (game, ticker)."""
+    for row in rows:
+        key = (row["game_id"], row["ticker_id"])
+        _last_prices[key] = row
+        _last_prices.move_to_end(key)
+    while len(_last_prices) > _MAX_LAST_PRICES:
+        _last_prices.popitem(last=False)
+
+
+def _drop_repeats(rows: List[dict], batched: Set[Tuple[int, int]]) -> List[dict]:
+    """
+    Filter out repeated prices of one chunk, in order.
+    
+    A row is only skipped against a row known to end up stored with it: an
+    earlier row of the same chunk (one insert, all or nothing) or the last
+    stored price. Keys in `batched` have rows in earlier chunks of the same
+    batch, whose inserts may still fail, so their first row here is kept.
+    """
+    if not PRICE_SNAPSHOT_DEDUP:
+        return rows
+    kept = []
+    within: Dict[Tuple[int, int], dict] = {}
+    for row in rows:
+        key = (row["game_id"], row["ticker_id"])
+        if key in within:
+            reference = within[key]
+        elif key in batched:
+            reference = None
+        else:
+            reference = _last_prices.get(key)
+        if _is_repeat(row, reference):
+            continue
+        within[key] = row
+        kept.append(row)
+    batched.update(within)
+    return kept
+
+
+def forget_last_prices(game_id: Optional[int] = None) -> None:
+    """Drop cached last prices (of one game, or all), e.g. after deleting snapshots."""
+    if game_id is None:
+        _last_prices.clear()
+        return
+    for key in [key for key in _last_prices if key[0] == game_id]:
+        del _last_prices[key]
+
+
+async def create_price_snapshot(
     game_id: int,
     round_id: int,
     ticker_id: int,
@@ -35,59 +120,191 @@ def create_price_snapshot(
         price: The price at snapshot time
     
     Returns:
-        Created PriceSnapshot if successful, None otherwise
+        Created PriceSnapshot if successful (or the last stored one if the
+        price is unchanged and nothing was inserted), None otherwise
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
+    row = {
+        "game_id": game_id,
+        "round_id": round_id,
+        "ticker_id": ticker_id,
+        "price": price
+    }
+    
+    last = _last_price(game_id, ticker_id)
+    if PRICE_SNAPSHOT_DEDUP and _is_repeat(row, last):
+        return _db_dict_to_price_snapshot(last)
     
     try:
-        result = supabase.table("price_snapshots").insert({
-            "game_id": game_id,
-            "round_id": round_id,
-            "ticker_id": ticker_id,
-            "price": price
-        }).execute()
+        rows = await storage.insert("price_snapshots", row)
         
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_price_snapshot(result.data[0])
+        if rows:
+            _remember(rows)
+            price_store.add(rows)
+            return _db_dict_to_price_snapshot(rows[0])
         return None
     except Exception as e:
-        print(f"Error creating price snapshot in Supabase: {e}")
+        print(f"Error creating price snapshot: {e}")
         return None
 
 
-def create_price_snapshots_batch(snapshots: List[dict]) -> List[PriceSnapshot]:
+async def _insert_chunk(index: int, start: int, rows: List[dict], limiter: asyncio.Semaphore) -> Tuple[int, int, List[dict], Optional[str]]:
+    if not rows:
+        return index, start, [], None
+    async with limiter:
+        try:
+            return index, start, await get_storage().insert("price_snapshots", rows), None
+        except Exception as e:
+            print(f"Error inserting price snapshot chunk {index} ({len(rows)} rows): {e}")
+            return index, start, [], str(e)
+
+
+async def ingest_price_snapshots(
+    snapshots: List[dict],
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None
+) -> Tuple[List[PriceSnapshot], List[dict], int]:
     """
-    Create multiple price snapshots in a batch.
+    Insert a large batch of price snapshots in chunks sent concurrently.
+    
+    Each chunk is a separate insert, so one failing chunk does not lose the
+    others. Rows are expected to be validated already. Snapshots repeating
+    the last stored price of their ticker are skipped (see PRICE_SNAPSHOT_DEDUP).
     
     Args:
         snapshots: List of dicts with {game_id, round_id, ticker_id, price}
+        chunk_size: Rows per insert (default: PRICE_SNAPSHOT_CHUNK_SIZE)
+        concurrency: Inserts in flight at once (default: PRICE_SNAPSHOT_CHUNK_CONCURRENCY)
     
     Returns:
-        List of created PriceSnapshot objects
+        (created PriceSnapshots in input order, failed chunks as
+        {index, start, count, error} where start is the first row's position
+        in snapshots, number of snapshots skipped as unchanged)
     """
-    supabase = get_supabase_client()
+    chunk_size = max(1, chunk_size or PRICE_SNAPSHOT_CHUNK_SIZE)
+    limiter = asyncio.Semaphore(max(1, concurrency or PRICE_SNAPSHOT_CHUNK_CONCURRENCY))
+    
+    # Dedup per chunk before the inserts, keeping chunk positions relative to the request
+    batched: Set[Tuple[int, int]] = set()
+    chunks = []
+    skipped = 0
+    for index, start in enumerate(range(0, len(snapshots), chunk_size)):
+        chunk = snapshots[start:start + chunk_size]
+        kept = _drop_repeats(chunk, batched)
+        skipped += len(chunk) - len(kept)
+        chunks.append((index, start, kept))
     
+    results = await asyncio.gather(*(
+        _insert_chunk(index, start, kept, limiter) for index, start, kept in chunks
+    ))
+    
+    rows: List[dict] = []
+    failures: List[dict] = []
+    for index, start, inserted, error in results:
+        if error is None:
+            rows.extend(inserted)
+        else:
+            failures.append({
+                "index": index,
+                "start": start,
+                "count": len(snapshots[start:start + chunk_size]),
+                "error": error
+            })
+    # Only rows actually stored become the new last prices
+    _remember(rows)
+    price_store.add(rows)
     try:
-        result = supabase.table("price_snapshots").insert(snapshots).execute()
-        return [_db_dict_to_price_snapshot(row) for row in result.data]
+        return rows_to_models(PriceSnapshot, rows), failures, skipped
     except Exception as e:
-        print(f"Error creating price snapshots batch in Supabase: {e}")
-        return []
+        print(f"Error converting inserted price snapshots: {e}")
+        return [], failures, skipped
+
+
+def rows_from_columns(game_id: int, round_id: int, ticker_ids: Sequence[int], prices: Sequence[float]) -> List[dict]:
+    """Expand a columnar batch (parallel ticker_ids/prices) into insert rows."""
+    return [
+        {"game_id": game_id, "round_id": round_id, "ticker_id": ticker_id, "price": price}
+        for ticker_id, price in zip(ticker_ids, prices)
+    ]
+
+
+async def create_price_snapshots_batch(snapshots: List[dict]) -> List[PriceSnapshot]:
+    """
+    Create multiple price snapshots in a batch.
+    
+    Args:
+        snapshots: List of dicts with {game_id, round_id, ticker_id, price}
+    
+    Returns:
+        List of created PriceSnapshot objects (rows of failed chunks are left out)
+    """
+    created, _, _ = await ingest_price_snapshots(snapshots)
+    return created
+
+
+def _held_columns(
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None,
+    ticker_ids: Optional[Sequence[int]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None
+) -> Optional[Tuple[int, Tuple[np.ndarray, ...]]]:
+    """
+    Answer a query from the in-memory price store.
+    
+    Returns:
+        (game_id, (ticker_ids, ids, round_ids, times in µs, prices)) merged
+        across tickers and ordered by time, or None if the game is cold
+    """
+    held = price_store.select(game_id, round_id, ticker_ids)
+    if held is None:
+        return None
+    game_id, per_ticker = held
+    if not per_ticker:
+        empty = np.empty(0, dtype=np.int64)
+        return game_id, (empty, empty, empty, empty, np.empty(0))
+    
+    tickers = np.concatenate([np.full(cols[0].size, tid, dtype=np.int64) for tid, cols in per_ticker.items()])
+    ids, rounds, times, prices = (np.concatenate(parts) for parts in zip(*per_ticker.values()))
+    mask = np.ones(times.size, dtype=bool)
+    if start is not None:
+        mask &= times >= price_store.to_micros(as_utc(start))
+    if end is not None:
+        mask &= times < price_store.to_micros(as_utc(end))
+    order = np.flatnonzero(mask)[np.lexsort((ids[mask], times[mask]))][:limit]
+    return game_id, (tickers[order], ids[order], rounds[order], times[order], prices[order])
 
 
-def get_price_snapshots_by_round(round_id: int) -> List[PriceSnapshot]:
+def _held_rows(*args, **kwargs) -> Optional[List[dict]]:
+    """Like _held_columns, as snapshot rows of final field types (ready for construct)."""
+    held = _held_columns(*args, **kwargs)
+    if held is None:
+        return None
+    game_id, (tickers, ids, rounds, times, prices) = held
+    return [
+        {"id": i, "game_id": game_id, "round_id": r, "ticker_id": t, "price": p, "taken_at": price_store.from_micros(us)}
+        for t, i, r, us, p in zip(tickers.tolist(), ids.tolist(), rounds.tolist(), times.tolist(), prices.tolist())
+    ]
+
+
+async def get_price_snapshots_by_round(round_id: int) -> List[PriceSnapshot]:
     """Get all price snapshots for a specific round."""
-    supabase = get_supabase_client()
+    storage = get_storage()
+    
+    held = _held_rows(round_id=round_id)
+    if held is not None:
+        return [construct(PriceSnapshot, row) for row in held]
     
     try:
-        result = supabase.table("price_snapshots").select("*").eq("round_id", round_id).order("taken_at", desc=False).execute()
-        return [_db_dict_to_price_snapshot(row) for row in result.data]
+        rows = await storage.select("price_snapshots", [("round_id", "eq", round_id)], order_by="taken_at")
+        return rows_to_models(PriceSnapshot, rows)
     except Exception as e:
-        print(f"Error fetching price snapshots by round from Supabase: {e}")
+        print(f"Error fetching price snapshots by round: {e}")
         return []
 
 
-def get_price_history(ticker_id: int, game_id: int, round_id: Optional[int] = None, limit: Optional[int] = None) -> List[PriceSnapshot]:
+async def get_price_history(ticker_id: int, game_id: int, round_id: Optional[int] = None, limit: Optional[int] = None) -> List[PriceSnapshot]:
     """
     Get price history for a ticker.
     
@@ -100,34 +317,357 @@ def get_price_history(ticker_id: int, game_id: int, round_id: Optional[int] = No
     Returns:
         List of PriceSnapshot objects
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
+    
+    held = _held_rows(game_id, round_id, [ticker_id], limit=limit)
+    if held is not None:
+        return [construct(PriceSnapshot, row) for row in held]
     
     try:
-        query = supabase.table("price_snapshots").select("*").eq("ticker_id", ticker_id).eq("game_id", game_id)
+        filters = [("ticker_id", "eq", ticker_id), ("game_id", "eq", game_id)]
         
         if round_id:
-            query = query.eq("round_id", round_id)
-        
-        query = query.order("taken_at", desc=False)
+            filters.append(("round_id", "eq", round_id))
         
-        if limit:
-            query = query.limit(limit)
-        
-        result = query.execute()
-        return [_db_dict_to_price_snapshot(row) for row in result.data]
+        rows = await storage.select("price_snapshots", filters, order_by="taken_at", limit=limit)
+        return rows_to_models(PriceSnapshot, rows)
     except Exception as e:
-        print(f"Error fetching price history from Supabase: {e}")
+        print(f"Error fetching price history: {e}")
         return []
 
 
-def get_price_snapshots_by_game(game_id: int) -> List[PriceSnapshot]:
+async def get_price_snapshots_by_game(game_id: int) -> List[PriceSnapshot]:
     """Get all price snapshots for a specific game."""
-    supabase = get_supabase_client()
+    storage = get_storage()
+    
+    held = _held_rows(game_id)
+    if held is not None:
+        return [construct(PriceSnapshot, row) for row in held]
     
     try:
-        result = supabase.table("price_snapshots").select("*").eq("game_id", game_id).order("taken_at", desc=False).execute()
-        return [_db_dict_to_price_snapshot(row) for row in result.data]
+        rows = await storage.select("price_snapshots", [("game_id", "eq", game_id)], order_by="taken_at")
+        return rows_to_models(PriceSnapshot, rows)
     except Exception as e:
-        print(f"Error fetching price snapshots by game from Supabase: {e}")
+        print(f"Error fetching price snapshots by game: {e}")
         return []
 
+
+def _snapshot_filters(
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None,
+    ticker_id: Optional[int] = None,
+    ticker_ids: Optional[Sequence[int]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    game_ids: Optional[Sequence[int]] = None
+) -> list:
+    filters = []
+    if game_id:
+        filters.append(("game_id", "eq", game_id))
+    if game_ids is not None:
+        filters.append(("game_id", "in", list(game_ids)))
+    if round_id:
+        filters.append(("round_id", "eq", round_id))
+    if ticker_id:
+        filters.append(("ticker_id", "eq", ticker_id))
+    if ticker_ids is not None:
+        filters.append(("ticker_id", "in", list(ticker_ids)))
+    if start is not None:
+        filters.append(("taken_at", "gte", as_utc(start).isoformat()))
+    if end is not None:
+        filters.append(("taken_at", "lt", as_utc(end).isoformat()))
+    return filters
+
+
+async def _last_before(
+    ticker_ids: Sequence[int],
+    start: datetime,
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None
+) -> Dict[int, dict]:
+    """
+    Last stored snapshot before start per ticker: the price in effect when a
+    time window opens, since unchanged prices are not stored.
+    """
+    held = _held_rows(game_id, round_id, ticker_ids, end=start)
+    if held is not None:
+        # Ordered by time, so the last row per ticker wins
+        return {row["ticker_id"]: row for row in held}
+    
+    storage = get_storage()
+    # One query for all tickers (window function / SQL function per backend)
+    found = await storage.select_latest(
+        "price_snapshots",
+        _snapshot_filters(game_id, round_id, ticker_ids=ticker_ids, end=start),
+        partition_by="ticker_id",
+        order_by="taken_at"
+    )
+    return {row["ticker_id"]: row for row in found}
+
+
+async def iter_price_snapshot_pages(
+    game_ids: Optional[Sequence[int]] = None,
+    round_id: Optional[int] = None,
+    ticker_ids: Optional[Sequence[int]] = None,
+    after_id: Optional[int] = None,
+    page_size: Optional[int] = None
+) -> AsyncIterator[List[dict]]:
+    """
+    Yield stored snapshot rows in id order, one keyset page at a time
+    (id > last id seen), so exporting a game of any size keeps memory flat.
+    
+    Args:
+        game_ids: Only these games
+        round_id: Only this round
+        ticker_ids: Only these tickers
+        after_id: Start after this snapshot id
+        page_size: Rows per query (default: PRICE_EXPORT_PAGE_SIZE)
+    
+    Raises:
+        Exception: Storage errors are not swallowed, so a failed export is
+            never mistaken for a complete one
+    """
+    storage = get_storage()
+    size = max(1, page_size or PRICE_EXPORT_PAGE_SIZE)
+    filters = _snapshot_filters(round_id=round_id, ticker_ids=ticker_ids, game_ids=game_ids)
+    while True:
+        cursor = [("id", "gt", after_id)] if after_id is not None else []
+        rows = await storage.select("price_snapshots", filters + cursor, order_by="id", limit=size)
+        # Only an empty page ends the scan: a short one may just be the
+        # backend's own row cap (PostgREST max_rows) and not the end of the table
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1]["id"]
+
+
+async def _select_by_time(filters: list, columns: str = "*", limit: Optional[int] = None) -> List[dict]:
+    """
+    Read snapshot rows ordered by (taken_at, id), one keyset page at a time,
+    so a long history is not cut short by the backend's row cap (PostgREST
+    max_rows). Rows sharing the last taken_at of a page are finished by id
+    before moving past that time. columns must include id and taken_at.
+    
+    Raises:
+        Exception: Storage errors are left to the caller
+    """
+    storage = get_storage()
+    rows: List[dict] = []
+    after: Optional[Tuple[object, int]] = None  # (taken_at, id) of the last row read
+    same_time = False
+    while limit is None or len(rows) < limit:
+        size = PRICE_EXPORT_PAGE_SIZE if limit is None else min(PRICE_EXPORT_PAGE_SIZE, limit - len(rows))
+        if after is None:
+            cursor = []
+        elif same_time:
+            cursor = [("taken_at", "eq", after[0]), ("id", "gt", after[1])]
+        else:
+            cursor = [("taken_at", "gt", after[0])]
+        page = await storage.select(
+            "price_snapshots", filters + cursor, columns=columns, order_by="taken_at,id", limit=size
+        )
+        # Only an empty page ends a step: a short one may just be the row cap
+        if not page:
+            if not same_time:
+                break
+            same_time = False
+            continue
+        rows.extend(page)
+        after, same_time = (page[-1]["taken_at"], page[-1]["id"]), True
+    return rows
+
+
+async def get_price_history_multi(
+    ticker_ids: Sequence[int],
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None
+) -> Dict[int, List[PriceSnapshot]]:
+    """
+    Get price history for several tickers in one keyset-paged read (see
+    _select_by_time), plus one query for the prices carried into the window
+    when start is given.
+    
+    Args:
+        ticker_ids: The ticker IDs
+        game_id: Optional game ID to filter by
+        round_id: Optional round ID to filter by
+        start: Only snapshots taken at or after this time (each ticker's
+            series starts with its last snapshot before start, if any)
+        end: Only snapshots taken before this time
+        limit: Optional limit on the total number of snapshots
+    
+    Returns:
+        {ticker_id: [PriceSnapshot]} ordered by taken_at; every requested
+        ticker is present, with an empty list if it has no snapshots
+    """
+    history: Dict[int, List[PriceSnapshot]] = {tid: [] for tid in ticker_ids}
+    if not history:
+        return history
+    
+    try:
+        rows = _held_rows(game_id, round_id, list(history), start, end, limit)
+        if rows is None:
+            rows = await _select_by_time(
+                _snapshot_filters(game_id, round_id, ticker_ids=list(history), start=start, end=end),
+                limit=limit
+            )
+        if start is not None:
+            carried = await _last_before(list(history), start, game_id, round_id)
+            rows = list(carried.values()) + rows
+        for snapshot in rows_to_models(PriceSnapshot, rows):
+            history[snapshot.ticker_id].append(snapshot)
+        return history
+    except Exception as e:
+        print(f"Error fetching multi-ticker price history: {e}")
+        return {}
+
+
+async def get_price_series(
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None,
+    ticker_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    ticker_ids: Optional[Sequence[int]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict[int, Tuple[List[int], List[float]]]:
+    """
+    Get price history as parallel arrays per ticker, for charts.
+    
+    Only ticker_id, price and taken_at are read (in keyset pages, see
+    _select_by_time), and no model is built per row.
+    
+    Args:
+        game_id: Filter by game ID
+        round_id: Filter by round ID
+        ticker_id: Filter by ticker ID
+        limit: Optional limit on the number of snapshots read
+        ticker_ids: Only these tickers
+        start: Only snapshots taken at or after this time (with ticker_ids,
+            each series starts with its last snapshot before start, if any)
+        end: Only snapshots taken before this time
+    
+    Returns:
+        {ticker_id: (timestamps in ms, prices)}, each ordered by taken_at
+    """
+    if ticker_id:
+        ticker_ids = [ticker_id]
+    held = _held_columns(game_id, round_id, ticker_ids, start, end, limit)
+    if held is not None:
+        _, (tickers, _, _, times, prices) = held
+        series: Dict[int, Tuple[List[int], List[float]]] = {}
+        if start is not None and ticker_ids:
+            for tid, row in (await _last_before(ticker_ids, start, game_id, round_id)).items():
+                series[tid] = ([price_store.to_micros(row["taken_at"]) // 1000], [float(row["price"])])
+        for tid in np.unique(tickers).tolist():
+            mask = tickers == tid
+            entry = series.setdefault(tid, ([], []))
+            entry[0].extend((times[mask] // 1000).tolist())
+            entry[1].extend(prices[mask].tolist())
+        return series
+    
+    try:
+        rows = await _select_by_time(
+            _snapshot_filters(game_id, round_id, ticker_ids=ticker_ids, start=start, end=end),
+            columns="id,ticker_id,price,taken_at",
+            limit=limit
+        )
+        if start is not None and ticker_ids:
+            carried = await _last_before(ticker_ids, start, game_id, round_id)
+            rows = list(carried.values()) + rows
+        series: Dict[int, Tuple[List[int], List[float]]] = {}
+        for row in rows:
+            taken_at = parse_timestamp(row["taken_at"])
+            if taken_at is None:
+                continue
+            entry = series.get(row["ticker_id"])
+            if entry is None:
+                entry = series[row["ticker_id"]] = ([], [])
+            entry[0].append(int(taken_at.timestamp() * 1000))
+            entry[1].append(float(row["price"]))
+        return series
+    except Exception as e:
+        print(f"Error fetching price series: {e}")
+        return {}
+
+
+async def get_price_candles(
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None,
+    ticker_id: Optional[int] = None,
+    method: str = "ohlc",
+    bucket_ms: Optional[int] = None,
+    max_points: Optional[int] = None
+) -> Tuple[Dict[int, Dict[str, list]], int]:
+    """
+    Get chart-ready price history per ticker, aggregated server-side.
+    
+    Args:
+        game_id: Filter by game ID
+        round_id: Filter by round ID
+        ticker_id: Filter by ticker ID
+        method: "ohlc" (candles per bucket) or "lttb" (downsampled line)
+        bucket_ms: Candle width in milliseconds (ohlc)
+        max_points: Point budget per ticker; for ohlc it picks the bucket width
+    
+    Returns:
+        ({ticker_id: arrays}, number of snapshots read). ohlc arrays are
+        timestamps, open, high, low, close and count, with flat count-0
+        candles where the price did not change; lttb arrays are timestamps
+        and close. Every series extends to the latest snapshot of the query.
+    
+    Raises:
+        ValueError: If filling gaps would produce too many candles
+    """
+    series = await get_price_series(game_id=game_id, round_id=round_id, ticker_id=ticker_id)
+    # Prices hold until the next stored snapshot, so every series runs to the end of the data
+    end_ms = max((timestamps[-1] for timestamps, _ in series.values() if timestamps), default=None)
+    result: Dict[int, Dict[str, list]] = {}
+    for tid, (timestamps, prices) in series.items():
+        if method == "lttb":
+            if timestamps and timestamps[-1] < end_ms:
+                timestamps, prices = timestamps + [end_ms], prices + [prices[-1]]
+            ts, px = price_aggregation.lttb(timestamps, prices, max_points)
+            result[tid] = {"timestamps": ts.tolist(), "close": px.tolist()}
+        else:
+            width = bucket_ms or price_aggregation.bucket_for([timestamps[0], end_ms] if timestamps else [], max_points)
+            candles = price_aggregation.ohlc(timestamps, prices, width, fill=True, end_ms=end_ms)
+            result[tid] = {key: values.tolist() for key, values in candles.items()}
+    return result, sum(len(prices) for _, prices in series.values())
+
+
+async def get_price_rollups(
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None,
+    ticker_ids: Optional[Sequence[int]] = None
+) -> List[PriceRollup]:
+    """
+    Get per-round OHLC summaries written by the compaction job.
+    
+    Args:
+        game_id: Optional game ID to filter by
+        round_id: Optional round ID to filter by
+        ticker_ids: Optional tickers to filter by
+    
+    Returns:
+        List of PriceRollup objects, oldest round first
+    """
+    storage = get_storage()
+    
+    try:
+        filters = []
+        if game_id:
+            filters.append(("game_id", "eq", game_id))
+        if round_id:
+            filters.append(("round_id", "eq", round_id))
+        if ticker_ids:
+            filters.append(("ticker_id", "in", list(ticker_ids)))
+        
+        rows = await storage.select("price_rollups", filters, order_by="id")
+        return rows_to_models(PriceRollup, rows)
+    except Exception as e:
+        print(f"Error fetching price rollups: {e}")
+        return []
@@ -0,0 +1,288 @@
+"""
+In-memory price history for games being played in this process.
+
+Every (game, ticker) gets a ring buffer of its stored snapshots (id, round,
+time, price) as NumPy arrays, fed by the price snapshot write path. Only games
+and rounds created by this process are tracked, because only for those is the
+buffer known to hold every row the database has; everything else (older games,
+rounds started before a restart) stays cold and is read from the database.
+
+A full ring overwrites its oldest entries, which makes the affected rounds
+unservable from memory. The total size is capped by PRICE_STORE_MAX_BYTES:
+the least recently used games are evicted first and go cold.
+
+Snapshots stored through another process never reach these buffers, so the
+store is only correct when one instance serves the API. It is therefore off
+unless PRICE_STORE_MAX_BYTES is set.
+"""
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from backend.services.row_convert import parse_timestamp
+
+# Snapshots kept per (game, ticker) before the oldest are overwritten
+PRICE_RING_CAPACITY = int(os.getenv("PRICE_RING_CAPACITY", "8192"))
+# Memory budget across all games (bytes); 0 (the default) disables the store.
+# Only enable with a single API instance (see the module docstring).
+PRICE_STORE_MAX_BYTES = int(os.getenv("PRICE_STORE_MAX_BYTES", "0"))
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_INITIAL_CAPACITY = 64
+
+# (ids, round_ids, times in µs since epoch, prices), ordered by time
+Columns = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def to_micros(value) -> Optional[int]:
+    """Stored timestamp (ISO string or datetime) as µs since the epoch."""
+    taken_at = parse_timestamp(value)
+    if taken_at is None:
+        return None
+    if taken_at.tzinfo is None:
+        taken_at = taken_at.replace(tzinfo=timezone.utc)
+    return (taken_at - EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    """µs since the epoch as an aware UTC datetime."""
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+class PriceRing:
+    """Ring buffer of one ticker's snapshots; grows by doubling up to its capacity."""
+
+    __slots__ = ("capacity", "ids", "rounds", "times", "prices", "head", "size", "lost_round")
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        n = min(_INITIAL_CAPACITY, self.capacity)
+        self.ids = np.empty(n, dtype=np.int64)
+        self.rounds = np.empty(n, dtype=np.int64)
+        self.times = np.empty(n, dtype=np.int64)
+        self.prices = np.empty(n, dtype=np.float64)
+        self.head = 0  # Index of the oldest entry
+        self.size = 0
+        self.lost_round = -1  # Highest round id of any overwritten entry
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.rounds.nbytes + self.times.nbytes + self.prices.nbytes
+
+    def _grow(self, needed: int) -> None:
+        n = self.ids.size
+        if needed <= n or n >= self.capacity:
+            return
+        while n < needed and n < self.capacity:
+            n *= 2
+        n = min(n, self.capacity)
+        ids, rounds, times, prices = self.columns()
+        self.ids = np.empty(n, dtype=np.int64)
+        self.rounds = np.empty(n, dtype=np.int64)
+        self.times = np.empty(n, dtype=np.int64)
+        self.prices = np.empty(n, dtype=np.float64)
+        self.ids[:self.size], self.rounds[:self.size] = ids, rounds
+        self.times[:self.size], self.prices[:self.size] = times, prices
+        self.head = 0
+
+    def append(self, ids: np.ndarray, rounds: np.ndarray, times: np.ndarray, prices: np.ndarray) -> None:
+        """Append entries (oldest first), overwriting the oldest if full."""
+        self._grow(self.size + ids.size)
+        n = self.ids.size
+        if ids.size > n:
+            # More than fits: only the newest n survive
+            self.lost_round = max(self.lost_round, int(rounds[:-n].max()))
+            ids, rounds, times, prices = ids[-n:], rounds[-n:], times[-n:], prices[-n:]
+
+        overflow = self.size + ids.size - n
+        if overflow > 0:
+            lost = (self.head + np.arange(overflow)) % n
+            self.lost_round = max(self.lost_round, int(self.rounds[lost].max()))
+            self.head = (self.head + overflow) % n
+            self.size -= overflow
+
+        slots = (self.head + self.size + np.arange(ids.size)) % n
+        self.ids[slots], self.rounds[slots] = ids, rounds
+        self.times[slots], self.prices[slots] = times, prices
+        self.size += ids.size
+
+    def columns(self) -> Columns:
+        """Entries in insertion order (copies)."""
+        order = (self.head + np.arange(self.size)) % self.ids.size
+        return self.ids[order], self.rounds[order], self.times[order], self.prices[order]
+
+
+class GameBuffer:
+    """Rings of one game, plus which of its rounds are held completely."""
+
+    __slots__ = ("whole_game", "rounds", "rings")
+
+    def __init__(self, whole_game: bool):
+        self.whole_game = whole_game  # Tracked since the game was created
+        self.rounds: Set[int] = set()  # Rounds tracked since they were created
+        self.rings: Dict[int, PriceRing] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ring.nbytes for ring in self.rings.values())
+
+    def holds(self, round_id: int) -> bool:
+        return self.whole_game or round_id in self.rounds
+
+
+_games: "OrderedDict[int, GameBuffer]" = OrderedDict()
+_round_games: Dict[int, int] = {}
+_bytes = 0
+
+
+def _enabled() -> bool:
+    return PRICE_STORE_MAX_BYTES > 0
+
+
+def track_game(game_id: int) -> None:
+    """Start holding a newly created game (it has no snapshots yet)."""
+    if not _enabled():
+        return
+    buffer = _games.get(game_id)
+    if buffer is None:
+        _games[game_id] = GameBuffer(whole_game=True)
+    _games.move_to_end(game_id)
+
+
+def track_round(game_id: int, round_id: int) -> None:
+    """Start holding a newly created round (it has no snapshots yet)."""
+    if not _enabled():
+        return
+    buffer = _games.get(game_id)
+    if buffer is None:
+        buffer = _games[game_id] = GameBuffer(whole_game=False)
+    buffer.rounds.add(round_id)
+    _round_games[round_id] = game_id
+    _games.move_to_end(game_id)
+
+
+def drop_game(game_id: int) -> None:
+    """Forget a game; its reads go to the database again."""
+    global _bytes
+    buffer = _games.pop(game_id, None)
+    if buffer is None:
+        return
+    _bytes -= buffer.nbytes
+    for round_id in [r for r, g in _round_games.items() if g == game_id]:
+        del _round_games[round_id]
+
+
+def clear() -> None:
+    """Forget every game."""
+    global _bytes
+    _games.clear()
+    _round_games.clear()
+    _bytes = 0
+
+
+def add(rows: Iterable[dict]) -> None:
+    """Feed stored snapshot rows (as returned by the insert) into their rings."""
+    global _bytes
+    grouped: Dict[Tuple[int, int], List[Tuple[int, int, int, float]]] = {}
+    for row in rows:
+        buffer = _games.get(row["game_id"])
+        if buffer is None or not buffer.holds(row["round_id"]):
+            continue
+        micros = to_micros(row.get("taken_at"))
+        if micros is None:
+            continue
+        grouped.setdefault((row["game_id"], row["ticker_id"]), []).append(
+            (row["id"], row["round_id"], micros, float(row["price"]))
+        )
+
+    for (game_id, ticker_id), entries in grouped.items():
+        buffer = _games.get(game_id)
+        if buffer is None:
+            continue  # Evicted while adding
+        ring = buffer.rings.get(ticker_id)
+        before = 0 if ring is None else ring.nbytes
+        if ring is None:
+            ring = buffer.rings[ticker_id] = PriceRing(PRICE_RING_CAPACITY)
+        ids, rounds, times, prices = zip(*entries)
+        ring.append(
+            np.array(ids, dtype=np.int64),
+            np.array(rounds, dtype=np.int64),
+            np.array(times, dtype=np.int64),
+            np.array(prices, dtype=np.float64)
+        )
+        _bytes += ring.nbytes - before
+        _games.move_to_end(game_id)
+        _evict()
+
+
+def _evict() -> None:
+    while _bytes > PRICE_STORE_MAX_BYTES and _games:
+        drop_game(next(iter(_games)))
+
+
+def select(
+    game_id: Optional[int] = None,
+    round_id: Optional[int] = None,
+    ticker_ids: Optional[Sequence[int]] = None
+) -> Optional[Tuple[int, Dict[int, Columns]]]:
+    """
+    Snapshots held in memory, per ticker and ordered by time.
+
+    Returns:
+        (game_id, {ticker_id: columns} for tickers with matching snapshots),
+        or None if the query cannot be answered completely from memory
+    """
+    if round_id:
+        owner = _round_games.get(round_id)
+        if owner is None or (game_id and game_id != owner):
+            return None
+        game_id = owner
+    if not game_id:
+        return None
+
+    buffer = _games.get(game_id)
+    if buffer is None:
+        return None
+    if round_id:
+        if not buffer.holds(round_id):
+            return None
+    elif not buffer.whole_game:
+        return None
+
+    if ticker_ids is None:
+        rings = buffer.rings.items()
+    else:
+        rings = [(tid, buffer.rings[tid]) for tid in ticker_ids if tid in buffer.rings]
+
+    result: Dict[int, Columns] = {}
+    for ticker_id, ring in rings:
+        # Overwritten entries of this round (or of any round, for game-wide reads)
+        if ring.lost_round >= (round_id or 0):
+            return None
+        ids, rounds, times, prices = ring.columns()
+        if round_id:
+            mask = rounds == round_id
+            ids, rounds, times, prices = ids[mask], rounds[mask], times[mask], prices[mask]
+        if ids.size == 0:
+            continue
+        if times.size > 1 and np.any(times[1:] < times[:-1]):
+            order = np.lexsort((ids, times))
+            ids, rounds, times, prices = ids[order], rounds[order], times[order], prices[order]
+        result[ticker_id] = (ids, rounds, times, prices)
+
+    _games.move_to_end(game_id)
+    return game_id, result
+
+
+def memory_bytes() -> int:
+    """Bytes held by all rings."""
+    return _bytes
+
+
+def game_count() -> int:
+    """Number of games held in memory."""
+    return len(_games)
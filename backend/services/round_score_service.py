@@ -3,7 +3,9 @@ Service layer for round score operations.
 """
 from typing import List, Optional
 from backend.models import RoundScore
-from backend.database import get_supabase_client
+from backend.database import get_storage
+from backend.services import leaderboard_service
+from backend.services.row_convert import rows_to_models
 
 
 def _db_dict_to_round_score(db_dict: dict) -> RoundScore:
@@ -19,7 +21,7 @@ def _db_dict_to_round_score(db_dict: dict) -> RoundScore:
     )
 
 
-def create_round_score(
+async def create_round_score(
     participant_id: int,
     round_id: int,
     pnl_delta: float,
@@ -39,59 +41,92 @@ def create_round_score(
     Returns:
         Created RoundScore if successful, None otherwise
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("round_scores").insert({
+        rows = await storage.insert("round_scores", {
             "participant_id": participant_id,
             "round_id": round_id,
             "pnl_delta": pnl_delta,
             "reacted": reacted,
             "reaction_ms": reaction_ms
-        }).execute()
+        })
         
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_round_score(result.data[0])
+        if rows:
+            await leaderboard_service.record_scores(rows)
+            return _db_dict_to_round_score(rows[0])
         return None
     except Exception as e:
-        print(f"Error creating round score in Supabase: {e}")
+        print(f"Error creating round score: {e}")
         return None
 
 
-def get_round_scores_by_round(round_id: int) -> List[RoundScore]:
+async def create_round_scores_batch(round_id: int, scores: List[dict]) -> List[RoundScore]:
+    """
+    Store every participant's score for a round with one bulk insert.
+    
+    Args:
+        round_id: The round ID
+        scores: Dicts with participant_id, pnl_delta, reacted and reaction_ms
+    
+    Returns:
+        List of created RoundScore objects (empty on failure)
+    """
+    storage = get_storage()
+    
+    try:
+        rows = await storage.insert("round_scores", [
+            {
+                "participant_id": score["participant_id"],
+                "round_id": round_id,
+                "pnl_delta": score["pnl_delta"],
+                "reacted": score["reacted"],
+                "reaction_ms": score.get("reaction_ms")
+            }
+            for score in scores
+        ])
+        # One leaderboard update for the whole batch
+        await leaderboard_service.record_scores(rows)
+        return rows_to_models(RoundScore, rows)
+    except Exception as e:
+        print(f"Error creating round scores batch: {e}")
+        return []
+
+
+async def get_round_scores_by_round(round_id: int) -> List[RoundScore]:
     """Get all round scores for a specific round."""
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("round_scores").select("*").eq("round_id", round_id).order("pnl_delta", desc=True).execute()
-        return [_db_dict_to_round_score(row) for row in result.data]
+        rows = await storage.select("round_scores", [("round_id", "eq", round_id)], order_by="pnl_delta", desc=True)
+        return rows_to_models(RoundScore, rows)
     except Exception as e:
-        print(f"Error fetching round scores by round from Supabase: {e}")
+        print(f"Error fetching round scores by round: {e}")
         return []
 
 
-def get_round_scores_by_participant(participant_id: int) -> List[RoundScore]:
+async def get_round_scores_by_participant(participant_id: int) -> List[RoundScore]:
     """Get all round scores for a specific participant."""
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("round_scores").select("*").eq("participant_id", participant_id).order("round_id", desc=False).execute()
-        return [_db_dict_to_round_score(row) for row in result.data]
+        rows = await storage.select("round_scores", [("participant_id", "eq", participant_id)], order_by="round_id")
+        return rows_to_models(RoundScore, rows)
     except Exception as e:
-        print(f"Error fetching round scores by participant from Supabase: {e}")
+        print(f"Error fetching round scores by participant: {e}")
         return []
 
 
-def get_round_score_by_id(score_id: int) -> Optional[RoundScore]:
+async def get_round_score_by_id(score_id: int) -> Optional[RoundScore]:
     """Get a round score by its ID."""
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("round_scores").select("*").eq("id", score_id).limit(1).execute()
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_round_score(result.data[0])
+        rows = await storage.select("round_scores", [("id", "eq", score_id)], limit=1)
+        if rows:
+            return _db_dict_to_round_score(rows[0])
         return None
     except Exception as e:
-        print(f"Error fetching round score by ID from Supabase: {e}")
+        print(f"Error fetching round score by ID: {e}")
         return None
 
@@ -0,0 +1,72 @@
+"""
+Fast bulk conversion of trusted database rows into API models.
+
+Two paths, whichever does less Python work per row:
+
+- rows_to_models(): rows whose columns are the model's fields are converted
+  as a whole list in one pydantic-core call (coercion and ISO timestamp
+  parsing happen in Rust, no per-row Python frames or kwargs dicts).
+- construct(): rows that need a Python-side mapping anyway (events) skip
+  validation entirely; the caller converts values to their final types.
+
+Either way FastAPI's response check only does an isinstance test per model.
+"""
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+_new = object.__new__
+_set = object.__setattr__
+_fromisoformat = datetime.fromisoformat
+_datetime_adapter = TypeAdapter(datetime)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def rows_to_models(model: Type[M], rows: Sequence[dict]) -> List[M]:
+    """Convert rows whose columns match the model's fields (extra columns are ignored)."""
+    return _list_adapter(model).validate_python(rows)
+
+
+def models_to_rows(model: Type[M], items: Sequence[M]) -> List[dict]:
+    """Dump a list of models to plain dicts in one pydantic-core call (replaces per-item .dict())."""
+    return _list_adapter(model).dump_python(items)
+
+
+def construct(model: Type[M], values: Dict[str, Any]) -> M:
+    """
+    Build a model instance from already-valid values without validation.
+    `values` must contain every field of the model; it becomes the instance's
+    __dict__, so pass a fresh dict.
+    """
+    obj = _new(model)
+    _set(obj, "__dict__", values)
+    _set(obj, "__pydantic_fields_set__", set(values))
+    _set(obj, "__pydantic_extra__", None)
+    _set(obj, "__pydantic_private__", None)
+    return obj
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a stored timestamp (ISO string or datetime); None stays None."""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return _fromisoformat(value)
+    except (TypeError, ValueError):
+        # Rare formats: defer to Pydantic's parser
+        return _datetime_adapter.validate_python(value)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values are taken to be UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -3,7 +3,8 @@ Service layer for ticker operations.
 """
 from typing import List, Optional
 from backend.models import Ticker
-from backend.database import get_supabase_client
+from backend.database import get_storage
+from backend.services.row_convert import rows_to_models
 
 
 def _db_dict_to_ticker(db_dict: dict) -> Ticker:
@@ -17,24 +18,24 @@ def _db_dict_to_ticker(db_dict: dict) -> Ticker:
     )
 
 
-def get_all_tickers() -> List[Ticker]:
+async def get_all_tickers() -> List[Ticker]:
     """
-    Get all tickers from Supabase.
+    Get all tickers.
     
     Returns:
         List of Ticker objects
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("tickers").select("*").order("symbol", desc=False).execute()
-        return [_db_dict_to_ticker(row) for row in result.data]
+        rows = await storage.select("tickers", order_by="symbol")
+        return rows_to_models(Ticker, rows)
     except Exception as e:
-        print(f"Error fetching tickers from Supabase: {e}")
+        print(f"Error fetching tickers: {e}")
         return []
 
 
-def get_ticker_by_id(ticker_id: int) -> Optional[Ticker]:
+async def get_ticker_by_id(ticker_id: int) -> Optional[Ticker]:
     """
     Get a ticker by its ID.
     
@@ -44,19 +45,19 @@ def get_ticker_by_id(ticker_id: int) -> Optional[Ticker]:
     Returns:
         Ticker if found, None otherwise
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("tickers").select("*").eq("id", ticker_id).limit(1).execute()
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_ticker(result.data[0])
+        rows = await storage.select("tickers", [("id", "eq", ticker_id)], limit=1)
+        if rows:
+            return _db_dict_to_ticker(rows[0])
         return None
     except Exception as e:
-        print(f"Error fetching ticker by ID from Supabase: {e}")
+        print(f"Error fetching ticker by ID: {e}")
         return None
 
 
-def get_ticker_by_symbol(symbol: str) -> Optional[Ticker]:
+async def get_ticker_by_symbol(symbol: str) -> Optional[Ticker]:
     """
     Get a ticker by its symbol.
     
@@ -66,19 +67,19 @@ def get_ticker_by_symbol(symbol: str) -> Optional[Ticker]:
     Returns:
         Ticker if found, None otherwise
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("tickers").select("*").eq("symbol", symbol.upper()).limit(1).execute()
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_ticker(result.data[0])
+        rows = await storage.select("tickers", [("symbol", "eq", symbol.upper())], limit=1)
+        if rows:
+            return _db_dict_to_ticker(rows[0])
         return None
     except Exception as e:
-        print(f"Error fetching ticker by symbol from Supabase: {e}")
+        print(f"Error fetching ticker by symbol: {e}")
         return None
 
 
-def create_ticker(symbol: str, name: str, sector: str) -> Optional[Ticker]:
+async def create_ticker(symbol: str, name: str, sector: str) -> Optional[Ticker]:
     """
     Create a new ticker.
     
@@ -90,19 +91,19 @@ def create_ticker(symbol: str, name: str, sector: str) -> Optional[Ticker]:
     Returns:
         Created Ticker if successful, None otherwise
     """
-    supabase = get_supabase_client()
+    storage = get_storage()
     
     try:
-        result = supabase.table("tickers").insert({
+        rows = await storage.insert("tickers", {
             "symbol": symbol.upper(),
             "name": name,
             "sector": sector
-        }).execute()
+        })
         
-        if result.data and len(result.data) > 0:
-            return _db_dict_to_ticker(result.data[0])
+        if rows:
+            return _db_dict_to_ticker(rows[0])
         return None
     except Exception as e:
-        print(f"Error creating ticker in Supabase: {e}")
+        print(f"Error creating ticker: {e}")
         return None
 
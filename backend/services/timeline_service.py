@@ -0,0 +1,110 @@
+"""
+Service layer for pre-generated round event timelines.
+
+When a round is created, the whole ordered schedule of news and blackswan
+events is generated in one pass, stored with one bulk insert and cached, so
+clients read the next event by index instead of generating it on demand.
+Scheduled events stay out of the event listings until their ts is reached,
+and are pushed to live subscribers (event_bus) at that time.
+"""
+import asyncio
+import os
+import random
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from backend.models import Event, Round
+from backend.services import event_bus, event_service
+
+# Schedule configuration (matches GameController's level-1 cadence)
+TIMELINE_ROUND_MS = int(os.getenv("TIMELINE_ROUND_MS", "30000"))
+TIMELINE_MIN_GAP_MS = int(os.getenv("TIMELINE_MIN_GAP_MS", "4500"))
+TIMELINE_MAX_GAP_MS = int(os.getenv("TIMELINE_MAX_GAP_MS", "5500"))
+TIMELINE_BLACKSWAN_PROB = float(os.getenv("TIMELINE_BLACKSWAN_PROB", "0.25"))
+
+_MAX_CACHED_ROUNDS = 256  # Rounds kept in memory, least recently used evicted first
+_timelines: "OrderedDict[int, List[Event]]" = OrderedDict()
+
+
+def _plan_schedule(starts_at_ms: int) -> Tuple[List[str], List[int]]:
+    """
+    Plan event types and jittered times for one round.
+    News events follow the cadence; at most one blackswan lands mid-round.
+    """
+    types: List[str] = []
+    timestamps: List[int] = []
+    offset = 0
+    while True:
+        offset += random.randint(TIMELINE_MIN_GAP_MS, TIMELINE_MAX_GAP_MS)
+        if offset >= TIMELINE_ROUND_MS:
+            break
+        types.append(random.choice(["MACRO", "MICRO"]))
+        timestamps.append(starts_at_ms + offset)
+
+    if random.random() < TIMELINE_BLACKSWAN_PROB:
+        bs_offset = random.randint(TIMELINE_ROUND_MS // 4, TIMELINE_ROUND_MS * 3 // 4)
+        at = sum(1 for ts in timestamps if ts <= starts_at_ms + bs_offset)
+        types.insert(at, "BLACKSWAN")
+        timestamps.insert(at, starts_at_ms + bs_offset)
+
+    return types, timestamps
+
+
+def _cache(round_id: int, events: List[Event]) -> None:
+    _timelines[round_id] = events
+    _timelines.move_to_end(round_id)
+    while len(_timelines) > _MAX_CACHED_ROUNDS:
+        _timelines.popitem(last=False)
+
+
+def _publish_when_due(events: List[Event], game_id: int, round_id: int) -> None:
+    """Push each scheduled event to live subscribers once its ts is reached."""
+    loop = asyncio.get_running_loop()
+    now_ms = int(time.time() * 1000)
+    for event in events:
+        delay = max(0.0, (event.ts - now_ms) / 1000)
+        loop.call_later(delay, event_bus.publish, [event], game_id, round_id)
+
+
+async def build_round_timeline(round_obj: Round, starts_at_ms: Optional[int] = None) -> List[Event]:
+    """
+    Generate, bulk-store and cache the full event timeline for a round.
+
+    Args:
+        round_obj: The round to schedule events for
+        starts_at_ms: Round start in milliseconds (default: now)
+
+    Returns:
+        Events ordered by scheduled ts
+    """
+    if starts_at_ms is None:
+        starts_at_ms = int(time.time() * 1000)
+    types, timestamps = _plan_schedule(starts_at_ms)
+    events = await event_service.generate_events_batch(
+        count=len(types),
+        game_id=round_obj.game_id,
+        round_id=round_obj.id,
+        types=types,
+        timestamps=timestamps
+    )
+    _cache(round_obj.id, events)
+    _publish_when_due(events, round_obj.game_id, round_obj.id)
+    return events
+
+
+async def get_round_timeline(round_id: int) -> Optional[List[Event]]:
+    """
+    Get a round's timeline from the cache, loading it from storage on a miss.
+    Returns None if the round has no stored timeline.
+    """
+    events = _timelines.get(round_id)
+    if events is not None:
+        _timelines.move_to_end(round_id)
+        return events
+
+    events = await event_service.get_scheduled_events(round_id)
+    if not events:
+        return None
+    _cache(round_id, events)
+    return events
+
@@ -2,6 +2,7 @@
 Test script to verify database connection and data operations.
 Run this script to test if Supabase connection is working correctly.
 """
+import asyncio
 import os
 import sys
 from dotenv import load_dotenv
@@ -9,6 +10,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Services are async; drive them all from one event loop
+run = asyncio.new_event_loop().run_until_complete
+
 # Check if environment variables are set
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
@@ -50,7 +54,7 @@ try:
     from backend.services.ticker_service import get_all_tickers, create_ticker, get_ticker_by_symbol
     
     # Get all tickers
-    tickers = get_all_tickers()
+    tickers = run(get_all_tickers())
     print(f"✅ Found {len(tickers)} tickers in database")
     
     if len(tickers) > 0:
@@ -58,14 +62,14 @@ try:
     else:
         print("   ⚠️  No tickers found. Creating sample ticker...")
         # Create a test ticker
-        test_ticker = create_ticker("AAPL", "Apple Inc.", "Tech")
+        test_ticker = run(create_ticker("AAPL", "Apple Inc.", "Tech"))
         if test_ticker:
             print(f"   ✅ Created test ticker: {test_ticker.symbol}")
         else:
             print("   ❌ Failed to create test ticker")
     
     # Test get by symbol
-    aapl = get_ticker_by_symbol("AAPL")
+    aapl = run(get_ticker_by_symbol("AAPL"))
     if aapl:
         print(f"✅ Get by symbol works: {aapl.symbol} - {aapl.name}")
     else:
@@ -84,11 +88,11 @@ try:
     from backend.services.game_service import create_or_get_game, get_game_by_id
     
     # Create or get a test game
-    test_game = create_or_get_game(starting_cash=10000, status="active")
+    test_game = run(create_or_get_game(starting_cash=10000, status="active"))
     print(f"✅ Game created/retrieved: ID={test_game.id}, Status={test_game.status}")
     
     # Get game by ID
-    retrieved_game = get_game_by_id(test_game.id)
+    retrieved_game = run(get_game_by_id(test_game.id))
     if retrieved_game:
         print(f"✅ Get game by ID works: ID={retrieved_game.id}")
     else:
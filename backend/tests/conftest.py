@@ -0,0 +1,46 @@
+"""
+Shared test setup: every test runs against a fresh in-memory storage backend,
+so no database or network is needed.
+"""
+import asyncio
+import os
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("PRICE_COMPACTION_INTERVAL", "0")
+
+import pytest
+
+from backend.database import set_storage
+from backend.database.memory_backend import MemoryBackend
+
+
+class CappedMemoryBackend(MemoryBackend):
+    """Memory backend returning at most max_rows rows per select, like PostgREST."""
+
+    def __init__(self, max_rows: int = 1000):
+        super().__init__()
+        self.max_rows = max_rows
+
+    async def select(self, table, filters=(), **kwargs):
+        return (await super().select(table, filters, **kwargs))[:self.max_rows]
+
+
+@pytest.fixture(autouse=True)
+def storage():
+    backend = MemoryBackend()
+    set_storage(backend)
+    yield backend
+    set_storage(None)
+
+
+@pytest.fixture
+def capped_storage():
+    backend = CappedMemoryBackend(max_rows=100)
+    set_storage(backend)
+    yield backend
+    set_storage(None)
+
+
+def run(coro):
+    """Run a coroutine to completion (services are async)."""
+    return asyncio.run(coro)
@@ -0,0 +1,35 @@
+import asyncio
+
+from backend.models import Event
+from backend.services import event_bus
+
+
+def _event(n):
+    return Event(id=f"macro-{n}", type="MACRO", title="T", baseImpactPct=0.01, icon="x",
+                 impactPct=0.01, ts=n, runtimeId=f"macro-{n}-{n}-0")
+
+
+def test_publish_reaches_round_game_and_all_topics():
+    async def scenario():
+        subs = [event_bus.subscribe(round_id=7), event_bus.subscribe(game_id=1), event_bus.subscribe(),
+                event_bus.subscribe(round_id=8)]
+        assert event_bus.subscriber_count() == 4
+        event_bus.publish([_event(1)], game_id=1, round_id=7)
+        got = [sub.queue.qsize() for sub in subs]
+        for sub in subs:
+            event_bus.unsubscribe(sub)
+        return got
+
+    assert asyncio.run(scenario()) == [1, 1, 1, 0]
+    assert event_bus.subscriber_count() == 0
+
+
+def test_slow_subscriber_is_dropped():
+    async def scenario():
+        slow = event_bus.subscribe(maxsize=2)
+        event_bus.publish([_event(n) for n in range(3)])
+        assert slow.dropped
+        assert event_bus.subscriber_count() == 0
+        assert await slow.get(timeout=1) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,69 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.database import set_storage
+from backend.database.memory_backend import MemoryBackend
+from backend.main import app
+from backend.services import event_service
+from backend.tests.conftest import run
+
+
+class _FailingSelects(MemoryBackend):
+    """Events selects succeed `ok` times, then fail."""
+
+    def __init__(self, ok: int):
+        super().__init__()
+        self.ok = ok
+
+    async def select(self, table, filters=(), **kwargs):
+        if table == "events":
+            if self.ok <= 0:
+                raise RuntimeError("database unavailable")
+            self.ok -= 1
+        return await super().select(table, filters, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setattr(event_service, "EVENT_WRITE_BEHIND", False)
+    event_service.listing_cache.invalidate()
+
+
+async def _seed(count):
+    await event_service.generate_events_batch(count, wait_for_persist=True)
+
+
+def test_iter_events_raises_midway():
+    backend = _FailingSelects(ok=1)
+    set_storage(backend)
+    run(_seed(5))
+    event_service.listing_cache.invalidate()
+
+    async def drain():
+        seen = []
+        async for event in event_service.iter_events(page_size=2):
+            seen.append(event)
+        return seen
+
+    with pytest.raises(RuntimeError):
+        run(drain())
+
+
+def test_json_page_still_answers_empty_on_error():
+    set_storage(_FailingSelects(ok=0))
+    events, cursor = run(event_service.get_events_page(limit=10))
+    assert (events, cursor) == ([], None)
+
+
+def test_ndjson_stream_errors():
+    backend = _FailingSelects(ok=0)
+    set_storage(backend)
+    client = TestClient(app)
+    assert client.get("/api/events?format=ndjson").status_code == 500
+
+    # One full page streams, then the next page fails
+    backend.ok = 10
+    run(_seed(event_service.EVENT_PAGE_SIZE))
+    backend.ok = 1
+    with pytest.raises(RuntimeError):
+        client.get("/api/events?format=ndjson")
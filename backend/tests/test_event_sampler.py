@@ -0,0 +1,86 @@
+import random
+from collections import Counter
+
+from backend.services.event_sampler import EventSampler, FenwickTree, default_weight, parse_weights
+
+
+def _templates(*weights):
+    return [
+        {"id": f"t-{i}", "type": "MACRO", "title": f"T{i}", "baseImpactPct": 0.005, "weight": w}
+        for i, w in enumerate(weights)
+    ]
+
+
+def test_fenwick_total_and_find():
+    tree = FenwickTree([3, 0, 5, 2])
+    assert tree.total() == 10
+    assert [tree.find(v) for v in range(10)] == [0, 0, 0, 2, 2, 2, 2, 2, 3, 3]
+    tree.add(1, 4)
+    assert tree.total() == 14
+    assert tree.find(3) == 1
+
+
+def test_draw_frequencies_follow_weights():
+    sampler = EventSampler({"MACRO": _templates(3, 1)}, window=0, rng=random.Random(7))
+    counts = Counter(sampler.draw("MACRO")["id"] for _ in range(20000))
+    assert 2.7 < counts["t-0"] / counts["t-1"] < 3.3
+
+
+def test_zero_weight_is_never_drawn():
+    sampler = EventSampler({"MACRO": _templates(1, 0, 1)}, window=0, rng=random.Random(1))
+    assert "t-1" not in {sampler.draw("MACRO")["id"] for _ in range(500)}
+
+
+def test_no_repeat_inside_window():
+    sampler = EventSampler({"MACRO": _templates(1, 1, 1, 1)}, window=3, rng=random.Random(3))
+    drawn = [sampler.draw("MACRO")["id"] for _ in range(200)]
+    for i in range(3, len(drawn)):
+        assert drawn[i] not in drawn[i - 3:i]
+    assert sampler.recent_ids() == drawn[-3:]
+
+
+def test_template_returns_after_sliding_out():
+    sampler = EventSampler({"MACRO": _templates(1, 1)}, window=1, rng=random.Random(5))
+    first = sampler.draw("MACRO")["id"]
+    second = sampler.draw("MACRO")["id"]
+    assert second != first
+    # first slid out of the window when second was recorded
+    assert sampler.draw("MACRO")["id"] == first
+
+
+def test_window_shared_across_types():
+    pools = {"MACRO": _templates(1, 1), "MICRO": [{"id": "m-0", "type": "MICRO", "title": "M", "baseImpactPct": 0.03}]}
+    sampler = EventSampler(pools, window=2, rng=random.Random(0))
+    sampler.mark_used("t-0")
+    assert sampler.draw("MACRO")["id"] == "t-1"
+    assert sampler.recent_ids() == ["t-0", "t-1"]
+
+
+def test_fallback_when_every_template_is_excluded():
+    sampler = EventSampler({"MACRO": _templates(1, 1)}, window=10, rng=random.Random(2))
+    seen = {sampler.draw("MACRO")["id"] for _ in range(2)}
+    assert seen == {"t-0", "t-1"}
+    # Both are inside the window: the draw ignores exclusion instead of failing
+    assert sampler.draw("MACRO")["id"] in seen
+
+
+def test_unknown_type_raises():
+    sampler = EventSampler({"MACRO": _templates(1)})
+    try:
+        sampler.draw("BLACKSWAN")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+def test_parse_weights_skips_bad_entries():
+    assert parse_weights("HIGH=0.5, tech=2,bad,neg=-1,=3") == {"HIGH": 0.5, "tech": 2.0}
+
+
+def test_default_weight_applies_difficulty_and_sector(monkeypatch):
+    from backend.services import event_sampler
+
+    monkeypatch.setitem(event_sampler.DIFFICULTY_WEIGHTS, "HIGH", 0.5)
+    monkeypatch.setitem(event_sampler.SECTOR_WEIGHTS, "tech", 4.0)
+    template = {"id": "x", "type": "MICRO", "baseImpactPct": 0.03, "tags": ["earnings", "tech"], "weight": 2}
+    assert default_weight(template) == 2 * 0.5 * 4.0
@@ -0,0 +1,91 @@
+import pytest
+
+from backend.services import leaderboard_service
+from backend.services.leaderboard_service import Leaderboard
+from backend.tests.conftest import run
+
+
+@pytest.fixture(autouse=True)
+def fresh_boards():
+    leaderboard_service.reset()
+    yield
+    leaderboard_service.reset()
+
+
+def test_ranks_by_total_then_rounds_then_id():
+    board = Leaderboard()
+    board.add(3, 10.0)
+    board.add(1, 4.0)
+    board.add(1, 6.0)  # Same total as 3, more rounds played
+    board.add(2, 10.0)  # Ties with 3 on total and rounds: lower id first
+    board.add(4, -1.0)
+    assert [(e["participant_id"], e["rank"]) for e in board.top(10)] == [(1, 1), (2, 2), (3, 3), (4, 4)]
+    assert board.entry(3) == {"rank": 3, "participant_id": 3, "score": 10.0, "rounds": 1}
+    assert board.entry(99) is None
+    assert len(board) == 4
+
+
+def test_update_moves_participant():
+    board = Leaderboard()
+    for pid in range(1, 6):
+        board.add(pid, float(pid))
+    board.add(1, 100.0)
+    assert board.entry(1)["rank"] == 1
+    assert board.entry(5)["rank"] == 2
+
+
+def test_top_with_offset():
+    board = Leaderboard()
+    for pid in range(1, 11):
+        board.add(pid, float(pid))
+    page = board.top(3, offset=2)
+    assert [(e["rank"], e["participant_id"]) for e in page] == [(3, 8), (4, 7), (5, 6)]
+
+
+async def _seed(storage):
+    rounds = await storage.insert("rounds", [
+        {"game_id": 1, "round_no": 1}, {"game_id": 1, "round_no": 2}, {"game_id": 2, "round_no": 1},
+    ])
+    r1, r2, r3 = (row["id"] for row in rounds)
+    await storage.insert("round_scores", [
+        {"participant_id": 1, "round_id": r1, "pnl_delta": 5.0},
+        {"participant_id": 2, "round_id": r1, "pnl_delta": 8.0},
+        {"participant_id": 1, "round_id": r2, "pnl_delta": 4.0},
+        {"participant_id": 2, "round_id": r3, "pnl_delta": -2.0},
+    ])
+    return r1, r2, r3
+
+
+def test_boards_per_round_game_and_global(storage):
+    r1, r2, r3 = run(_seed(storage))
+    top, total = run(leaderboard_service.get_top("global"))
+    assert [(e["participant_id"], e["score"], e["rounds"]) for e in top] == [(1, 9.0, 2), (2, 6.0, 2)]
+    top, total = run(leaderboard_service.get_top("game", 1))
+    assert [(e["participant_id"], e["score"]) for e in top] == [(1, 9.0), (2, 8.0)]
+    top, total = run(leaderboard_service.get_top("round", r1))
+    assert [e["participant_id"] for e in top] == [2, 1]
+    entry, total = run(leaderboard_service.get_rank(2, "game", 2))
+    assert entry["rank"] == 1 and total == 1
+
+
+def test_record_scores_updates_loaded_boards(storage):
+    r1, _, _ = run(_seed(storage))
+    assert run(leaderboard_service.ensure_loaded())
+    rows = run(storage.insert("round_scores", {"participant_id": 3, "round_id": r1, "pnl_delta": 20.0}))
+    run(leaderboard_service.record_scores(rows))
+    top, total = run(leaderboard_service.get_top("global", limit=1))
+    assert top[0]["participant_id"] == 3 and total == 3
+    # Already counted rows are not added twice by a rebuild
+    assert run(leaderboard_service.resync())
+    entry, _ = run(leaderboard_service.get_rank(3, "global"))
+    assert entry["score"] == 20.0 and entry["rounds"] == 1
+
+
+def test_load_reads_past_row_cap(capped_storage):
+    round_id = run(capped_storage.insert("rounds", {"game_id": 1, "round_no": 1}))[0]["id"]
+    run(capped_storage.insert("round_scores", [
+        {"participant_id": pid, "round_id": round_id, "pnl_delta": float(pid)} for pid in range(1, 251)
+    ]))
+    top, total = run(leaderboard_service.get_top("global", limit=1))
+    assert total == 250
+    assert top[0]["participant_id"] == 250
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from backend.services.price_aggregation import bucket_for, lttb, ohlc
+
+
+def test_ohlc_per_bucket():
+    candles = ohlc([0, 10, 20, 100, 150], [5.0, 7.0, 4.0, 6.0, 8.0], bucket_ms=100)
+    assert candles["timestamps"].tolist() == [0, 100]
+    assert candles["open"].tolist() == [5.0, 6.0]
+    assert candles["high"].tolist() == [7.0, 8.0]
+    assert candles["low"].tolist() == [4.0, 6.0]
+    assert candles["close"].tolist() == [4.0, 8.0]
+    assert candles["count"].tolist() == [3, 2]
+
+
+def test_ohlc_without_fill_omits_empty_buckets():
+    candles = ohlc([0, 350], [1.0, 2.0], bucket_ms=100)
+    assert candles["timestamps"].tolist() == [0, 300]
+
+
+def test_ohlc_fill_carries_previous_close():
+    candles = ohlc([0, 50, 350], [1.0, 3.0, 2.0], bucket_ms=100, fill=True, end_ms=420)
+    assert candles["timestamps"].tolist() == [0, 100, 200, 300, 400]
+    assert candles["open"].tolist() == [1.0, 3.0, 3.0, 2.0, 2.0]
+    assert candles["close"].tolist() == [3.0, 3.0, 3.0, 2.0, 2.0]
+    assert candles["count"].tolist() == [2, 0, 0, 1, 0]
+
+
+def test_ohlc_fill_limit():
+    with pytest.raises(ValueError):
+        ohlc([0, 10**9], [1.0, 2.0], bucket_ms=1, fill=True)
+
+
+def test_ohlc_empty_and_invalid_bucket():
+    assert ohlc([], [], bucket_ms=10)["timestamps"].size == 0
+    with pytest.raises(ValueError):
+        ohlc([0], [1.0], bucket_ms=0)
+
+
+def test_bucket_for_fits_point_budget():
+    width = bucket_for([0, 999], 10)
+    assert width == 100
+    assert bucket_for([5], 10) == 1
+
+
+def test_lttb_keeps_ends_and_budget():
+    ts = np.arange(1000)
+    px = np.sin(ts / 50.0)
+    out_ts, out_px = lttb(ts, px, 50)
+    assert out_ts.size == 50
+    assert out_ts[0] == 0 and out_ts[-1] == 999
+    assert np.all(np.diff(out_ts) > 0)
+    assert np.allclose(out_px, np.sin(out_ts / 50.0))
+
+
+def test_lttb_keeps_spike():
+    ts = np.arange(300)
+    px = np.zeros(300)
+    px[137] = 10.0
+    out_ts, out_px = lttb(ts, px, 10)
+    assert 137 in out_ts.tolist()
+    assert out_px.max() == 10.0
+
+
+def test_lttb_returns_short_series_unchanged():
+    ts, px = lttb([1, 2, 3], [1.0, 2.0, 3.0], 10)
+    assert ts.tolist() == [1, 2, 3]
+    ts, px = lttb([1, 2, 3, 4], [1.0, 2.0, 3.0, 4.0], 2)
+    assert ts.size == 4
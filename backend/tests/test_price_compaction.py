@@ -0,0 +1,103 @@
+import pytest
+
+from backend.services import price_compaction, price_snapshot_service
+from backend.tests.conftest import run
+
+ENDED = "2020-01-01T00:00:00"
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    monkeypatch.setattr(price_compaction, "metrics", {key: 0 for key in price_compaction.metrics})
+    monkeypatch.setattr(price_compaction, "PRICE_ARCHIVE_DIR", "")
+
+
+async def _ended_round(storage, prices):
+    round_id = (await storage.insert("rounds", {"game_id": 1, "round_no": 1, "ends_at": ENDED}))[0]["id"]
+    await storage.insert("price_snapshots", [
+        {"game_id": 1, "round_id": round_id, "ticker_id": 1 + i % 2, "price": price}
+        for i, price in enumerate(prices)
+    ])
+    return round_id
+
+
+def test_roll_up_summarizes_every_snapshot(storage):
+    round_id = run(_ended_round(storage, [10.0, 20.0, 12.0, 18.0, 9.0, 25.0]))
+    run(price_compaction.compact_once())
+    rollups = {r.ticker_id: r for r in run(price_snapshot_service.get_price_rollups(round_id=round_id))}
+    assert (rollups[1].open, rollups[1].high, rollups[1].low, rollups[1].close, rollups[1].count) == (10.0, 12.0, 9.0, 9.0, 3)
+    assert sum(r.count for r in rollups.values()) == 6
+    # Purging is off by default: raw rows stay
+    assert run(storage.count("price_snapshots", [("round_id", "eq", round_id)])) == 6
+
+
+def test_roll_up_behind_row_cap(capped_storage):
+    round_id = run(_ended_round(capped_storage, [float(i) for i in range(250)]))
+    run(price_compaction.compact_once())
+    rollups = run(price_snapshot_service.get_price_rollups(round_id=round_id))
+    assert sum(r.count for r in rollups) == 250
+
+
+def test_purge_aborts_when_rollups_miss_rows(storage, monkeypatch):
+    monkeypatch.setattr(price_compaction, "PRICE_PURGE_ENABLED", True)
+    monkeypatch.setattr(price_compaction, "PRICE_RAW_RETENTION_HOURS", 0)
+    round_id = run(_ended_round(storage, [1.0, 2.0]))
+    run(price_compaction.compact_once())
+    # Rolled up and purged in the same pass
+    assert run(storage.count("price_snapshots", [("round_id", "eq", round_id)])) == 0
+
+    late = run(_ended_round(storage, [1.0, 2.0]))
+    monkeypatch.setattr(price_compaction, "PRICE_PURGE_ENABLED", False)
+    run(price_compaction.compact_once())
+    # A snapshot arrives after the rollup
+    run(storage.insert("price_snapshots", {"game_id": 1, "round_id": late, "ticker_id": 1, "price": 3.0}))
+    monkeypatch.setattr(price_compaction, "PRICE_PURGE_ENABLED", True)
+    metrics = run(price_compaction.compact_once())
+    assert metrics["purges_aborted"] == 1
+    assert run(storage.count("price_snapshots", [("round_id", "eq", late)])) == 3
+    # The next pass rolls it up again and then purges it
+    run(price_compaction.compact_once())
+    assert run(storage.count("price_snapshots", [("round_id", "eq", late)])) == 0
+    rollups = run(price_snapshot_service.get_price_rollups(round_id=late))
+    assert sum(r.count for r in rollups) == 3
+
+
+def test_short_archive_aborts_purge(storage, monkeypatch, tmp_path):
+    monkeypatch.setattr(price_compaction, "PRICE_PURGE_ENABLED", True)
+    monkeypatch.setattr(price_compaction, "PRICE_RAW_RETENTION_HOURS", 0)
+    monkeypatch.setattr(price_compaction, "PRICE_ARCHIVE_DIR", str(tmp_path))
+    round_id = run(_ended_round(storage, [1.0, 2.0, 3.0]))
+
+    async def short_pages(**kwargs):
+        yield [{"id": 1, "game_id": 1, "round_id": round_id, "ticker_id": 1, "price": 1.0, "taken_at": None}]
+
+    monkeypatch.setattr(price_snapshot_service, "iter_price_snapshot_pages", short_pages)
+    monkeypatch.setattr(price_compaction, "_roll_up", lambda row: _mark_compacted(storage, row["id"]))
+    run(storage.insert("price_rollups", {
+        "game_id": 1, "round_id": round_id, "ticker_id": 1, "open": 1.0, "high": 3.0, "low": 1.0,
+        "close": 3.0, "count": 3, "first_at": None, "last_at": None,
+    }))
+    metrics = run(price_compaction.compact_once())
+    assert metrics["purges_aborted"] == 1
+    assert run(storage.count("price_snapshots", [("round_id", "eq", round_id)])) == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+async def _mark_compacted(storage, round_id):
+    await storage.update("rounds", {"compacted_at": ENDED}, [("id", "eq", round_id)])
+
+
+def test_claim_is_exclusive(storage):
+    round_id = run(storage.insert("rounds", {"game_id": 1, "round_no": 1, "ends_at": ENDED}))[0]["id"]
+    assert run(price_compaction._claim(round_id, "compacted_at"))
+    assert not run(price_compaction._claim(round_id, "compacted_at"))
+    run(price_compaction._release(round_id))
+    assert run(price_compaction._claim(round_id, "compacted_at"))
+
+
+def test_claimed_round_is_skipped(storage):
+    round_id = run(_ended_round(storage, [1.0, 2.0]))
+    assert run(price_compaction._claim(round_id, "compacted_at"))  # Held by another instance
+    metrics = run(price_compaction.compact_once())
+    assert metrics["rounds_rolled_up"] == 0
+    assert run(price_snapshot_service.get_price_rollups(round_id=round_id)) == []
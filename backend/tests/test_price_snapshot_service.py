@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.database import set_storage
+from backend.database.memory_backend import MemoryBackend
+from backend.services import price_snapshot_service
+from backend.tests.conftest import run
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _rows(count, tickers=(1, 2), per_instant=3, round_id=1):
+    # Several rows share each timestamp, as a batch insert stamps them alike
+    return [
+        {
+            "game_id": 1, "round_id": round_id, "ticker_id": tickers[i % len(tickers)], "price": 100.0 + i,
+            "taken_at": (BASE + timedelta(seconds=i // per_instant)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def test_candles_read_past_row_cap(capped_storage):
+    run(capped_storage.insert("price_snapshots", _rows(450)))
+    candles, source_count = run(price_snapshot_service.get_price_candles(round_id=1, bucket_ms=60_000))
+    assert source_count == 450
+    assert sum(sum(c["count"]) for c in candles.values()) == 450
+
+
+def test_series_pages_through_rows_sharing_a_timestamp(capped_storage):
+    run(capped_storage.insert("price_snapshots", _rows(250, tickers=(1,), per_instant=250)))
+    series = run(price_snapshot_service.get_price_series(round_id=1))
+    timestamps, prices = series[1]
+    assert len(prices) == 250
+    assert prices == sorted(prices)
+
+
+def test_series_limit(capped_storage):
+    run(capped_storage.insert("price_snapshots", _rows(450)))
+    series = run(price_snapshot_service.get_price_series(round_id=1, limit=321))
+    assert sum(len(prices) for _, prices in series.values()) == 321
+
+
+@pytest.fixture
+def dedup(monkeypatch):
+    monkeypatch.setattr(price_snapshot_service, "PRICE_SNAPSHOT_DEDUP", True)
+    monkeypatch.setattr(price_snapshot_service, "PRICE_SNAPSHOT_DEDUP_TOLERANCE", 0.0)
+    price_snapshot_service.forget_last_prices()
+    yield
+    price_snapshot_service.forget_last_prices()
+
+
+def _snap(ticker_id, price, round_id=1):
+    return {"game_id": 1, "round_id": round_id, "ticker_id": ticker_id, "price": price}
+
+
+def test_dedup_is_off_by_default():
+    assert price_snapshot_service._drop_repeats([_snap(1, 5.0), _snap(1, 5.0)], set()) == [_snap(1, 5.0)] * 2
+
+
+def test_drop_repeats_within_chunk(dedup):
+    rows = [_snap(1, 5.0), _snap(2, 7.0), _snap(1, 5.0), _snap(1, 6.0), _snap(1, 6.0), _snap(2, 7.0)]
+    kept = price_snapshot_service._drop_repeats(rows, set())
+    assert kept == [_snap(1, 5.0), _snap(2, 7.0), _snap(1, 6.0)]
+
+
+def test_drop_repeats_against_stored_price(dedup):
+    price_snapshot_service._remember([{**_snap(1, 5.0), "id": 1}])
+    batched = set()
+    assert price_snapshot_service._drop_repeats([_snap(1, 5.0)], batched) == []
+    # A new round starts a new series
+    assert price_snapshot_service._drop_repeats([_snap(1, 5.0, round_id=2)], batched) == [_snap(1, 5.0, round_id=2)]
+
+
+def test_first_row_after_an_earlier_chunk_is_kept(dedup):
+    batched = set()
+    assert price_snapshot_service._drop_repeats([_snap(1, 5.0)], batched) == [_snap(1, 5.0)]
+    # The earlier chunk may still fail to insert, so its price is not a reference
+    assert price_snapshot_service._drop_repeats([_snap(1, 5.0), _snap(1, 5.0)], batched) == [_snap(1, 5.0)]
+
+
+class _FailFirstInsert(MemoryBackend):
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+    async def insert(self, table, rows):
+        if table == "price_snapshots" and not self.failed:
+            self.failed = True
+            raise RuntimeError("insert failed")
+        return await super().insert(table, rows)
+
+
+def test_failed_chunk_never_causes_skips(dedup):
+    set_storage(_FailFirstInsert())
+    created, failures, skipped = run(price_snapshot_service.ingest_price_snapshots(
+        [_snap(1, 5.0), _snap(1, 5.0)], chunk_size=1, concurrency=1
+    ))
+    assert (len(created), len(failures), skipped) == (1, 1, 0)
+
+
+def test_ingest_reports_skipped(dedup):
+    created, failures, skipped = run(price_snapshot_service.ingest_price_snapshots(
+        [_snap(1, 5.0), _snap(1, 5.0), _snap(1, 6.0)], chunk_size=10
+    ))
+    assert [s.price for s in created] == [5.0, 6.0]
+    assert (failures, skipped) == ([], 1)
+    # The stored price is remembered for the next request
+    created, _, skipped = run(price_snapshot_service.ingest_price_snapshots([_snap(1, 6.0)]))
+    assert (created, skipped) == ([], 1)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from backend.services import price_store
+from backend.services.price_store import PriceRing
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def enabled_store(monkeypatch):
+    monkeypatch.setattr(price_store, "PRICE_STORE_MAX_BYTES", 1 << 20)
+    monkeypatch.setattr(price_store, "PRICE_RING_CAPACITY", 8)
+    price_store.clear()
+    yield
+    price_store.clear()
+
+
+def _append(ring, ids, round_id=1):
+    ids = np.asarray(ids, dtype=np.int64)
+    ring.append(ids, np.full(ids.size, round_id, dtype=np.int64), ids * 1000, ids.astype(np.float64))
+
+
+def _rows(game_id, round_id, ids, ticker_id=1):
+    return [
+        {"id": i, "game_id": game_id, "round_id": round_id, "ticker_id": ticker_id, "price": float(i),
+         "taken_at": (BASE + timedelta(seconds=i)).isoformat()}
+        for i in ids
+    ]
+
+
+def test_ring_grows_then_wraps():
+    ring = PriceRing(capacity=4)
+    _append(ring, [1, 2, 3])
+    assert ring.columns()[0].tolist() == [1, 2, 3]
+    _append(ring, [4, 5, 6], round_id=2)
+    ids, rounds, _, _ = ring.columns()
+    assert ids.tolist() == [3, 4, 5, 6]
+    assert ring.size == 4 and ring.ids.size == 4
+    # Entries of round 1 were overwritten, round 2 is still whole
+    assert ring.lost_round == 1
+
+
+def test_ring_append_larger_than_capacity():
+    ring = PriceRing(capacity=3)
+    _append(ring, range(1, 8))
+    assert ring.columns()[0].tolist() == [5, 6, 7]
+    assert ring.lost_round == 1
+
+
+def test_untracked_games_are_not_held():
+    price_store.add(_rows(1, 1, [1, 2]))
+    assert price_store.game_count() == 0
+    assert price_store.select(game_id=1) is None
+
+
+def test_select_tracked_round():
+    price_store.track_round(1, 10)
+    price_store.add(_rows(1, 10, [1, 2, 3]) + _rows(1, 10, [4], ticker_id=2))
+    game_id, columns = price_store.select(round_id=10)
+    assert game_id == 1
+    assert columns[1][0].tolist() == [1, 2, 3]
+    assert columns[2][3].tolist() == [4.0]
+
+
+def test_overwritten_round_goes_cold():
+    price_store.track_round(1, 10)
+    price_store.add(_rows(1, 10, range(1, 12)))  # Capacity 8
+    assert price_store.select(round_id=10) is None
+
+
+def test_least_recently_used_game_is_evicted(monkeypatch):
+    price_store.track_game(1)
+    price_store.add(_rows(1, 10, range(1, 9)))
+    one_game = price_store.memory_bytes()
+    assert one_game > 0
+    monkeypatch.setattr(price_store, "PRICE_STORE_MAX_BYTES", one_game * 2)
+    price_store.track_game(2)
+    price_store.track_game(3)
+    price_store.add(_rows(2, 20, range(1, 9)))
+    price_store.select(game_id=1)  # Game 1 is now the most recently used
+    price_store.add(_rows(3, 30, range(1, 9)))
+    assert price_store.game_count() == 2
+    assert price_store.select(game_id=2) is None
+    assert price_store.select(game_id=1) is not None
+    assert price_store.memory_bytes() <= one_game * 2
+
+
+def test_drop_game_releases_memory():
+    price_store.track_game(1)
+    price_store.add(_rows(1, 10, [1, 2]))
+    price_store.drop_game(1)
+    assert price_store.memory_bytes() == 0 and price_store.game_count() == 0
+
+
+def test_disabled_store_tracks_nothing(monkeypatch):
+    monkeypatch.setattr(price_store, "PRICE_STORE_MAX_BYTES", 0)
+    price_store.track_game(1)
+    assert price_store.game_count() == 0
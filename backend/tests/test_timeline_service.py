@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.models import Round
+from backend.services import event_bus, event_service, timeline_service
+
+
+@pytest.fixture(autouse=True)
+def short_rounds(monkeypatch):
+    monkeypatch.setattr(event_service, "EVENT_WRITE_BEHIND", False)
+    monkeypatch.setattr(timeline_service, "TIMELINE_ROUND_MS", 600)
+    monkeypatch.setattr(timeline_service, "TIMELINE_MIN_GAP_MS", 100)
+    monkeypatch.setattr(timeline_service, "TIMELINE_MAX_GAP_MS", 100)
+    monkeypatch.setattr(timeline_service, "TIMELINE_BLACKSWAN_PROB", 0.0)
+    event_service.listing_cache.invalidate()
+    timeline_service._timelines.clear()
+
+
+async def _round(storage):
+    row = (await storage.insert("rounds", {"game_id": 1, "round_no": 1}))[0]
+    return Round(**row)
+
+
+def test_scheduled_events_are_listed_and_pushed_when_due(storage):
+    async def scenario():
+        round_obj = await _round(storage)
+        sub = event_bus.subscribe(round_id=round_obj.id)
+        try:
+            events = await timeline_service.build_round_timeline(round_obj, starts_at_ms=int(time.time() * 1000) + 200)
+            assert len(events) == 5
+            listed, _ = await event_service.get_events_page()
+            assert listed == []
+            assert sub.queue.empty()
+
+            first = await sub.get(timeout=2)
+            assert first.runtimeId == events[0].runtimeId
+            listed, _ = await event_service.get_events_page()
+            assert [e.runtimeId for e in listed] == [events[0].runtimeId]
+        finally:
+            event_bus.unsubscribe(sub)
+
+    asyncio.run(scenario())
+
+
+def test_reload_skips_ad_hoc_events_of_the_round(storage):
+    async def scenario():
+        round_obj = await _round(storage)
+        events = await timeline_service.build_round_timeline(round_obj)
+        await event_service.generate_event(round_id=round_obj.id)
+        timeline_service._timelines.clear()
+        reloaded = await timeline_service.get_round_timeline(round_obj.id)
+        assert [e.runtimeId for e in reloaded] == [e.runtimeId for e in events]
+
+    asyncio.run(scenario())